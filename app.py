@@ -5,21 +5,42 @@ from __future__ import annotations
 from datetime import datetime
 import inspect
 import json
+import os
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 
-from app.analysis.ticker_drilldown import build_ticker_drilldown
-from app.analysis.ticker_intelligence import compute_ticker_metrics
+from app.cache import CacheStats, ResultCache, max_bytes_from_env
+from app.costs.compact import materialize_trade_dates
+from app.costs.exits import select_exit_policy
+from app.data.dates import parse_dates
 from app.data.ingest import ingest_dataset
 from app.data.processor import canonicalize_symbol
-from app.demo.run_demo import run_demo
-from app.insights.analyst import render_analyst_insights
-from app.planner.allocation import generate_portfolio_allocation
-from app.planner.portfolio_ui import render_portfolio_plan
-from app.shell import build_analyst_dataset, coerce_trade_rows_from_ranked
+from app.data.profile import DatasetProfile, profile_from_meta
+from app.data.shared_store import SHARED_STORE_DIR_ENV, SharedFrameStore
+from app.lazy import LazyCallable
+from app.shell import LazyArtifacts, build_analyst_dataset, coerce_trade_rows_from_ranked
 from app.ui.display_labels import clean_dataframe_labels
 
+# Tab- and stage-specific modules load when the tab or stage first runs, so
+# first paint only pays for ingestion and the shell.
+bootstrap_intervals = LazyCallable("app.analysis.bootstrap", "bootstrap_intervals")
+format_interval_lines = LazyCallable("app.analysis.bootstrap", "format_interval_lines")
+interval_table = LazyCallable("app.analysis.bootstrap", "interval_table")
+intervals_by_ticker = LazyCallable("app.analysis.bootstrap", "intervals_by_ticker")
+build_ticker_drilldown = LazyCallable("app.analysis.ticker_drilldown", "build_ticker_drilldown")
+compute_ticker_metrics = LazyCallable("app.analysis.ticker_intelligence", "compute_ticker_metrics")
+run_demo = LazyCallable("app.demo.run_demo", "run_demo")
+build_analyst_cube = LazyCallable("app.insights.analyst", "build_analyst_cube")
+render_analyst_insights = LazyCallable("app.insights.analyst", "render_analyst_insights")
+resolve_return_column = LazyCallable("app.insights.analyst", "resolve_return_column")
+generate_portfolio_allocation = LazyCallable("app.planner.allocation", "generate_portfolio_allocation")
+render_plan_outcomes = LazyCallable("app.planner.portfolio_ui", "render_plan_outcomes")
+render_portfolio_plan = LazyCallable("app.planner.portfolio_ui", "render_portfolio_plan")
+build_return_pools = LazyCallable("app.planner.monte_carlo", "build_return_pools")
+simulate_plan_outcomes = LazyCallable("app.planner.monte_carlo", "simulate_plan_outcomes")
+
 _GUIDED_TABS = ["Portfolio", "Review", "Ticker Analysis", "Data"]
 _ADVANCED_TABS = ["Portfolio", "Review", "Ticker Analysis", "Analyst Insights", "Data"]
 
@@ -36,6 +57,18 @@ _HELP_VIDEO_URLS = {
     "review": "https://www.loom.com/share/6e2058d50c5d447b98d9031b4e1050cf",
     "analyst_mode": "https://www.loom.com/share/399c4760e90744c49fd4aadcf172f4a3",
 }
+_SHARED_CANONICAL_FRAME = "canonical"
+_SHARED_ANALYST_FRAME = "analyst"
+_STATE_DATASET_FINGERPRINT = "dataset_fingerprint"
+_TABS_WIDGET_KEY = "main_tabs"
+# Artifacts each tab needs before it renders; anything else stays unbuilt.
+_TAB_ARTIFACTS = {
+    "Portfolio": ("ranked", "trade_rows", "return_pools"),
+    "Review": ("ranked", "trade_rows"),
+    "Ticker Analysis": ("ticker_options", "analyst"),
+    "Analyst Insights": ("analyst",),
+    "Data": (),
+}
 _STATE_SELECTED_TICKER = "selected_ticker"
 _STATE_ACTIVE_TAB = "active_tab_name"
 _STATE_TICKER_SOURCE = "ticker_analysis_source"
@@ -52,19 +85,24 @@ def _resolve_tabs_for_mode(mode: str) -> list[str]:
     return _ADVANCED_TABS if str(mode).lower() == "analyst" else _GUIDED_TABS
 
 
-def _extract_ticker_options(df: pd.DataFrame) -> list[str]:
+def _ticker_column_values(df: pd.DataFrame, profile: DatasetProfile | None = None) -> pd.Series | None:
+    # The ingest profile already lists every instrument; only other frames are scanned.
+    if profile is not None:
+        return pd.Series(list(profile.tickers), dtype=object)
     if df.empty:
-        return []
-
-    ticker_column = None
+        return None
     for candidate in ("instrument", "ticker"):
         if candidate in df.columns:
-            ticker_column = candidate
-            break
-    if ticker_column is None:
+            return df[candidate]
+    return None
+
+
+def _extract_ticker_options(df: pd.DataFrame, profile: DatasetProfile | None = None) -> list[str]:
+    values = _ticker_column_values(df, profile)
+    if values is None:
         return []
 
-    tickers = df[ticker_column].dropna().astype(str).str.strip().map(canonicalize_symbol)
+    tickers = values.dropna().astype(str).str.strip().map(canonicalize_symbol)
     tickers = tickers[tickers != ""]
     return sorted(tickers.unique())
 
@@ -156,8 +194,10 @@ def _build_trade_readiness_lines(
     def _scope(df: pd.DataFrame) -> pd.DataFrame:
         for column in ("instrument", "ticker"):
             if column in df.columns:
-                scoped = df[df[column].astype(str).str.strip().map(canonicalize_symbol) == selected_ticker]
-                return scoped.copy()
+                # Canonicalize each distinct symbol once rather than once per row.
+                codes, symbols = pd.factorize(df[column].astype(str).str.strip())
+                matches = [idx for idx, symbol in enumerate(symbols) if canonicalize_symbol(symbol) == selected_ticker]
+                return df[np.isin(codes, matches)]
         return pd.DataFrame(columns=df.columns)
 
     ticker_scope_market = _scope(canonical_df)
@@ -215,7 +255,7 @@ def _build_trade_readiness_lines(
         for field in candidates:
             if field not in df.columns:
                 continue
-            parsed_dates = pd.to_datetime(df[field], errors="coerce")
+            parsed_dates = parse_dates(df[field])
             if parsed_dates.notna().any():
                 return True
         return False
@@ -252,26 +292,22 @@ def _build_execution_behavior_lines(*, execution_summary: dict, behavior: dict,
     return lines
 
 
-def _extract_unique_ticker_count(df: pd.DataFrame) -> int:
-    if df.empty:
+def _extract_unique_ticker_count(df: pd.DataFrame, profile: DatasetProfile | None = None) -> int:
+    values = _ticker_column_values(df, profile)
+    if values is None:
         return 0
-    for candidate in ("instrument", "ticker"):
-        if candidate in df.columns:
-            tickers = df[candidate].dropna().astype(str).str.strip()
-            tickers = tickers[tickers != ""]
-            return int(tickers.nunique())
-    return 0
+    tickers = values.dropna().astype(str).str.strip()
+    tickers = tickers[tickers != ""]
+    return int(tickers.nunique())
 
 
-def _extract_ticker_preview(df: pd.DataFrame, *, limit: int = 20) -> list[str]:
-    if df.empty:
+def _extract_ticker_preview(df: pd.DataFrame, *, limit: int = 20, profile: DatasetProfile | None = None) -> list[str]:
+    values = _ticker_column_values(df, profile)
+    if values is None:
         return []
-    for candidate in ("instrument", "ticker"):
-        if candidate in df.columns:
-            tickers = df[candidate].dropna().astype(str).str.strip()
-            tickers = tickers[tickers != ""]
-            return tickers.drop_duplicates().head(limit).tolist()
-    return []
+    tickers = values.dropna().astype(str).str.strip()
+    tickers = tickers[tickers != ""]
+    return tickers.drop_duplicates().head(limit).tolist()
 
 
 def _run_demo_with_active_dataset(*, canonical_df: pd.DataFrame, meta: dict, issues: dict) -> dict:
@@ -316,6 +352,17 @@ def _render_visual_polish(st_module) -> None:
     )
 
 
+def _tab_is_open(tab) -> bool:
+    # Stateful tabs report .open; containers without it render eagerly.
+    return getattr(tab, "open", None) is not False
+
+
+def _fragment(st_module):
+    """Return ``st.fragment``, or a passthrough decorator on Streamlit builds without it."""
+    fragment = getattr(st_module, "fragment", None)
+    return fragment if callable(fragment) else (lambda func: func)
+
+
 def _render_video_link(st_module, *, label: str, url: str) -> None:
     st_module.markdown(f'<a href="{url}" target="_blank" rel="noopener noreferrer">{label}</a>', unsafe_allow_html=True)
 
@@ -345,17 +392,29 @@ def _render_tab_focus_script(st_module, *, tab_name: str) -> None:
     )
 
 
-def _resolve_dataset_period_description(df: pd.DataFrame) -> str:
-    if df.empty or "date" not in df.columns:
+def _resolve_dataset_period_description(df: pd.DataFrame, profile: DatasetProfile | None = None) -> str:
+    if profile is not None:
+        min_date, max_date = profile.start_date, profile.end_date
+    elif df.empty or "date" not in df.columns:
+        min_date = max_date = None
+    else:
+        date_values = parse_dates(df["date"]).dropna()
+        min_date = date_values.min().date().isoformat() if not date_values.empty else None
+        max_date = date_values.max().date().isoformat() if not date_values.empty else None
+    if min_date is None or max_date is None:
         return "Using historical JSE data available in the current dataset."
+    return f"Using historical JSE data from {min_date} to {max_date} in the current dataset."
 
-    date_values = pd.to_datetime(df["date"], errors="coerce").dropna()
-    if date_values.empty:
-        return "Using historical JSE data available in the current dataset."
 
-    min_date = date_values.min().date().isoformat()
-    max_date = date_values.max().date().isoformat()
-    return f"Using historical JSE data from {min_date} to {max_date} in the current dataset."
+def _resolve_latest_market_data_label(df: pd.DataFrame, profile: DatasetProfile | None = None) -> str:
+    if profile is not None:
+        return profile.end_date or "Unavailable"
+    latest_date = df["date"].max() if "date" in df.columns else pd.NaT
+    if pd.isna(latest_date):
+        return "Unavailable"
+    if hasattr(latest_date, "strftime"):
+        return latest_date.strftime("%Y-%m-%d")
+    return str(latest_date)
 
 
 def _format_viewed_timestamp() -> str:
@@ -489,6 +548,18 @@ def _render_data_status_summary(
                 st_module.markdown(f"- {error}")
 
 
+def _render_result_cache_stats(st_module, stats: CacheStats) -> None:
+    st_module.markdown("#### Result Cache")
+    c1, c2, c3 = st_module.columns(3)
+    c1.metric("Cache hits", stats.hits)
+    c2.metric("Cache misses", stats.misses)
+    c3.metric("Evictions", stats.evictions)
+    st_module.caption(
+        f"{stats.entries} cached results using {stats.current_bytes / 1_048_576:.1f} MB "
+        f"of {stats.max_bytes / 1_048_576:.0f} MB"
+    )
+
+
 def main() -> None:
     import streamlit as st
 
@@ -511,42 +582,87 @@ def main() -> None:
         st.session_state[_STATE_ACTIVE_TAB] = "Ticker Analysis"
         st.rerun()
 
-    @st.cache_data(show_spinner=False)
-    def _cached_ingest_dataset() -> tuple[pd.DataFrame, dict, tuple[tuple[str, tuple[str, ...]], ...]]:
+    @st.cache_resource(show_spinner=False)
+    def _shared_ingest_dataset() -> tuple[SharedFrameStore, dict, tuple[tuple[str, tuple[str, ...]], ...]]:
+        # One read-only copy per process; sessions take zero-copy views instead
+        # of unpickling their own frames from st.cache_data.
         canonical_df_value, meta_value, issues_value = ingest_dataset("demo")
-        return canonical_df_value, meta_value, _freeze_issues(issues_value)
+        frame_store = SharedFrameStore(os.environ.get(SHARED_STORE_DIR_ENV))
+        frame_store.put(_SHARED_CANONICAL_FRAME, canonical_df_value, meta_value.get("dataset_fingerprint"))
+        return frame_store, meta_value, _freeze_issues(issues_value)
+
+    @st.cache_resource(show_spinner=False)
+    def _shared_result_cache() -> ResultCache:
+        return ResultCache(max_bytes_from_env())
 
-    @st.cache_data(show_spinner=False)
     def _cached_run_demo_payload(
         canonical_df_value: pd.DataFrame,
         meta_value: dict,
         frozen_issues: tuple[tuple[str, tuple[str, ...]], ...],
-    ) -> pd.DataFrame:
-        payload = _run_demo_with_active_dataset(
-            canonical_df=canonical_df_value,
-            meta=meta_value,
-            issues=_unfreeze_issues(frozen_issues),
-        )
-        return payload.get("ranked", pd.DataFrame())
+    ) -> dict:
+        def _build() -> dict:
+            payload = _run_demo_with_active_dataset(
+                canonical_df=canonical_df_value,
+                meta=meta_value,
+                issues=_unfreeze_issues(frozen_issues),
+            )
+            # Keep only the per-ticker return pools from the trade table; the
+            # plan simulation samples them on every amount change.
+            return {
+                "ranked": payload.get("ranked", pd.DataFrame()),
+                "return_pools": build_return_pools(payload.get("trades")),
+            }
 
-    @st.cache_data(show_spinner=False)
-    def _cached_build_analyst_dataset(canonical_df_value: pd.DataFrame, ranked_df_value: pd.DataFrame) -> pd.DataFrame:
-        return build_analyst_dataset(canonical_df_value, ranked_df_value)
+        return result_cache.get_or_compute(("demo_payload",), _build, fingerprint=dataset_fingerprint)
 
-    @st.cache_data(show_spinner=False)
     def _cached_extract_ticker_options(canonical_df_value: pd.DataFrame) -> list[str]:
-        return _extract_ticker_options(canonical_df_value)
+        return result_cache.get_or_compute(
+            ("ticker_options",),
+            lambda: _extract_ticker_options(canonical_df_value, dataset_profile),
+            fingerprint=dataset_fingerprint,
+        )
 
-    @st.cache_data(show_spinner=False)
     def _cached_ticker_payloads(analyst_df_value: pd.DataFrame, ticker: str, mode_value: str) -> tuple[dict, dict]:
-        payload = build_ticker_drilldown(analyst_df_value, ticker)
-        metrics = compute_ticker_metrics(analyst_df_value, ticker, mode=mode_value)
-        return payload, metrics
+        def _build() -> tuple[dict, dict]:
+            payload = build_ticker_drilldown(analyst_df_value, ticker)
+            metrics = compute_ticker_metrics(analyst_df_value, ticker, mode=mode_value)
+            return payload, metrics
+
+        return result_cache.get_or_compute(("ticker_payloads", ticker, mode_value), _build, fingerprint=dataset_fingerprint)
+
+    def _cached_ticker_intervals(analyst_df_value: pd.DataFrame) -> dict[str, dict]:
+        # Whole-universe bootstrap runs once per dataset; each ticker click is a dict lookup.
+        return result_cache.get_or_compute(
+            ("bootstrap_intervals",),
+            lambda: intervals_by_ticker(bootstrap_intervals(analyst_df_value)),
+            fingerprint=dataset_fingerprint,
+        )
+
+    def _cached_analyst_cube(analyst_df_value: pd.DataFrame) -> dict | None:
+        # Every Analyst Insights table is a slice of one per-dataset aggregate pass.
+        return_column = resolve_return_column(analyst_df_value)
+        if return_column is None:
+            return None
+        return result_cache.get_or_compute(
+            ("analyst_cube", return_column),
+            lambda: build_analyst_cube(analyst_df_value, return_column=return_column),
+            fingerprint=dataset_fingerprint,
+        )
 
-    canonical_df, meta, frozen_issues = _cached_ingest_dataset()
+    frame_store, shared_meta, frozen_issues = _shared_ingest_dataset()
+    canonical_df = frame_store.get(_SHARED_CANONICAL_FRAME)
+    meta = dict(shared_meta)
     issues = _unfreeze_issues(frozen_issues)
+    dataset_profile = profile_from_meta(meta)
     dataset_source_label = str(meta.get("dataset_source_label") or "unknown_dataset")
 
+    result_cache = _shared_result_cache()
+    dataset_fingerprint = str(meta.get("dataset_fingerprint") or meta.get("dataset_id") or "")
+    previous_fingerprint = st.session_state.get(_STATE_DATASET_FINGERPRINT)
+    if previous_fingerprint and previous_fingerprint != dataset_fingerprint:
+        result_cache.invalidate(previous_fingerprint)
+    st.session_state[_STATE_DATASET_FINGERPRINT] = dataset_fingerprint
+
     if dataset_source_label == "legacy_demo_dataset":
         st.warning("Internal JSE dataset not found. Using fallback dataset.")
 
@@ -554,41 +670,76 @@ def main() -> None:
         st.warning("No rows were loaded from the data layer. Please verify the internal sample data file.")
         return
 
-    ranked_df = _cached_run_demo_payload(canonical_df, meta, frozen_issues)
-    analyst_df = _cached_build_analyst_dataset(canonical_df, ranked_df)
-    trade_rows = coerce_trade_rows_from_ranked(ranked_df) if not ranked_df.empty else []
-
     default_capital = 100_000.0
     selected_capital = float(st.session_state.get("total_capital", default_capital))
 
-    if ranked_df.empty:
-        enriched_allocations: list[dict] = []
-    else:
-        allocation_payload = generate_portfolio_allocation(trade_rows, selected_capital)
-        base_allocations = allocation_payload.get("allocations", [])
-        enriched_allocations = [{**allocation, **row} for row, allocation in zip(trade_rows, base_allocations)]
+    def _allocations_for_capital(capital: float) -> list[dict]:
+        # Only the sizing depends on the amount entered; ranked rows and trade
+        # rows stay memoized, so a new amount re-plans just the allocations.
+        def _build() -> list[dict]:
+            trade_rows = artifacts["trade_rows"]
+            allocation_payload = generate_portfolio_allocation(trade_rows, capital)
+            base_allocations = allocation_payload.get("allocations", [])
+            return [{**allocation, **row} for row, allocation in zip(trade_rows, base_allocations)]
+
+        if artifacts["ranked"].empty:
+            return []
+        return result_cache.get_or_compute(("allocations", float(capital)), _build, fingerprint=dataset_fingerprint)
+
+    def _plan_outcomes_for_capital(capital: float, allocations: list[dict]) -> dict | None:
+        return_pools = artifacts["return_pools"]
+        if not allocations or not return_pools:
+            return None
+        return result_cache.get_or_compute(
+            ("plan_outcomes", float(capital)),
+            lambda: simulate_plan_outcomes(allocations, return_pools, capital),
+            fingerprint=dataset_fingerprint,
+        )
+
+    artifacts = LazyArtifacts()
+    artifacts.register("demo", lambda: _cached_run_demo_payload(canonical_df, meta, frozen_issues))
+    artifacts.register("ranked", lambda: artifacts["demo"]["ranked"])
+    artifacts.register("return_pools", lambda: artifacts["demo"]["return_pools"])
+    artifacts.register(
+        "analyst",
+        lambda: materialize_trade_dates(
+            frame_store.get_or_put(
+                _SHARED_ANALYST_FRAME,
+                lambda: build_analyst_dataset(canonical_df, artifacts["ranked"]),
+            )
+        ),
+    )
+    artifacts.register(
+        "trade_rows",
+        lambda: coerce_trade_rows_from_ranked(artifacts["ranked"]) if not artifacts["ranked"].empty else [],
+    )
+    artifacts.register("ticker_options", lambda: _cached_extract_ticker_options(canonical_df))
 
-    dataset_period_description = _resolve_dataset_period_description(canonical_df)
+    dataset_period_description = _resolve_dataset_period_description(canonical_df, dataset_profile)
     _render_onboarding(st, dataset_period_description=dataset_period_description)
     viewed_ts = _format_viewed_timestamp()
-    latest_date = canonical_df["date"].max() if "date" in canonical_df.columns else pd.NaT
-    if pd.isna(latest_date):
-        latest_market_data_label = "Unavailable"
-    elif hasattr(latest_date, "strftime"):
-        latest_market_data_label = latest_date.strftime("%Y-%m-%d")
-    else:
-        latest_market_data_label = str(latest_date)
+    latest_market_data_label = _resolve_latest_market_data_label(canonical_df, dataset_profile)
 
     available_tabs = _resolve_tabs_for_mode(mode_token)
     active_tab_name = st.session_state.get(_STATE_ACTIVE_TAB)
     resolved_default_tab = active_tab_name if active_tab_name in available_tabs else None
-    tabs = st.tabs(available_tabs, default=resolved_default_tab)
+    if resolved_default_tab is not None:
+        st.session_state[_TABS_WIDGET_KEY] = resolved_default_tab
+    # Stateful tabs rerun on switch and report .open, so only the selected
+    # tab builds its artifacts.
+    tabs = st.tabs(available_tabs, key=_TABS_WIDGET_KEY, on_change="rerun")
     if resolved_default_tab is not None:
         _render_tab_focus_script(st, tab_name=resolved_default_tab)
         st.session_state[_STATE_ACTIVE_TAB] = None
     tab_map = {name: tab for name, tab in zip(available_tabs, tabs)}
-
-    with tab_map["Portfolio"]:
+    open_tabs = {name for name, tab in tab_map.items() if _tab_is_open(tab)}
+
+    # Portfolio and Ticker Analysis run as fragments: editing the amount or
+    # picking a ticker reruns only that section against the memoized artifacts.
+    @_fragment(st)
+    def _render_portfolio_tab() -> None:
+        artifacts.require(*_TAB_ARTIFACTS["Portfolio"])
+        ranked_df = artifacts["ranked"]
         st.markdown("### Portfolio")
         _render_video_link(st, label="▶ Watch: Understanding the Portfolio", url=_HELP_VIDEO_URLS["portfolio"])
         _render_video_link(st, label="▶ Watch: How to Read a Trade", url=_HELP_VIDEO_URLS["read_trade"])
@@ -596,10 +747,11 @@ def main() -> None:
         selected_capital = st.number_input(
             "Enter your investment amount (JMD)",
             min_value=0.0,
-            value=selected_capital,
+            value=float(st.session_state.get("total_capital", default_capital)),
             step=5_000.0,
             key="total_capital",
         )
+        enriched_allocations = _allocations_for_capital(selected_capital)
         st.caption("This is the amount you want to allocate across trades.")
         st.caption("This plan is built from the market data currently loaded in the dashboard.")
         st.caption(f"Viewed as at: {viewed_ts}")
@@ -623,27 +775,15 @@ def main() -> None:
                 show_header=False,
                 on_view_analysis=_open_ticker_analysis_from_portfolio,
             )
+            render_plan_outcomes(_plan_outcomes_for_capital(selected_capital, enriched_allocations), st_module=st)
 
-    with tab_map["Review"]:
-        st.markdown("### Review")
-        _render_video_link(st, label="▶ Watch: Understanding Review", url=_HELP_VIDEO_URLS["review"])
-        if ranked_df.empty:
-            st.info("Review will populate once ranked outputs are generated for this run.")
-        else:
-            render_portfolio_plan(
-                enriched_allocations,
-                total_capital=selected_capital,
-                st_module=st,
-                signals_df=ranked_df,
-                mode=mode_token,
-                section="review",
-                show_header=False,
-            )
-
-    with tab_map["Ticker Analysis"]:
+    @_fragment(st)
+    def _render_ticker_analysis_tab() -> None:
         st.markdown("### Ticker Analysis")
         _render_video_link(st, label="▶ Watch: Understanding Ticker Analysis", url=_HELP_VIDEO_URLS["ticker_analysis"])
-        ticker_options = _cached_extract_ticker_options(canonical_df)
+        artifacts.require(*_TAB_ARTIFACTS["Ticker Analysis"])
+        # Ticker views read one row per trade: the time exits.
+        ticker_options, analyst_df = artifacts["ticker_options"], select_exit_policy(artifacts["analyst"])
         if not ticker_options:
             st.info("Ticker Analysis will populate once ticker rows are loaded into the dataset.")
         else:
@@ -693,6 +833,9 @@ def main() -> None:
             st.markdown("#### Risk Profile")
             st.warning(metrics_behavior.get("reliability", ""))
             st.info(metrics_behavior.get("consistency", ""))
+            ticker_intervals = _cached_ticker_intervals(analyst_df).get(selected_ticker)
+            for line in format_interval_lines(ticker_intervals):
+                st.markdown(f"- {line}")
 
             st.markdown("#### What Usually Happens")
             st.markdown(f"- {ticker_payload['pattern_summary']}")
@@ -730,6 +873,21 @@ def main() -> None:
                         use_container_width=True,
                     )
 
+                    interval_df = interval_table(ticker_intervals)
+                    if not interval_df.empty:
+                        st.markdown("##### Bootstrap ranges by holding window")
+                        st.dataframe(clean_dataframe_labels(interval_df), use_container_width=True, hide_index=True)
+
+                    excursion_stats = ticker_payload.get("excursion_stats") or {}
+                    if excursion_stats:
+                        st.markdown("##### How far trades moved before exit")
+                        excursion_df = pd.DataFrame.from_dict(excursion_stats, orient="index")
+                        st.dataframe(
+                            clean_dataframe_labels(excursion_df.reset_index().rename(columns={"index": "holding_window"})),
+                            use_container_width=True,
+                            hide_index=True,
+                        )
+
                     st.markdown("##### Tier breakdown")
                     tier_df = pd.DataFrame.from_dict(ticker_payload["tier_performance"], orient="index")
                     st.dataframe(
@@ -756,17 +914,52 @@ def main() -> None:
             else:
                 st.caption("Switch to Advanced View to open the full table breakdown.")
 
-    if "Analyst Insights" in tab_map:
+    if "Portfolio" in open_tabs:
+        with tab_map["Portfolio"]:
+            _render_portfolio_tab()
+
+    if "Review" in open_tabs:
+        with tab_map["Review"]:
+            artifacts.require(*_TAB_ARTIFACTS["Review"])
+            ranked_df, enriched_allocations = artifacts["ranked"], _allocations_for_capital(selected_capital)
+            st.markdown("### Review")
+            _render_video_link(st, label="▶ Watch: Understanding Review", url=_HELP_VIDEO_URLS["review"])
+            if ranked_df.empty:
+                st.info("Review will populate once ranked outputs are generated for this run.")
+            else:
+                render_portfolio_plan(
+                    enriched_allocations,
+                    total_capital=selected_capital,
+                    st_module=st,
+                    signals_df=ranked_df,
+                    mode=mode_token,
+                    section="review",
+                    show_header=False,
+                )
+
+    if "Ticker Analysis" in open_tabs:
+        with tab_map["Ticker Analysis"]:
+            _render_ticker_analysis_tab()
+
+    if "Analyst Insights" in open_tabs:
         with tab_map["Analyst Insights"]:
+            artifacts.require(*_TAB_ARTIFACTS["Analyst Insights"])
+            analyst_df = artifacts["analyst"]
             st.markdown("### Analyst Insights")
             _render_video_link(st, label="▶ Watch: How to Use Analyst Mode", url=_HELP_VIDEO_URLS["analyst_mode"])
             if _has_analyst_insight_content(analyst_df, analyst_mode=True):
-                render_analyst_insights(analyst_df, st_module=st, analyst_mode=True)
+                render_analyst_insights(
+                    analyst_df,
+                    st_module=st,
+                    analyst_mode=True,
+                    cube=_cached_analyst_cube(analyst_df),
+                )
             else:
                 st.info("Analyst insights are not available for this dataset yet.")
 
-    if "Data" in tab_map:
+    if "Data" in open_tabs:
         with tab_map["Data"]:
+            artifacts.require(*_TAB_ARTIFACTS["Data"])
             st.markdown("### Data")
             _render_data_status_summary(
                 st,
@@ -777,20 +970,20 @@ def main() -> None:
                 analyst_mode=mode_token == "analyst",
             )
             if mode_token == "analyst":
-                diagnostics_df = pd.DataFrame(
-                    [
-                        {"stage": "canonical", "rows": int(len(canonical_df)), "unique_tickers": _extract_unique_ticker_count(canonical_df)},
-                        {"stage": "ranked", "rows": int(len(ranked_df)), "unique_tickers": _extract_unique_ticker_count(ranked_df)},
-                    ]
-                )
-                st.dataframe(clean_dataframe_labels(diagnostics_df), use_container_width=True, hide_index=True)
-                st.code(
-                    (
-                        f"canonical first 20 tickers: {_extract_ticker_preview(canonical_df)}\n"
-                        f"ranked first 20 tickers: {_extract_ticker_preview(ranked_df)}"
-                    ),
-                    language="text",
-                )
+                diagnostics_rows = [
+                    {"stage": "canonical", "rows": int(len(canonical_df)), "unique_tickers": _extract_unique_ticker_count(canonical_df, dataset_profile)},
+                ]
+                previews = [f"canonical first 20 tickers: {_extract_ticker_preview(canonical_df, profile=dataset_profile)}"]
+                # Rankings are reported only once another tab has built them; the Data tab never runs the pipeline.
+                if artifacts.is_computed("ranked"):
+                    ranked_df = artifacts["ranked"]
+                    diagnostics_rows.append({"stage": "ranked", "rows": int(len(ranked_df)), "unique_tickers": _extract_unique_ticker_count(ranked_df)})
+                    previews.append(f"ranked first 20 tickers: {_extract_ticker_preview(ranked_df)}")
+                else:
+                    st.caption("Ranked diagnostics appear here once the Portfolio or Review tab has built the rankings.")
+                st.dataframe(clean_dataframe_labels(pd.DataFrame(diagnostics_rows)), use_container_width=True, hide_index=True)
+                _render_result_cache_stats(st, result_cache.stats())
+                st.code("\n".join(previews), language="text")
                 with st.expander("Data preview"):
                     st.dataframe(clean_dataframe_labels(canonical_df.head(100)), use_container_width=True)
             else:
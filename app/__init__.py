@@ -1 +1,27 @@
-"""Application package root for decision-support modules."""
+"""Application package root for decision-support modules.
+
+Subpackages are imported on first attribute access, so ``import app`` stays
+cheap and each stage pays for its own imports when it first runs.
+"""
+
+from app.lazy import lazy_exports
+
+_SUBPACKAGES = (
+    "analysis",
+    "api",
+    "cache",
+    "costs",
+    "data",
+    "demo",
+    "events",
+    "insights",
+    "language",
+    "metrics",
+    "planner",
+    "ranking",
+    "shell",
+    "signals",
+    "ui",
+)
+
+__getattr__ = lazy_exports(__name__, {}, _SUBPACKAGES)
@@ -0,0 +1,183 @@
+"""Batched bootstrap confidence intervals for per-ticker trade statistics."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.analysis.ticker_drilldown import RETURN_COLUMNS, TICKER_COLUMNS
+from app.data.processor import canonicalize_symbol
+
+DEFAULT_RESAMPLES = 1000
+DEFAULT_CONFIDENCE = 0.90
+# Upper bound on resampled values per batch. Each cell holds an int64
+# resample index, the gathered float64 value and np.median's float64 working
+# copy, so a full batch peaks near 480 MB.
+MAX_CELLS = 20_000_000
+
+STATISTICS = ("win_rate", "median_return", "avg_return")
+INTERVAL_COLUMNS = [
+    "instrument",
+    "holding_window",
+    "n",
+    *[f"{stat}{suffix}" for stat in STATISTICS for suffix in ("", "_low", "_high")],
+]
+
+
+def _first_column(df: pd.DataFrame, candidates: Sequence[str]) -> str | None:
+    return next((column for column in candidates if column in df.columns), None)
+
+
+def _resample_statistics(values: np.ndarray, n_resamples: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Bootstrap ``values`` (groups x n, one row per group of equal size) in one batch.
+
+    Returns an array of shape (groups, resamples, 3) holding win rate,
+    median and mean for every resample.
+    """
+    rng = np.random.default_rng(seed)
+    groups, size = values.shape
+    indices = rng.integers(0, size, size=(groups, n_resamples, size))
+    samples = np.take_along_axis(values[:, None, :], indices, axis=2)
+    return np.stack(
+        [(samples > 0).mean(axis=2), np.median(samples, axis=2), samples.mean(axis=2)],
+        axis=2,
+    )
+
+
+def _resample_task(args: tuple[np.ndarray, int, np.random.SeedSequence]) -> np.ndarray:
+    return _resample_statistics(*args)
+
+
+def bootstrap_intervals(
+    trades: pd.DataFrame,
+    *,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int = 0,
+    workers: int = 1,
+) -> pd.DataFrame:
+    """Percentile bootstrap intervals for win rate, median and mean return.
+
+    Intervals are computed per ticker across all holding windows
+    (``holding_window`` is missing on those rows) and per ticker and holding
+    window. Groups of equal size are resampled together with one
+    resample-index matrix, so the whole universe takes a handful of NumPy
+    calls; ``workers > 1`` spreads those batches over a process pool.
+    Results are deterministic for a given ``seed`` whatever the worker count.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    ticker_column = _first_column(trades, TICKER_COLUMNS)
+    return_column = _first_column(trades, RETURN_COLUMNS)
+    if trades.empty or ticker_column is None or return_column is None:
+        return pd.DataFrame(columns=INTERVAL_COLUMNS)
+
+    frame = pd.DataFrame(
+        {
+            "instrument": trades[ticker_column].astype(str).map(canonicalize_symbol).to_numpy(),
+            "holding_window": (
+                pd.to_numeric(trades["holding_window"], errors="coerce").to_numpy()
+                if "holding_window" in trades.columns
+                else np.nan
+            ),
+            "value": pd.to_numeric(trades[return_column], errors="coerce").to_numpy(dtype=np.float64),
+        }
+    ).dropna(subset=["value"])
+    frame = frame[frame["instrument"] != ""]
+    if frame.empty:
+        return pd.DataFrame(columns=INTERVAL_COLUMNS)
+
+    groups: list[tuple[str, float, np.ndarray]] = []
+    for instrument, positions in frame.groupby("instrument", sort=True).indices.items():
+        groups.append((instrument, np.nan, frame["value"].to_numpy()[positions]))
+    windowed = frame.dropna(subset=["holding_window"])
+    for (instrument, window), positions in windowed.groupby(["instrument", "holding_window"], sort=True).indices.items():
+        groups.append((instrument, float(window), windowed["value"].to_numpy()[positions]))
+
+    # Bucket groups by size so each bucket is one rectangular resample.
+    tasks: list[tuple[list[int], np.ndarray]] = []
+    sizes = np.array([values.size for _, _, values in groups])
+    for size in np.unique(sizes):
+        members = np.flatnonzero(sizes == size)
+        per_batch = max(1, MAX_CELLS // (int(size) * n_resamples))
+        for start in range(0, members.size, per_batch):
+            batch = members[start : start + per_batch].tolist()
+            tasks.append((batch, np.vstack([groups[idx][2] for idx in batch])))
+
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    payloads = [(values, n_resamples, task_seed) for (_, values), task_seed in zip(tasks, seeds)]
+    if workers > 1 and len(payloads) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_resample_task, payloads))
+    else:
+        results = [_resample_task(payload) for payload in payloads]
+
+    tail = (1 - confidence) / 2
+    rows: list[dict[str, Any]] = [{} for _ in groups]
+    for (members, values), resampled in zip(tasks, results):
+        low, high = np.quantile(resampled, [tail, 1 - tail], axis=1)
+        point = np.stack([(values > 0).mean(axis=1), np.median(values, axis=1), values.mean(axis=1)], axis=1)
+        for offset, idx in enumerate(members):
+            instrument, window, group_values = groups[idx]
+            row: dict[str, Any] = {"instrument": instrument, "holding_window": window, "n": int(group_values.size)}
+            for stat_idx, stat in enumerate(STATISTICS):
+                row[stat] = float(point[offset, stat_idx])
+                row[f"{stat}_low"] = float(low[offset, stat_idx])
+                row[f"{stat}_high"] = float(high[offset, stat_idx])
+            rows[idx] = row
+
+    result = pd.DataFrame(rows, columns=INTERVAL_COLUMNS)
+    result["holding_window"] = result["holding_window"].astype("Int64")
+    return result
+
+
+def intervals_by_ticker(intervals: pd.DataFrame) -> dict[str, dict[str, Any]]:
+    """Index interval rows by ticker for constant-time lookups in the UI.
+
+    Each entry holds the all-window row under ``"overall"`` and per-window
+    rows under ``"by_window"`` keyed by holding window in days.
+    """
+    lookup: dict[str, dict[str, Any]] = {}
+    for row in intervals.to_dict("records"):
+        entry = lookup.setdefault(row["instrument"], {"overall": None, "by_window": {}})
+        if pd.isna(row["holding_window"]):
+            entry["overall"] = row
+        else:
+            entry["by_window"][int(row["holding_window"])] = row
+    return lookup
+
+
+def format_interval_lines(entry: dict[str, Any] | None, *, confidence: float = DEFAULT_CONFIDENCE) -> list[str]:
+    """Plain-language lines describing the all-window intervals for one ticker."""
+    overall = (entry or {}).get("overall")
+    if not overall:
+        return []
+    label = f"{confidence:.0%} bootstrap range from {overall['n']} signals"
+    return [
+        f"Win rate likely between {overall['win_rate_low']:.0%} and {overall['win_rate_high']:.0%} ({label}).",
+        f"Median return likely between {overall['median_return_low']:.2f}% and {overall['median_return_high']:.2f}%.",
+        f"Average return likely between {overall['avg_return_low']:.2f}% and {overall['avg_return_high']:.2f}%.",
+    ]
+
+
+def interval_table(entry: dict[str, Any] | None, windows: Sequence[int] | None = None) -> pd.DataFrame:
+    """Per-holding-window interval table for the analyst breakdown."""
+    by_window = (entry or {}).get("by_window", {})
+    rows = []
+    for window in windows if windows is not None else sorted(by_window):
+        row = by_window.get(window)
+        if row is None:
+            continue
+        rows.append(
+            {
+                "holding_window": f"{window}D",
+                "n": row["n"],
+                "win_rate_range": f"{row['win_rate_low']:.0%} – {row['win_rate_high']:.0%}",
+                "median_return_range": f"{row['median_return_low']:.2f}% – {row['median_return_high']:.2f}%",
+                "avg_return_range": f"{row['avg_return_low']:.2f}% – {row['avg_return_high']:.2f}%",
+            }
+        )
+    return pd.DataFrame(rows)
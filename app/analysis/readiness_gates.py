@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import numpy as np
 import pandas as pd
 
+from app.data.dates import ensure_dates, parse_dates
+from app.data.markets import filter_markets
+from app.data.panel import PricePanel
+
 
 @dataclass(frozen=True)
 class ReadinessThresholds:
@@ -25,15 +29,24 @@ def _first_existing(df: pd.DataFrame, candidates: list[str]) -> str | None:
 
 
 def _to_datetime(df: pd.DataFrame, column: str = "date") -> pd.DataFrame:
-    out = df.copy()
-    if column in out.columns:
-        out[column] = pd.to_datetime(out[column], errors="coerce")
-    return out
+    return ensure_dates(df, [column])
+
 
+def _readiness_frame(data: pd.DataFrame | PricePanel, markets: Iterable[str] | str | None) -> pd.DataFrame:
+    if isinstance(data, PricePanel):
+        if markets is not None:
+            raise ValueError("Price panels carry no market column; filter markets before building the panel.")
+        return data.to_frame()
+    return _to_datetime(filter_markets(data, markets))
 
-def compute_readiness_metrics(data: pd.DataFrame, thresholds: ReadinessThresholds | None = None) -> pd.DataFrame:
+
+def compute_readiness_metrics(
+    data: pd.DataFrame | PricePanel,
+    thresholds: ReadinessThresholds | None = None,
+    markets: Iterable[str] | str | None = None,
+) -> pd.DataFrame:
     thresholds = thresholds or ReadinessThresholds()
-    df = _to_datetime(data)
+    df = _readiness_frame(data, markets)
     ticker_col = _first_existing(df, ["ticker", "instrument", "symbol"])
     if ticker_col is None or "date" not in df.columns:
         raise ValueError("Input data must contain date and ticker/instrument/symbol fields.")
@@ -47,7 +60,7 @@ def compute_readiness_metrics(data: pd.DataFrame, thresholds: ReadinessThreshold
     signal_date_col = _first_existing(df, ["signal_date", "candidate_date", "entry_date"])
 
     base_cols = [ticker_col, "date"] + [c for c in [close_col, high_col, low_col, volume_col, traded_value_col, trades_count_col, signal_date_col] if c]
-    work = df[base_cols].copy().sort_values([ticker_col, "date"])
+    work = df[base_cols].sort_values([ticker_col, "date"])
 
     rows: list[dict[str, Any]] = []
     for ticker, grp in work.groupby(ticker_col):
@@ -118,7 +131,7 @@ def compute_readiness_metrics(data: pd.DataFrame, thresholds: ReadinessThreshold
             and (np.isnan(avg_volume_20d) or avg_volume_20d >= thresholds.min_avg_volume_20d)
         )
 
-        parsed_signal_dates = pd.to_datetime(grp[signal_date_col], errors="coerce") if signal_date_col is not None else pd.Series(dtype="datetime64[ns]")
+        parsed_signal_dates = parse_dates(grp[signal_date_col]) if signal_date_col is not None else pd.Series(dtype="datetime64[ns]")
         timing_assessable = bool(signal_date_col is not None and parsed_signal_dates.notna().any())
 
         rows.append(
@@ -160,6 +173,156 @@ def compute_readiness_metrics(data: pd.DataFrame, thresholds: ReadinessThreshold
     return pd.DataFrame(rows)
 
 
+TIMESERIES_COLUMNS = [
+    "ticker",
+    "date",
+    "trading_days_count",
+    "positive_volume_ratio",
+    "avg_volume_20d",
+    "median_volume_20d",
+    "avg_volume_60d",
+    "median_volume_60d",
+    "avg_turnover_20d",
+    "median_turnover_20d",
+    "close_to_close_volatility_20d",
+    "close_to_close_volatility_60d",
+    "max_close_to_close_drawdown",
+    "volume_deterioration",
+    "volume_support_present",
+    "small_sample",
+]
+
+
+def compute_readiness_timeseries(
+    data: pd.DataFrame | PricePanel,
+    thresholds: ReadinessThresholds | None = None,
+    markets: Iterable[str] | str | None = None,
+) -> pd.DataFrame:
+    """Readiness metrics as of every (ticker, date) row.
+
+    Each row matches what :func:`compute_readiness_metrics` reports for the
+    ticker's history truncated at that date, so the last row per ticker
+    equals the snapshot. Windows are grouped rolling/expanding kernels over
+    one sorted frame, so the cost grows linearly with rows. ``markets``
+    restricts the rows to those markets first. ``data`` may be a
+    :class:`PricePanel` (close and volume only).
+    """
+    thresholds = thresholds or ReadinessThresholds()
+    df = _readiness_frame(data, markets)
+    ticker_col = _first_existing(df, ["ticker", "instrument", "symbol"])
+    if ticker_col is None or "date" not in df.columns:
+        raise ValueError("Input data must contain date and ticker/instrument/symbol fields.")
+
+    close_col = _first_existing(df, ["close", "close_price", "adjusted_close", "adj_close"])
+    volume_col = _first_existing(df, ["volume"])
+    traded_value_col = _first_existing(df, ["value_traded"])
+
+    work = (
+        df.dropna(subset=["date"])
+        .sort_values([ticker_col, "date"], kind="stable")
+        .reset_index(drop=True)
+    )
+    nan_column = pd.Series(np.nan, index=work.index)
+    volume = pd.to_numeric(work[volume_col], errors="coerce") if volume_col else nan_column
+    close = pd.to_numeric(work[close_col], errors="coerce") if close_col else nan_column
+    estimated_turnover = close * volume
+    turnover = pd.to_numeric(work[traded_value_col], errors="coerce") if traded_value_col else estimated_turnover
+    turnover = turnover.fillna(estimated_turnover)
+
+    keys = work[ticker_col]
+    frame = pd.DataFrame(
+        {
+            "volume": volume,
+            "turnover": turnover,
+            "daily_return": close.groupby(keys, sort=False).pct_change(),
+            "positive_volume": (volume > 0).astype(np.float64),
+        }
+    )
+    grouped = frame.groupby(keys, sort=False)
+    trading_days_count = grouped.cumcount() + 1
+
+    def _rolling(columns: list[str], window: int, min_periods: int, how: str) -> pd.DataFrame:
+        rolled = getattr(grouped[columns].rolling(window, min_periods=min_periods), how)()
+        return rolled.droplevel(0).sort_index()
+
+    mean_20 = _rolling(["volume", "turnover"], 20, 1, "mean")
+    median_20 = _rolling(["volume", "turnover"], 20, 1, "median")
+    mean_60 = _rolling(["volume"], 60, 1, "mean")["volume"]
+    median_60 = _rolling(["volume"], 60, 1, "median")["volume"]
+    std_20 = _rolling(["daily_return"], 20, 2, "std")["daily_return"]
+    std_60 = _rolling(["daily_return"], 60, 2, "std")["daily_return"]
+
+    running_peak = close.groupby(keys, sort=False).cummax()
+    max_drawdown = ((close / running_peak) - 1.0).groupby(keys, sort=False).cummin()
+    positive_volume_ratio = grouped["positive_volume"].cumsum() / trading_days_count
+    has_60 = trading_days_count >= 60
+    avg_volume_20d = mean_20["volume"]
+
+    result = pd.DataFrame(
+        {
+            "ticker": keys,
+            "date": work["date"],
+            "trading_days_count": trading_days_count,
+            "positive_volume_ratio": positive_volume_ratio,
+            "avg_volume_20d": avg_volume_20d,
+            "median_volume_20d": median_20["volume"],
+            "avg_volume_60d": mean_60.where(has_60),
+            "median_volume_60d": median_60.where(has_60),
+            "avg_turnover_20d": mean_20["turnover"],
+            "median_turnover_20d": median_20["turnover"],
+            "close_to_close_volatility_20d": std_20,
+            "close_to_close_volatility_60d": std_60.where(has_60),
+            "max_close_to_close_drawdown": max_drawdown,
+            "volume_deterioration": (avg_volume_20d > 0)
+            & (volume < avg_volume_20d * thresholds.min_latest_volume_vs_avg20),
+            "volume_support_present": (trading_days_count >= thresholds.min_trading_days)
+            & (positive_volume_ratio >= thresholds.min_positive_volume_ratio)
+            & (avg_volume_20d.isna() | (avg_volume_20d >= thresholds.min_avg_volume_20d)),
+            "small_sample": trading_days_count < thresholds.small_sample_days,
+        },
+        columns=TIMESERIES_COLUMNS,
+    )
+    return result
+
+
+def readiness_asof(
+    trades: pd.DataFrame,
+    readiness: pd.DataFrame,
+    *,
+    date_col: str = "entry_date",
+    ticker_col: str = "instrument",
+    allow_exact_matches: bool = True,
+) -> pd.DataFrame:
+    """Attach the latest readiness row on or before each trade's ``date_col``.
+
+    ``readiness`` is the output of :func:`compute_readiness_timeseries`.
+    Pass ``allow_exact_matches=False`` to use only bars strictly before the
+    trade date. Trades keep their original order; trades with no earlier
+    readiness row get missing values.
+    """
+    right = readiness.rename(columns={"ticker": ticker_col, "date": "readiness_date"})
+    right = right.sort_values("readiness_date", kind="stable")
+    left = trades.assign(
+        _row_order=np.arange(len(trades)),
+        _asof_date=parse_dates(trades[date_col]),
+    )
+    missing_date = left["_asof_date"].isna()
+    merged = pd.merge_asof(
+        left.loc[~missing_date].sort_values("_asof_date", kind="stable"),
+        right,
+        left_on="_asof_date",
+        right_on="readiness_date",
+        by=ticker_col,
+        direction="backward",
+        allow_exact_matches=allow_exact_matches,
+    )
+    if missing_date.any():
+        merged = pd.concat([merged, left.loc[missing_date]], ignore_index=True)
+    merged = merged.sort_values("_row_order", kind="stable").drop(columns=["_row_order", "_asof_date"])
+    merged.index = trades.index
+    return merged
+
+
 def evaluate_models(metrics: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     model_rows = []
     ticker_rows = []
@@ -6,6 +6,7 @@ from typing import Any
 
 import pandas as pd
 
+from app.data.dates import parse_dates
 from app.data.processor import canonicalize_symbol
 
 TICKER_COLUMNS = ["ticker", "instrument"]
@@ -13,6 +14,7 @@ RETURN_COLUMNS = ["net_return_pct", "net_return", "return_pct", "return"]
 TIER_COLUMNS = ["quality_tier", "tier"]
 NORMALIZED_RETURN_COLUMN = "_normalized_return_pct"
 PATTERN_SUMMARY_THRESHOLD_PCT = 0.3
+EXCURSION_COLUMNS = ["mae_pct", "mfe_pct", "bars_to_peak"]
 
 
 def _resolve_first_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
@@ -37,10 +39,8 @@ def _normalize_returns_to_percentage_points(returns: pd.Series, return_column: s
 
 
 def _attach_normalized_returns(df: pd.DataFrame, return_column: str) -> pd.DataFrame:
-    scoped = df.copy()
-    returns = pd.to_numeric(scoped[return_column], errors="coerce")
-    scoped[NORMALIZED_RETURN_COLUMN] = _normalize_returns_to_percentage_points(returns, return_column)
-    return scoped
+    returns = pd.to_numeric(df[return_column], errors="coerce")
+    return df.assign(**{NORMALIZED_RETURN_COLUMN: _normalize_returns_to_percentage_points(returns, return_column)})
 
 
 def _resolve_tier_column(df: pd.DataFrame) -> str | None:
@@ -52,8 +52,7 @@ def _scope_to_ticker(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
     if df.empty or ticker_column is None:
         return pd.DataFrame(columns=df.columns)
     ticker_token = canonicalize_symbol(ticker)
-    scoped = df[df[ticker_column].astype(str).map(canonicalize_symbol) == ticker_token].copy()
-    return scoped
+    return df[df[ticker_column].astype(str).map(canonicalize_symbol) == ticker_token]
 
 
 def _format_holding_window(value: Any) -> str:
@@ -100,7 +99,7 @@ def compute_signal_breakdown(df: pd.DataFrame, ticker: str) -> list[dict[str, An
     tier_column = _resolve_tier_column(scoped)
 
     if "date" in scoped.columns:
-        scoped["_sort_date"] = pd.to_datetime(scoped["date"], errors="coerce")
+        scoped["_sort_date"] = parse_dates(scoped["date"])
         scoped = scoped.sort_values("_sort_date", ascending=False, na_position="last")
 
     signals: list[dict[str, Any]] = []
@@ -164,6 +163,31 @@ def compute_return_distribution(df: pd.DataFrame, ticker: str) -> dict[str, int]
     return distribution
 
 
+def compute_excursion_stats(df: pd.DataFrame, ticker: str) -> dict[str, dict[str, float | int]]:
+    """Per-window spread of how far trades ran against (MAE) and for (MFE) the holder."""
+    scoped = _scope_to_ticker(df, ticker)
+    if scoped.empty or "holding_window" not in scoped.columns:
+        return {}
+    if not all(column in scoped.columns for column in EXCURSION_COLUMNS):
+        return {}
+
+    excursions = scoped[["holding_window", *EXCURSION_COLUMNS]].apply(
+        lambda column: pd.to_numeric(column, errors="coerce")
+    )
+    stats: dict[str, dict[str, float | int]] = {}
+    for window, group in excursions.dropna().groupby("holding_window"):
+        mae, mfe = group["mae_pct"], group["mfe_pct"]
+        stats[_format_holding_window(window)] = {
+            "count": int(len(group)),
+            "median_mae_pct": float(mae.median()),
+            "worst_mae_pct": float(mae.quantile(0.1)),
+            "median_mfe_pct": float(mfe.median()),
+            "best_mfe_pct": float(mfe.quantile(0.9)),
+            "median_bars_to_peak": float(group["bars_to_peak"].median()),
+        }
+    return stats
+
+
 def compute_tier_performance(df: pd.DataFrame, ticker: str) -> dict[str, dict[str, float | int]]:
     scoped = _scope_to_ticker(df, ticker)
     return_column = _resolve_return_column(scoped)
@@ -173,7 +197,7 @@ def compute_tier_performance(df: pd.DataFrame, ticker: str) -> dict[str, dict[st
     scoped = _attach_normalized_returns(scoped, return_column)
 
     stats: dict[str, dict[str, float | int]] = {}
-    for tier, group in scoped.groupby(tier_column, dropna=True):
+    for tier, group in scoped.groupby(tier_column, dropna=True, observed=True):
         stats[str(tier)] = _build_group_stats(group, NORMALIZED_RETURN_COLUMN)
 
     return stats
@@ -268,6 +292,7 @@ def build_ticker_drilldown(df: pd.DataFrame, ticker: str) -> dict[str, Any]:
     return_distribution = compute_return_distribution(df, ticker)
     tier_performance = compute_tier_performance(df, ticker)
     volatility_performance = compute_volatility_performance(df, ticker)
+    excursion_stats = compute_excursion_stats(df, ticker)
 
     if signal_count == 0:
         pattern_summary = "There is not enough data to say much about this stock yet."
@@ -286,5 +311,6 @@ def build_ticker_drilldown(df: pd.DataFrame, ticker: str) -> dict[str, Any]:
         "return_distribution": return_distribution,
         "tier_performance": tier_performance,
         "volatility_performance": volatility_performance,
+        "excursion_stats": excursion_stats,
         "pattern_summary": pattern_summary,
     }
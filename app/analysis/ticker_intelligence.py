@@ -137,7 +137,7 @@ def compute_ticker_metrics(df: pd.DataFrame, ticker: str, *, mode: str = "beginn
         return _empty_payload()
 
     ticker_token = canonicalize_symbol(ticker)
-    scoped = df[df["instrument"].astype(str).map(canonicalize_symbol) == ticker_token].copy()
+    scoped = df[df["instrument"].astype(str).map(canonicalize_symbol) == ticker_token]
     scoped = scoped.dropna(subset=[return_column])
     if scoped.empty:
         return _empty_payload()
@@ -0,0 +1 @@
+"""Local read-only HTTP API for ranked and ticker payloads."""
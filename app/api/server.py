@@ -0,0 +1,259 @@
+"""Asyncio HTTP server exposing warm pipeline payloads as read-only JSON."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import math
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Mapping
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from app.api.state import VIEW_MODES, ApiState, JsonPayload, load_api_state
+from app.data.processor import canonicalize_symbol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+_MAX_HEADER_LINES = 100
+
+
+@dataclass(frozen=True)
+class ApiResponse:
+    """Status, body, and validator for one API reply."""
+
+    status: int
+    body: bytes = b""
+    etag: str | None = None
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+
+def _error(status: HTTPStatus, message: str) -> ApiResponse:
+    body = json.dumps({"error": message}).encode("utf-8")
+    return ApiResponse(status=int(status), body=body)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [token.strip() for token in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _respond(payload: JsonPayload, headers: Mapping[str, str]) -> ApiResponse:
+    if _etag_matches(headers.get("if-none-match"), payload.etag):
+        return ApiResponse(status=int(HTTPStatus.NOT_MODIFIED), etag=payload.etag)
+    return ApiResponse(status=int(HTTPStatus.OK), body=payload.body, etag=payload.etag)
+
+
+def _query_value(query: dict[str, list[str]], name: str) -> str | None:
+    values = query.get(name)
+    return values[-1] if values else None
+
+
+async def handle_request(
+    state: ApiState,
+    method: str,
+    target: str,
+    headers: Mapping[str, str] | None = None,
+) -> ApiResponse:
+    """Route one request against the warm state and apply conditional GET rules."""
+    headers = {key.lower(): value for key, value in (headers or {}).items()}
+    if method not in {"GET", "HEAD"}:
+        return ApiResponse(
+            status=int(HTTPStatus.METHOD_NOT_ALLOWED),
+            body=json.dumps({"error": "Only GET and HEAD are supported."}).encode("utf-8"),
+            headers={"Allow": "GET, HEAD"},
+        )
+
+    split = urlsplit(target)
+    segments = [unquote(part) for part in split.path.split("/") if part]
+    query = parse_qs(split.query)
+
+    if segments == ["health"]:
+        return ApiResponse(status=int(HTTPStatus.OK), body=b'{"status":"ok"}')
+    if segments == ["rankings"]:
+        return _respond(state.rankings(), headers)
+    if segments == ["tickers"]:
+        return _respond(state.ticker_list(), headers)
+    if segments == ["allocation"]:
+        return _allocation_response(state, query, headers)
+    if len(segments) == 3 and segments[0] == "tickers" and segments[2] in {"drilldown", "metrics"}:
+        ticker = canonicalize_symbol(segments[1])
+        if not state.has_ticker(ticker):
+            return _error(HTTPStatus.NOT_FOUND, f"Unknown ticker: {segments[1]}")
+        mode = (_query_value(query, "mode") or "beginner").strip().lower()
+        if mode not in VIEW_MODES:
+            return _error(HTTPStatus.BAD_REQUEST, "mode must be 'beginner' or 'analyst'.")
+
+        if segments[2] == "drilldown":
+            key, build = ("drilldown", ticker), lambda: state.ticker_drilldown(ticker)
+        else:
+            key, build = ("metrics", ticker, mode), lambda: state.ticker_metrics(ticker, mode)
+        payload = state.cached(key)
+        if payload is None:
+            # First touch of a ticker is CPU-bound; keep the loop free for
+            # requests that can be answered from already-encoded payloads.
+            payload = await asyncio.get_running_loop().run_in_executor(None, build)
+        return _respond(payload, headers)
+
+    return _error(HTTPStatus.NOT_FOUND, f"No route for {split.path}")
+
+
+def _allocation_response(
+    state: ApiState,
+    query: dict[str, list[str]],
+    headers: Mapping[str, str],
+) -> ApiResponse:
+    try:
+        capital = float(_query_value(query, "capital") or 100_000.0)
+    except ValueError:
+        return _error(HTTPStatus.BAD_REQUEST, "capital must be a number.")
+    if not math.isfinite(capital):
+        return _error(HTTPStatus.BAD_REQUEST, "capital must be a finite number.")
+    if capital < 0:
+        return _error(HTTPStatus.BAD_REQUEST, "capital must not be negative.")
+
+    mode = (_query_value(query, "mode") or "beginner").strip().lower()
+    if mode not in VIEW_MODES:
+        return _error(HTTPStatus.BAD_REQUEST, "mode must be 'beginner' or 'analyst'.")
+
+    raw_cap = _query_value(query, "max_funded_trades")
+    try:
+        max_funded_trades = int(raw_cap) if raw_cap is not None else None
+    except ValueError:
+        return _error(HTTPStatus.BAD_REQUEST, "max_funded_trades must be an integer.")
+
+    return _respond(state.allocation(capital, mode, max_funded_trades), headers)
+
+
+def _render_response(response: ApiResponse, *, head_only: bool, keep_alive: bool) -> bytes:
+    status = HTTPStatus(response.status)
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    if response.status != HTTPStatus.NOT_MODIFIED:
+        lines.append("Content-Type: application/json")
+    lines.append(f"Content-Length: {0 if response.status == HTTPStatus.NOT_MODIFIED else len(response.body)}")
+    if response.etag is not None:
+        lines.append(f"ETag: {response.etag}")
+        lines.append("Cache-Control: no-cache")
+    for name, value in response.headers.items():
+        lines.append(f"{name}: {value}")
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    if head_only or response.status == HTTPStatus.NOT_MODIFIED:
+        return head
+    return head + response.body
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str] | None:
+    headers: dict[str, str] = {}
+    for _ in range(_MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, separator, value = line.decode("latin-1").partition(":")
+        if not separator:
+            return None
+        headers[name.strip().lower()] = value.strip()
+    return None
+
+
+async def _serve_connection(
+    state: ApiState,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            parts = request_line.decode("latin-1").split()
+            headers = await _read_headers(reader)
+            if len(parts) != 3 or headers is None:
+                writer.write(
+                    _render_response(
+                        _error(HTTPStatus.BAD_REQUEST, "Malformed request."),
+                        head_only=False,
+                        keep_alive=False,
+                    )
+                )
+                await writer.drain()
+                break
+
+            method, target, version = parts
+            content_length = int(headers.get("content-length", "0") or 0)
+            if content_length:
+                await reader.readexactly(content_length)
+
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+            try:
+                response = await handle_request(state, method.upper(), target, headers)
+            except Exception:  # pragma: no cover - defensive guard for unexpected payload errors
+                logger.exception("API request failed: %s %s", method, target)
+                response = _error(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error.")
+
+            writer.write(_render_response(response, head_only=method.upper() == "HEAD", keep_alive=keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+        with contextlib.suppress(ConnectionError):
+            await writer.wait_closed()
+
+
+async def start_server(
+    state: ApiState,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+) -> asyncio.AbstractServer:
+    """Start serving ``state`` and return the listening asyncio server."""
+    return await asyncio.start_server(
+        lambda reader, writer: _serve_connection(state, reader, writer),
+        host=host,
+        port=port,
+    )
+
+
+async def serve(state: ApiState, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """Serve requests until cancelled."""
+    server = await start_server(state, host, port)
+    bound = ", ".join(str(sock.getsockname()) for sock in server.sockets or [])
+    logger.info("JSE Market Lab API listening on %s", bound)
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    """CLI entrypoint for the local API service."""
+    parser = argparse.ArgumentParser(description="Serve rankings and ticker payloads over local HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind (default: loopback only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument(
+        "--warm-tickers",
+        action="store_true",
+        help="Encode every ticker drilldown and metrics payload before accepting requests",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    state = load_api_state()
+    state.warm(include_tickers=args.warm_tickers)
+    print(f"API ready on http://{args.host}:{args.port} ({len(state.tickers)} tickers loaded).", flush=True)
+    try:
+        asyncio.run(serve(state, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
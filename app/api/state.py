@@ -0,0 +1,215 @@
+"""Warm in-memory pipeline state backing the local HTTP API."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+from app.analysis.ticker_drilldown import build_ticker_drilldown
+from app.analysis.ticker_intelligence import compute_ticker_metrics
+from app.costs.compact import materialize_trade_dates
+from app.costs.exits import select_exit_policy
+from app.data.ingest import ingest_dataset
+from app.data.processor import canonicalize_symbol
+from app.data.profile import DatasetProfile, profile_from_meta
+from app.demo.run_demo import run_demo
+from app.planner.allocation import generate_portfolio_allocation
+from app.shell import build_analyst_dataset, coerce_trade_rows_from_ranked
+
+VIEW_MODES = {"beginner", "analyst"}
+
+
+@dataclass(frozen=True)
+class JsonPayload:
+    """Encoded JSON body with its strong validator."""
+
+    body: bytes
+    etag: str
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert pandas/numpy values into plain JSON-safe Python objects."""
+    if isinstance(value, pd.DataFrame):
+        return [to_jsonable(record) for record in value.to_dict("records")]
+    if isinstance(value, pd.Series):
+        return [to_jsonable(item) for item in value.tolist()]
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, np.ndarray)):
+        return [to_jsonable(item) for item in value]
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (str, int, bool)):
+        return value
+    if pd.isna(value):
+        return None
+    return str(value)
+
+
+def encode_payload(payload: Any) -> JsonPayload:
+    """Serialize a payload once and derive its ETag from the encoded bytes."""
+    body = json.dumps(to_jsonable(payload), separators=(",", ":"), allow_nan=False).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    return JsonPayload(body=body, etag=etag)
+
+
+class ApiState:
+    """Pipeline results loaded once and kept warm for concurrent API reads."""
+
+    def __init__(
+        self,
+        *,
+        canonical_df: pd.DataFrame,
+        meta: dict,
+        ranked_df: pd.DataFrame,
+        analyst_df: pd.DataFrame,
+        issues: dict | None = None,
+    ) -> None:
+        self.canonical_df = canonical_df
+        self.meta = meta
+        self.issues = issues or {"errors": [], "warnings": []}
+        self.ranked_df = ranked_df
+        self.analyst_df = analyst_df
+        self.trade_rows = coerce_trade_rows_from_ranked(ranked_df) if not ranked_df.empty else []
+        self.tickers = _extract_tickers(canonical_df, profile_from_meta(meta))
+        self._ticker_set = set(self.tickers)
+        self._analyst_by_ticker = _split_by_ticker(select_exit_policy(analyst_df))
+        self._payloads: dict[Hashable, JsonPayload] = {}
+        self._lock = threading.Lock()
+
+    def has_ticker(self, ticker: str) -> bool:
+        return canonicalize_symbol(ticker) in self._ticker_set
+
+    def cached(self, key: Hashable) -> JsonPayload | None:
+        """Return an already-encoded payload without doing any work."""
+        return self._payloads.get(key)
+
+    def rankings(self) -> JsonPayload:
+        return self._memoize(
+            ("rankings",),
+            lambda: {
+                "dataset_id": self.meta.get("dataset_id"),
+                "rankings": self.ranked_df,
+            },
+        )
+
+    def ticker_list(self) -> JsonPayload:
+        return self._memoize(
+            ("tickers",),
+            lambda: {"dataset_id": self.meta.get("dataset_id"), "tickers": self.tickers},
+        )
+
+    def ticker_drilldown(self, ticker: str) -> JsonPayload:
+        token = canonicalize_symbol(ticker)
+        return self._memoize(
+            ("drilldown", token),
+            lambda: {"ticker": token, **build_ticker_drilldown(self._ticker_frame(token), token)},
+        )
+
+    def ticker_metrics(self, ticker: str, mode: str = "beginner") -> JsonPayload:
+        token = canonicalize_symbol(ticker)
+        return self._memoize(
+            ("metrics", token, mode),
+            lambda: {
+                "ticker": token,
+                "mode": mode,
+                **compute_ticker_metrics(self._ticker_frame(token), token, mode=mode),
+            },
+        )
+
+    def allocation(
+        self,
+        capital: float,
+        mode: str = "beginner",
+        max_funded_trades: int | None = None,
+    ) -> JsonPayload:
+        # Capital is free-form user input, so plans are rebuilt per request
+        # rather than memoized; the allocator is cheap compared to the pipeline.
+        plan = generate_portfolio_allocation(
+            self.trade_rows,
+            capital,
+            mode=mode,
+            max_funded_trades_override=max_funded_trades,
+        )
+        return encode_payload({"capital": capital, "mode": mode, **plan})
+
+    def warm(self, *, include_tickers: bool = False) -> None:
+        """Encode dataset-level payloads, optionally every ticker payload too."""
+        self.rankings()
+        self.ticker_list()
+        if include_tickers:
+            for ticker in self.tickers:
+                self.ticker_drilldown(ticker)
+                for mode in sorted(VIEW_MODES):
+                    self.ticker_metrics(ticker, mode)
+
+    def _ticker_frame(self, token: str) -> pd.DataFrame:
+        scoped = self._analyst_by_ticker.get(token)
+        if scoped is None:
+            return self.analyst_df.iloc[0:0]
+        return scoped
+
+    def _memoize(self, key: Hashable, build: Callable[[], Any]) -> JsonPayload:
+        payload = self._payloads.get(key)
+        if payload is not None:
+            return payload
+        # Build outside the lock so slow payloads do not block cached reads;
+        # a concurrent duplicate build yields identical bytes.
+        payload = encode_payload(build())
+        with self._lock:
+            return self._payloads.setdefault(key, payload)
+
+
+def load_api_state() -> ApiState:
+    """Run the demo pipeline once and hold its outputs in memory."""
+    canonical_df, meta, issues = ingest_dataset("demo")
+    demo_payload = run_demo(canonical_df=canonical_df, meta=meta, issues=issues)
+    ranked_df = demo_payload.get("ranked", pd.DataFrame())
+    analyst_df = materialize_trade_dates(build_analyst_dataset(canonical_df, ranked_df))
+    return ApiState(
+        canonical_df=canonical_df,
+        meta=meta,
+        ranked_df=ranked_df,
+        analyst_df=analyst_df,
+        issues=issues,
+    )
+
+
+def _canonical_tokens(values: pd.Series) -> pd.Series:
+    raw = values.astype(str).str.strip()
+    unique_tokens = {value: canonicalize_symbol(value) for value in raw.unique()}
+    return raw.map(unique_tokens)
+
+
+def _extract_tickers(df: pd.DataFrame, profile: DatasetProfile | None = None) -> list[str]:
+    if profile is not None:
+        # Ingestion already listed every instrument in the profile.
+        tokens = _canonical_tokens(pd.Series(list(profile.tickers), dtype=object))
+        return sorted(token for token in tokens.unique() if token)
+    for column in ("instrument", "ticker"):
+        if column in df.columns:
+            tokens = _canonical_tokens(df[column].dropna())
+            return sorted(token for token in tokens.unique() if token)
+    return []
+
+
+def _split_by_ticker(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    for column in ("ticker", "instrument"):
+        if column in df.columns and not df.empty:
+            tokens = _canonical_tokens(df[column])
+            return {str(token): group for token, group in df.groupby(tokens, sort=False)}
+    return {}
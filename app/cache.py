@@ -0,0 +1,176 @@
+"""Byte-bounded LRU cache for pipeline and ticker-payload results."""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+MAX_MB_ENV = "JSE_RESULT_CACHE_MAX_MB"
+
+_MISSING = object()
+
+
+def max_bytes_from_env(default: int = DEFAULT_MAX_BYTES) -> int:
+    """Read the cache budget in megabytes from ``JSE_RESULT_CACHE_MAX_MB``."""
+    raw = os.environ.get(MAX_MB_ENV, "").strip()
+    try:
+        megabytes = float(raw)
+    except ValueError:
+        return default
+    return int(megabytes * 1024 * 1024) if megabytes > 0 else default
+
+
+def estimate_nbytes(value: Any) -> int:
+    """Approximate the in-memory size of a cached result in bytes."""
+    return _estimate(value, set())
+
+
+def _estimate(value: Any, seen: set[int]) -> int:
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_estimate(key, seen) + _estimate(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate(item, seen) for item in value)
+    return int(size)
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for a :class:`ResultCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+@dataclass
+class _Entry:
+    value: Any
+    nbytes: int
+    fingerprint: Optional[str]
+
+
+class ResultCache:
+    """Least-recently-used result cache with a total byte budget.
+
+    Entries are keyed by ``(fingerprint, key)`` so results for different
+    datasets never collide, and :meth:`invalidate` drops every entry built
+    from one dataset. Cached values are shared between callers and must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = int(max_bytes)
+        self._entries: OrderedDict[tuple[Optional[str], Hashable], _Entry] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _full_key(key: Hashable, fingerprint: Optional[str]) -> tuple[Optional[str], Hashable]:
+        return (fingerprint, key)
+
+    def get(self, key: Hashable, default: Any = None, *, fingerprint: Optional[str] = None) -> Any:
+        """Return the cached value and mark it most recently used."""
+        full_key = self._full_key(key, fingerprint)
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(full_key)
+            self._hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, *, fingerprint: Optional[str] = None) -> bool:
+        """Store ``value``, evicting least-recently-used entries to fit the budget.
+
+        Returns False when the value alone exceeds the budget and is not kept.
+        """
+        nbytes = estimate_nbytes(value)
+        full_key = self._full_key(key, fingerprint)
+        with self._lock:
+            previous = self._entries.pop(full_key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            if nbytes > self.max_bytes:
+                return False
+            while self._entries and self._bytes + nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._evictions += 1
+            self._entries[full_key] = _Entry(value=value, nbytes=nbytes, fingerprint=fingerprint)
+            self._bytes += nbytes
+            return True
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        *,
+        fingerprint: Optional[str] = None,
+    ) -> Any:
+        """Return the cached value for ``key`` or compute, store, and return it."""
+        value = self.get(key, _MISSING, fingerprint=fingerprint)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value, fingerprint=fingerprint)
+        return value
+
+    def invalidate(self, fingerprint: str) -> int:
+        """Drop every entry built from the dataset with ``fingerprint``."""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.fingerprint == fingerprint]
+            for key in stale:
+                self._bytes -= self._entries.pop(key).nbytes
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                current_bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
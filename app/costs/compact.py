@@ -0,0 +1,113 @@
+"""Compact in-memory layout for trade tables."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+CALENDAR_ATTR = "trading_calendar"
+COST_DRAG_ATTR = "cost_drag_pct"
+
+_CATEGORICAL_COLUMNS = ("instrument", "exit_reason", "exit_policy", "quality_tier")
+_FLOAT_COLUMNS = ("entry_price", "exit_price", "gross_return_pct", "net_return_pct", "mae_pct", "mfe_pct")
+_SMALL_INT_COLUMNS = ("holding_window", "bars_to_peak")
+_DATE_POSITION_COLUMNS = {"entry_date": "entry_pos", "exit_date": "exit_pos"}
+
+
+def compact_trade_table(trades: pd.DataFrame, calendar: Optional[pd.DatetimeIndex] = None) -> pd.DataFrame:
+    """Return ``trades`` with narrow dtypes and dates stored as calendar positions.
+
+    Text columns become categoricals, ``holding_window`` and ``bars_to_peak``
+    int8 and prices, returns and excursions float32. ``entry_date`` and
+    ``exit_date`` are replaced by int32 positions into a shared trading
+    calendar kept in ``attrs``, and a constant ``cost_drag_pct`` column moves
+    to ``attrs`` as a scalar. Columns that are absent are left alone, so
+    partial tables pass through.
+    """
+    compact = trades.copy(deep=False)
+    attrs = dict(trades.attrs)
+
+    for column in _CATEGORICAL_COLUMNS:
+        if column in compact.columns and not isinstance(compact[column].dtype, pd.CategoricalDtype):
+            compact[column] = compact[column].astype("category")
+    for column in _SMALL_INT_COLUMNS:
+        if column in compact.columns and compact[column].notna().all():
+            values = compact[column].astype(np.int64)
+            if values.empty or values.abs().max() <= np.iinfo(np.int8).max:
+                compact[column] = values.astype(np.int8)
+    for column in _FLOAT_COLUMNS:
+        if column in compact.columns:
+            compact[column] = pd.to_numeric(compact[column], errors="coerce").astype(np.float32)
+
+    date_columns = [column for column in _DATE_POSITION_COLUMNS if column in compact.columns]
+    if date_columns:
+        parsed = {column: pd.to_datetime(compact[column], errors="coerce") for column in date_columns}
+        if calendar is None:
+            stacked = pd.concat(parsed.values(), ignore_index=True).dropna()
+            calendar = pd.DatetimeIndex(stacked.unique()).sort_values()
+        calendar = pd.DatetimeIndex(calendar)
+        for column, values in parsed.items():
+            positions = calendar.get_indexer(values)
+            compact[_DATE_POSITION_COLUMNS[column]] = positions.astype(np.int32)
+        compact = compact.drop(columns=date_columns)
+        attrs[CALENDAR_ATTR] = calendar
+
+    if COST_DRAG_ATTR in compact.columns:
+        drag = compact[COST_DRAG_ATTR].dropna().unique()
+        if drag.size <= 1:
+            if drag.size == 1:
+                attrs[COST_DRAG_ATTR] = float(drag[0])
+            compact = compact.drop(columns=[COST_DRAG_ATTR])
+
+    compact.attrs = attrs
+    return compact
+
+
+def _widen(values: pd.Series) -> np.ndarray:
+    # Parse each float32's shortest decimal form, so 1.23 reads back as 1.23
+    # rather than 1.2300000190734863.
+    return values.to_numpy().astype(str).astype(np.float64)
+
+
+def materialize_trade_dates(compact: pd.DataFrame) -> pd.DataFrame:
+    """Restore ``entry_date``/``exit_date`` and ``cost_drag_pct`` columns from a compact table.
+
+    This is the read boundary for consumers: float32 prices and returns come
+    back as float64, so computed and serialized values carry no float32
+    noise. Integer and categorical dtypes stay narrow. Tables with nothing
+    to restore are returned unchanged.
+    """
+    calendar = compact.attrs.get(CALENDAR_ATTR)
+    drag = compact.attrs.get(COST_DRAG_ATTR)
+    narrow = [column for column in _FLOAT_COLUMNS if column in compact.columns and compact[column].dtype == np.float32]
+    if calendar is None and drag is None and not narrow:
+        return compact
+
+    restored = compact.copy(deep=False)
+    for column in narrow:
+        restored[column] = _widen(restored[column])
+    if calendar is not None:
+        for column, position_column in _DATE_POSITION_COLUMNS.items():
+            if position_column not in restored.columns:
+                continue
+            positions = restored[position_column].to_numpy()
+            valid = positions >= 0
+            dates = np.full(positions.size, np.datetime64("NaT"), dtype="datetime64[ns]")
+            dates[valid] = pd.DatetimeIndex(calendar).to_numpy(dtype="datetime64[ns]")[positions[valid]]
+            restored[column] = dates
+        restored = restored.drop(columns=[c for c in _DATE_POSITION_COLUMNS.values() if c in restored.columns])
+    if drag is not None and COST_DRAG_ATTR not in restored.columns:
+        restored[COST_DRAG_ATTR] = float(drag)
+    restored.attrs = {}
+    return restored
+
+
+def trade_table_nbytes(trades: pd.DataFrame) -> int:
+    """Deep in-memory size of ``trades``, including the compact calendar."""
+    size = int(trades.memory_usage(index=True, deep=True).sum())
+    calendar = trades.attrs.get(CALENDAR_ATTR)
+    if calendar is not None:
+        size += int(pd.DatetimeIndex(calendar).nbytes)
+    return size
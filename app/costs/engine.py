@@ -2,20 +2,72 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Optional, Tuple
+from typing import Iterable, Optional, Sequence, Tuple, Union
 
 import pandas as pd
 
+from app.data.panel import PricePanel
+from app.metrics.sketch import GroupedSketchSummary, validate_quantile_backend
+
 from .config import resolve_cost_config
+from .exits import ExitPolicy
+from .horizons import DEFAULT_MAX_HORIZON, HorizonSurface, compute_horizon_surface, summarize_horizon_surface
 from .net_returns import compute_trade_results
 
 
-def _summarize_by_instrument_window(trades: pd.DataFrame) -> pd.DataFrame:
+SKETCH_VALUE_COLUMNS = ["net_return_pct", "gross_return_pct", "cost_drag_pct", "excess_over_cost_pct"]
+
+
+def build_summary_sketch(
+    trades: pd.DataFrame,
+    summary: Optional[GroupedSketchSummary] = None,
+    *,
+    group_columns: Sequence[str] = ("instrument", "holding_window"),
+) -> GroupedSketchSummary:
+    """Fold ``trades`` into a grouped sketch summary of net, gross and cost returns.
+
+    Pass the previous ``summary`` to add only newly closed trades; summaries
+    built on separate shards combine with ``GroupedSketchSummary.merge``.
+    """
+    if summary is None:
+        summary = GroupedSketchSummary(group_columns, SKETCH_VALUE_COLUMNS)
+    if trades.empty:
+        return summary
+    gross = pd.to_numeric(trades["gross_return_pct"], errors="coerce")
+    drag = pd.to_numeric(trades["cost_drag_pct"], errors="coerce")
+    frame = trades[[*summary.group_columns, "net_return_pct", "gross_return_pct", "cost_drag_pct"]]
+    # hit_rate_above_cost is the positive rate of gross return minus cost drag.
+    return summary.update(frame.assign(excess_over_cost_pct=gross - drag).dropna(subset=summary.group_columns))
+
+
+def summarize_from_sketch(summary: GroupedSketchSummary) -> pd.DataFrame:
+    """Build a ``run_cost_engine`` summary table from a sketch summary."""
+    group_columns = summary.group_columns
+    net = summary.frame("net_return_pct")
+    result = net[group_columns].assign(
+        n_trades=net["size"],
+        win_rate_net=net["positive_rate"],
+        median_net_return=net["q50"],
+        median_gross_return=summary.frame("gross_return_pct")["q50"],
+        avg_net_return=net["mean"],
+    )
+    if "instrument" in group_columns:
+        result["cost_drag_median"] = summary.frame("cost_drag_pct")["q50"]
+        result["hit_rate_above_cost"] = summary.frame("excess_over_cost_pct")["positive_rate"]
+    return result
+
+
+def _policy_columns(trades: pd.DataFrame) -> list[str]:
+    # Trades simulated under several exit policies are summarized per policy.
+    return ["exit_policy"] if "exit_policy" in trades.columns else []
+
+
+def _summarize_by_instrument_window(trades: pd.DataFrame, quantile_backend: str = "exact") -> pd.DataFrame:
+    group_columns = ["instrument", "holding_window", *_policy_columns(trades)]
     if trades.empty:
         return pd.DataFrame(
             columns=[
-                "instrument",
-                "holding_window",
+                *group_columns,
                 "n_trades",
                 "win_rate_net",
                 "median_net_return",
@@ -26,7 +78,10 @@ def _summarize_by_instrument_window(trades: pd.DataFrame) -> pd.DataFrame:
             ]
         )
 
-    grouped = trades.groupby(["instrument", "holding_window"])
+    if quantile_backend == "sketch":
+        return summarize_from_sketch(build_summary_sketch(trades, group_columns=group_columns))
+
+    grouped = trades.groupby(group_columns)
     summary = grouped.agg(
         n_trades=("net_return_pct", "size"),
         win_rate_net=("net_return_pct", lambda x: (x > 0).mean()),
@@ -42,11 +97,12 @@ def _summarize_by_instrument_window(trades: pd.DataFrame) -> pd.DataFrame:
     return summary.reset_index()
 
 
-def _summarize_overall(trades: pd.DataFrame) -> pd.DataFrame:
+def _summarize_overall(trades: pd.DataFrame, quantile_backend: str = "exact") -> pd.DataFrame:
+    group_columns = ["holding_window", *_policy_columns(trades)]
     if trades.empty:
         return pd.DataFrame(
             columns=[
-                "holding_window",
+                *group_columns,
                 "n_trades",
                 "win_rate_net",
                 "median_net_return",
@@ -55,7 +111,10 @@ def _summarize_overall(trades: pd.DataFrame) -> pd.DataFrame:
             ]
         )
 
-    grouped = trades.groupby("holding_window")
+    if quantile_backend == "sketch":
+        return summarize_from_sketch(build_summary_sketch(trades, group_columns=group_columns))
+
+    grouped = trades.groupby(group_columns)
     summary = grouped.agg(
         n_trades=("net_return_pct", "size"),
         win_rate_net=("net_return_pct", lambda x: (x > 0).mean()),
@@ -67,15 +126,25 @@ def _summarize_overall(trades: pd.DataFrame) -> pd.DataFrame:
 
 
 def run_cost_engine(
-    df_prices: pd.DataFrame,
+    df_prices: Union[pd.DataFrame, PricePanel],
     df_entries: pd.DataFrame,
     holding_windows: Optional[Iterable[int]] = None,
     broker_profile: str = "Default",
     override_enabled: bool = False,
     broker_fee: Optional[float] = None,
     cess: Optional[float] = None,
+    quantile_backend: str = "exact",
+    exit_policies: Optional[Sequence[ExitPolicy]] = None,
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, dict]:
-    """Run the cost engine and return trades, summaries, and config."""
+    """Run the cost engine and return trades, summaries, and config.
+
+    ``quantile_backend="sketch"`` computes summary medians from mergeable
+    KLL sketches (see ``build_summary_sketch``) instead of exact group sorts.
+    ``exit_policies`` adds stop/target/trailing exits next to the time exit;
+    trades and summaries then carry an ``exit_policy`` column. Pass the
+    dataset's :class:`PricePanel` as ``df_prices`` to skip re-sorting prices.
+    """
+    validate_quantile_backend(quantile_backend)
     windows = list(holding_windows or [5, 10, 20, 30])
     config = resolve_cost_config(
         broker_profile=broker_profile,
@@ -88,7 +157,38 @@ def run_cost_engine(
         df_entries=df_entries,
         holding_windows=windows,
         round_trip_cost_rate=config["round_trip_cost_rate"],
+        exit_policies=exit_policies,
     )
-    summary_instrument = _summarize_by_instrument_window(trades)
-    summary_overall = _summarize_overall(trades)
+    summary_instrument = _summarize_by_instrument_window(trades, quantile_backend)
+    summary_overall = _summarize_overall(trades, quantile_backend)
     return trades, summary_instrument, summary_overall, config
+
+
+def run_horizon_surface(
+    df_prices: Union[pd.DataFrame, PricePanel],
+    df_entries: pd.DataFrame,
+    max_horizon: int = DEFAULT_MAX_HORIZON,
+    broker_profile: str = "Default",
+    override_enabled: bool = False,
+    broker_fee: Optional[float] = None,
+    cess: Optional[float] = None,
+) -> Tuple[HorizonSurface, pd.DataFrame, dict]:
+    """Horizon-surface mode: net returns for every horizon from 1 to ``max_horizon``.
+
+    Returns the surface, its per instrument and horizon summary (the
+    ``summary_instrument`` layout, so ``rank_instruments`` searches every
+    horizon for each instrument's best) and the cost config.
+    """
+    config = resolve_cost_config(
+        broker_profile=broker_profile,
+        override_enabled=override_enabled,
+        broker_fee=broker_fee,
+        cess=cess,
+    )
+    surface = compute_horizon_surface(
+        df_prices,
+        df_entries,
+        max_horizon=max_horizon,
+        round_trip_cost_rate=config["round_trip_cost_rate"],
+    )
+    return surface, summarize_horizon_surface(surface), config
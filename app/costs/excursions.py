@@ -0,0 +1,94 @@
+"""Maximum adverse/favorable excursion over each trade's holding path."""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+EXCURSION_COLUMNS = ["mae_pct", "mfe_pct", "bars_to_peak"]
+
+ForwardExtremes = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def forward_extremes(closes: np.ndarray, window: int) -> ForwardExtremes:
+    """Rolling max, argmax and min of ``closes`` over every ``window``-bar span.
+
+    Row ``i`` covers ``closes[i : i + window]``, so a trade entered at
+    position ``p`` reads row ``p + 1``. Missing closes are ignored. Computed
+    once per window size and shared by every entry, one shifted pass per
+    bar so memory stays linear in ``closes`` (argmax over a strided view
+    would materialize every window).
+    """
+    missing = np.isnan(closes)
+    highs_in = np.where(missing, -np.inf, closes)
+    lows_in = np.where(missing, np.inf, closes)
+    rows = max(closes.size - window + 1, 0)
+    highs = highs_in[:rows].copy()
+    lows = lows_in[:rows].copy()
+    peaks = np.zeros(rows, dtype=np.int64)
+    for offset in range(1, window):
+        shifted = highs_in[offset : offset + rows]
+        # Strictly greater keeps the first peak, like argmax.
+        higher = shifted > highs
+        highs[higher] = shifted[higher]
+        peaks[higher] = offset
+        np.minimum(lows, lows_in[offset : offset + rows], out=lows)
+    return highs, peaks, lows
+
+
+class ExcursionKernel:
+    """Per-trade excursions for one contiguous close array.
+
+    Time exits read the shared :func:`forward_extremes` row for their
+    window; trades that exit early take the same statistics over their
+    shorter path, masked out of a sliding-window view.
+    """
+
+    def __init__(self, closes: np.ndarray) -> None:
+        self.closes = closes
+        self._extremes: Dict[int, ForwardExtremes] = {}
+
+    def _for_window(self, window: int) -> ForwardExtremes:
+        if window not in self._extremes:
+            self._extremes[window] = forward_extremes(self.closes, window)
+        return self._extremes[window]
+
+    def compute(
+        self,
+        entry_positions: np.ndarray,
+        exit_offsets: np.ndarray,
+        window: int,
+    ) -> Dict[str, np.ndarray]:
+        """MAE/MFE (percent of entry close) and bars from entry to the peak close.
+
+        MAE is at most zero and MFE at least zero; ``bars_to_peak`` counts
+        from the entry bar (1 is the first bar held).
+        """
+        entry_prices = self.closes[entry_positions]
+        highs = np.empty(entry_positions.size)
+        lows = np.empty(entry_positions.size)
+        peak_offsets = np.empty(entry_positions.size, dtype=np.int64)
+
+        full = exit_offsets == window
+        if full.any():
+            row_max, row_argmax, row_min = self._for_window(window)
+            rows = entry_positions[full] + 1
+            highs[full], peak_offsets[full], lows[full] = row_max[rows], row_argmax[rows] + 1, row_min[rows]
+
+        early = ~full
+        if early.any():
+            paths = sliding_window_view(self.closes, window + 1)[entry_positions[early], 1:]
+            held = np.arange(window) < exit_offsets[early, None]
+            valid = held & ~np.isnan(paths)
+            masked_highs = np.where(valid, paths, -np.inf)
+            highs[early] = masked_highs.max(axis=1)
+            peak_offsets[early] = masked_highs.argmax(axis=1) + 1
+            lows[early] = np.where(valid, paths, np.inf).min(axis=1)
+
+        return {
+            "mae_pct": np.minimum(lows / entry_prices - 1.0, 0.0) * 100,
+            "mfe_pct": np.maximum(highs / entry_prices - 1.0, 0.0) * 100,
+            "bars_to_peak": peak_offsets,
+        }
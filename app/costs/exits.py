@@ -1,14 +1,24 @@
-"""Exit date computation utilities."""
+"""Exit date and exit policy utilities."""
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
+from app.data.panel import PricePanel
 
-def build_trading_calendar(df_prices: pd.DataFrame) -> Dict[str, List[pd.Timestamp]]:
-    """Build per-instrument trading calendars from price data."""
+
+def build_trading_calendar(df_prices: Union[pd.DataFrame, PricePanel]) -> Dict[str, List[pd.Timestamp]]:
+    """Build per-instrument trading calendars from price data or a :class:`PricePanel`."""
+    if isinstance(df_prices, PricePanel):
+        return {
+            instrument: list(pd.DatetimeIndex(df_prices.ticker_dates(instrument)))
+            for instrument in df_prices.tickers
+        }
     calendars: Dict[str, List[pd.Timestamp]] = {}
     grouped = df_prices.dropna(subset=["date"]).groupby("instrument")["date"]
     for instrument, dates in grouped:
@@ -35,3 +45,100 @@ def compute_exit_date(
     if exit_idx >= len(dates):
         return None
     return dates[exit_idx]
+
+
+TIME_EXIT = "Time Exit"
+STOP_LOSS_EXIT = "Stop Loss"
+TRAILING_STOP_EXIT = "Trailing Stop"
+TAKE_PROFIT_EXIT = "Take Profit"
+EXIT_REASONS = (TIME_EXIT, STOP_LOSS_EXIT, TRAILING_STOP_EXIT, TAKE_PROFIT_EXIT)
+
+
+@dataclass(frozen=True)
+class ExitPolicy:
+    """Close-based exit thresholds checked on each bar of the holding window.
+
+    Thresholds are fractions of price (``0.05`` is 5%): ``stop_loss`` below
+    the entry close, ``take_profit`` above it and ``trailing_stop`` below the
+    highest close since entry. A trade with no breach exits on time.
+    """
+
+    name: str = "time"
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    trailing_stop: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        for field_name in ("stop_loss", "take_profit", "trailing_stop"):
+            value = getattr(self, field_name)
+            if value is not None and not value > 0:
+                raise ValueError(f"{field_name} must be positive when set")
+
+    @property
+    def is_time_only(self) -> bool:
+        return self.stop_loss is None and self.take_profit is None and self.trailing_stop is None
+
+
+TIME_EXIT_POLICY = ExitPolicy()
+
+# Simulated next to the time exit when building the analyst dataset.
+DEFAULT_EXIT_POLICIES = (
+    TIME_EXIT_POLICY,
+    ExitPolicy("stop", stop_loss=0.05),
+    ExitPolicy("target", take_profit=0.08),
+    ExitPolicy("trail", trailing_stop=0.06),
+)
+
+
+def select_exit_policy(trades: pd.DataFrame, name: str = TIME_EXIT_POLICY.name) -> pd.DataFrame:
+    """The rows of ``trades`` simulated under the exit policy called ``name``.
+
+    Per-trade views want one row per trade; tables without an
+    ``exit_policy`` column hold time exits only and are returned as is.
+    """
+    if "exit_policy" not in trades.columns:
+        return trades
+    return trades[trades["exit_policy"] == name]
+
+
+def first_passage_exits(
+    closes: np.ndarray,
+    entry_positions: np.ndarray,
+    holding_window: int,
+    policy: ExitPolicy = TIME_EXIT_POLICY,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Find each trade's exit bar under ``policy`` without a per-trade loop.
+
+    ``closes`` is one contiguous close array (instruments back to back) and
+    every entry must have ``holding_window`` bars after it in its own
+    instrument. Paths are rows of a sliding-window view; each threshold
+    becomes a boolean mask whose first ``True`` (``argmax``) is the exit bar.
+    Returns the exit offsets (1..window) and reason codes indexing
+    ``EXIT_REASONS``; when two thresholds trip on the same bar the stop wins.
+    """
+    offsets = np.full(entry_positions.size, holding_window, dtype=np.int64)
+    reasons = np.zeros(entry_positions.size, dtype=np.int8)
+    if policy.is_time_only or entry_positions.size == 0:
+        return offsets, reasons
+
+    paths = sliding_window_view(closes, holding_window + 1)[entry_positions]
+    entry = paths[:, :1]
+    ahead = paths[:, 1:]
+    masks = []
+    if policy.stop_loss is not None:
+        masks.append((1, ahead <= entry * (1.0 - policy.stop_loss)))
+    if policy.trailing_stop is not None:
+        peaks = np.fmax.accumulate(paths, axis=1)[:, 1:]
+        masks.append((2, ahead <= peaks * (1.0 - policy.trailing_stop)))
+    if policy.take_profit is not None:
+        masks.append((3, ahead >= entry * (1.0 + policy.take_profit)))
+
+    hit = np.logical_or.reduce([mask for _, mask in masks])
+    tripped = hit.any(axis=1)
+    first = hit.argmax(axis=1)
+    offsets[tripped] = first[tripped] + 1
+    rows = np.flatnonzero(tripped)
+    # Later masks fill in first, so the earliest-listed reason on a shared bar wins.
+    for code, mask in reversed(masks):
+        reasons[rows[mask[rows, first[rows]]]] = code
+    return offsets, reasons
@@ -0,0 +1,130 @@
+"""Net returns for every holding horizon at once."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.data.panel import PricePanel
+
+from .net_returns import locate_entries, price_layout
+
+DEFAULT_MAX_HORIZON = 60
+
+SURFACE_SUMMARY_COLUMNS = [
+    "instrument",
+    "holding_window",
+    "n_trades",
+    "win_rate_net",
+    "median_net_return",
+    "median_gross_return",
+    "avg_net_return",
+    "cost_drag_median",
+    "hit_rate_above_cost",
+]
+
+
+@dataclass(frozen=True)
+class HorizonSurface:
+    """Net return (percent) of every entry held 1..``max_horizon`` bars.
+
+    ``net_returns[i, h - 1]`` is entry ``i`` exiting at the close ``h``
+    trading days later; horizons past the instrument's last bar (or onto a
+    missing close) are NaN.
+    """
+
+    instruments: np.ndarray
+    entry_dates: np.ndarray
+    net_returns: np.ndarray
+    cost_drag_pct: float
+
+    @property
+    def horizons(self) -> np.ndarray:
+        return np.arange(1, self.net_returns.shape[1] + 1)
+
+    @property
+    def max_horizon(self) -> int:
+        return int(self.net_returns.shape[1])
+
+
+def compute_horizon_surface(
+    df_prices: Union[pd.DataFrame, PricePanel],
+    df_entries: pd.DataFrame,
+    max_horizon: int = DEFAULT_MAX_HORIZON,
+    round_trip_cost_rate: float = 0.0,
+) -> HorizonSurface:
+    """Build the entries x horizons net-return surface as one float32 array.
+
+    Uses the ``compute_trade_results`` price layout: a strided view of the
+    close array gives every entry's next ``max_horizon`` closes as one row,
+    so the whole surface is a single gather and divide.
+    """
+    max_horizon = int(max_horizon)
+    if max_horizon < 1:
+        raise ValueError("max_horizon must be at least 1")
+
+    layout = price_layout(df_prices)
+    order, positions, entry_dates = locate_entries(df_entries, layout)
+    # Pad so the last bar still has a full (NaN) forward row.
+    padded = np.concatenate([layout.closes, np.full(max_horizon, np.nan)])
+    paths = sliding_window_view(padded, max_horizon + 1)[positions]
+    cost_drag_pct = round_trip_cost_rate * 100
+
+    with np.errstate(invalid="ignore"):
+        net = (paths[:, 1:] / paths[:, :1] - 1.0) * 100 - cost_drag_pct
+    beyond = positions[:, None] + np.arange(1, max_horizon + 1) >= layout.block_ends[positions, None]
+    net[beyond] = np.nan
+
+    return HorizonSurface(
+        instruments=layout.prices["instrument"].to_numpy()[positions],
+        entry_dates=entry_dates[order],
+        net_returns=net.astype(np.float32),
+        cost_drag_pct=cost_drag_pct,
+    )
+
+
+def summarize_horizon_surface(surface: HorizonSurface) -> pd.DataFrame:
+    """Per instrument and horizon metrics in the ``run_cost_engine`` summary layout.
+
+    ``holding_window`` carries the horizon, so the table feeds
+    ``rank_instruments`` directly. Horizons without a single complete trade
+    are left out, as they are in the trade-based summary.
+    """
+    codes, instruments = pd.factorize(pd.Series(surface.instruments), sort=True)
+    horizons = surface.horizons
+    rows = []
+    drag = surface.cost_drag_pct
+    for code, instrument in enumerate(instruments):
+        block = surface.net_returns[codes == code].astype(np.float64)
+        valid = ~np.isnan(block)
+        n_trades = valid.sum(axis=0)
+        observed = n_trades > 0
+        if not observed.any():
+            continue
+        block = block[:, observed]
+        n = n_trades[observed]
+        median = np.nanmedian(block, axis=0)
+        win_rate = (block > 0).sum(axis=0) / n
+        rows.append(
+            pd.DataFrame(
+                {
+                    "instrument": instrument,
+                    "holding_window": horizons[observed],
+                    "n_trades": n,
+                    "win_rate_net": win_rate,
+                    "median_net_return": median,
+                    "median_gross_return": median + drag,
+                    "avg_net_return": np.nansum(block, axis=0) / n,
+                    "cost_drag_median": drag,
+                    # Gross return above cost is a positive net return.
+                    "hit_rate_above_cost": win_rate,
+                }
+            )
+        )
+    if not rows:
+        return pd.DataFrame(columns=SURFACE_SUMMARY_COLUMNS)
+    return pd.concat(rows, ignore_index=True)[SURFACE_SUMMARY_COLUMNS]
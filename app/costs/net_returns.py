@@ -2,63 +2,158 @@
 
 from __future__ import annotations
 
-from typing import Iterable, List
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from .exits import build_trading_calendar, compute_exit_date
+from app.data.dates import ensure_dates
+from app.data.panel import PricePanel
+
+from .excursions import EXCURSION_COLUMNS, ExcursionKernel
+from .exits import EXIT_REASONS, TIME_EXIT_POLICY, ExitPolicy, first_passage_exits
+
+TRADE_COLUMNS = [
+    "instrument",
+    "entry_date",
+    "exit_date",
+    "entry_price",
+    "exit_price",
+    "holding_window",
+    "gross_return_pct",
+    "net_return_pct",
+    "cost_drag_pct",
+    "exit_reason",
+    *EXCURSION_COLUMNS,
+]
+
+
+class PriceLayout(NamedTuple):
+    """Closes sorted by instrument and trading date, one contiguous block per instrument."""
+
+    prices: pd.DataFrame
+    closes: np.ndarray
+    dates: np.ndarray
+    # Exclusive end of each row's instrument block.
+    block_ends: np.ndarray
+
+
+def price_layout(df_prices: Union[pd.DataFrame, PricePanel]) -> PriceLayout:
+    """Lay out ``df_prices`` so the bar ``w`` days after position ``p`` is ``p + w``.
+
+    A :class:`PricePanel` is already deduplicated and ordered, so its valid
+    cells are taken column by column without a sort.
+    """
+    if isinstance(df_prices, PricePanel):
+        prices = df_prices.to_frame()[["instrument", "date", "close"]]
+        counts = df_prices.bar_counts()
+        block_ends = np.repeat(np.cumsum(counts), counts)
+        closes = prices["close"].to_numpy(dtype=np.float64)
+        return PriceLayout(prices, closes, prices["date"].to_numpy(), block_ends)
+
+    prices = (
+        ensure_dates(df_prices[["instrument", "date", "close"]])
+        .dropna(subset=["date"])
+        .drop_duplicates(subset=["instrument", "date"], keep="last")
+        .sort_values(["instrument", "date"], kind="stable")
+        .reset_index(drop=True)
+    )
+    closes = pd.to_numeric(prices["close"], errors="coerce").to_numpy(dtype=np.float64)
+    instrument_codes = pd.factorize(prices["instrument"])[0]
+    block_ends = np.searchsorted(instrument_codes, instrument_codes, side="right")
+    return PriceLayout(prices, closes, prices["date"].to_numpy(), block_ends)
+
+
+def locate_entries(df_entries: pd.DataFrame, layout: PriceLayout) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Match entries to layout positions.
+
+    Returns the row numbers of tradable entries (known bar, non-zero close),
+    their positions in ``layout`` and every entry's parsed date.
+    """
+    entries = ensure_dates(df_entries[["instrument", "entry_date"]], ["entry_date"])
+    located = entries.merge(
+        layout.prices[["instrument", "date"]].assign(position=np.arange(len(layout.prices))),
+        left_on=["instrument", "entry_date"],
+        right_on=["instrument", "date"],
+        how="left",
+        sort=False,
+    )
+    positions = located["position"].to_numpy(dtype=np.float64)
+    known = ~np.isnan(positions)
+    order = np.flatnonzero(known)
+    positions = positions[known].astype(np.int64)
+    entry_prices = layout.closes[positions]
+    tradable = ~np.isnan(entry_prices) & (entry_prices != 0.0)
+    return order[tradable], positions[tradable], located["entry_date"].to_numpy()
 
 
 def compute_trade_results(
-    df_prices: pd.DataFrame,
+    df_prices: Union[pd.DataFrame, PricePanel],
     df_entries: pd.DataFrame,
     holding_windows: Iterable[int],
     round_trip_cost_rate: float,
+    exit_policies: Optional[Sequence[ExitPolicy]] = None,
 ) -> pd.DataFrame:
-    """Compute trade-level returns for each entry across holding windows."""
-    prices = df_prices.copy()
-    prices["date"] = pd.to_datetime(prices["date"], errors="coerce")
-    price_index = prices.set_index(["instrument", "date"])["close"]
-
-    entries = df_entries.copy()
-    entries["entry_date"] = pd.to_datetime(entries["entry_date"], errors="coerce")
-
-    calendar = build_trading_calendar(prices)
-    results: List[dict] = []
-
-    for _, entry in entries.iterrows():
-        instrument = entry["instrument"]
-        entry_date = entry["entry_date"]
-        if pd.isna(entry_date):
-            continue
-        entry_price = price_index.get((instrument, entry_date))
-        if entry_price is None or pd.isna(entry_price):
-            continue
-        if float(entry_price) == 0.0:
-            continue
-        for window in holding_windows:
-            exit_date = compute_exit_date(calendar, instrument, entry_date, window)
-            if exit_date is None:
-                continue
-            exit_price = price_index.get((instrument, exit_date))
-            if exit_price is None or pd.isna(exit_price):
-                continue
-            gross_return_pct = (exit_price / entry_price - 1) * 100
-            cost_drag_pct = round_trip_cost_rate * 100
-            net_return_pct = gross_return_pct - cost_drag_pct
-            results.append(
+    """Compute trade-level returns for each entry across holding windows.
+
+    Prices are laid out once as a single close array sorted by instrument
+    and trading date, so the exit for window ``w`` is ``w`` bars ahead of the
+    entry position and every window is one array operation. Without
+    ``exit_policies`` each trade exits on time; with them, every policy adds
+    one row per trade (tagged in ``exit_policy``) exiting at the first bar
+    that breaches its thresholds (see ``first_passage_exits``). Every trade
+    also records its maximum adverse/favorable excursion and bars to the
+    peak close (see ``ExcursionKernel``). ``df_prices`` may be a prebuilt
+    :class:`PricePanel`.
+    """
+    policies = list(exit_policies) if exit_policies else [TIME_EXIT_POLICY]
+    with_policy = exit_policies is not None and len(policies) > 0
+    columns = TRADE_COLUMNS + (["exit_policy"] if with_policy else [])
+
+    layout = price_layout(df_prices)
+    prices, closes, dates, block_ends = layout.prices, layout.closes, layout.dates, layout.block_ends
+    order, positions, entry_dates = locate_entries(df_entries, layout)
+
+    cost_drag_pct = round_trip_cost_rate * 100
+    excursions = ExcursionKernel(closes)
+    pieces: List[pd.DataFrame] = []
+    for window_rank, window in enumerate(holding_windows):
+        window = int(window)
+        in_range = positions + window < block_ends[positions]
+        window_positions = positions[in_range]
+        for policy_rank, policy in enumerate(policies):
+            offsets, reasons = first_passage_exits(closes, window_positions, window, policy)
+            exit_positions = window_positions + offsets
+            exit_prices = closes[exit_positions]
+            valid = ~np.isnan(exit_prices)
+            entry_at = window_positions[valid]
+            entry_order = order[in_range][valid]
+            gross_return_pct = (exit_prices[valid] / closes[entry_at] - 1) * 100
+            excursion = excursions.compute(entry_at, offsets[valid], window)
+            piece = pd.DataFrame(
                 {
-                    "instrument": instrument,
-                    "entry_date": entry_date,
-                    "exit_date": exit_date,
-                    "entry_price": float(entry_price),
-                    "exit_price": float(exit_price),
-                    "holding_window": int(window),
+                    "instrument": prices["instrument"].to_numpy()[entry_at],
+                    "entry_date": entry_dates[entry_order],
+                    "exit_date": dates[exit_positions[valid]],
+                    "entry_price": closes[entry_at],
+                    "exit_price": exit_prices[valid],
+                    "holding_window": window,
                     "gross_return_pct": gross_return_pct,
-                    "net_return_pct": net_return_pct,
+                    "net_return_pct": gross_return_pct - cost_drag_pct,
                     "cost_drag_pct": cost_drag_pct,
-                    "exit_reason": "Time Exit",
+                    "exit_reason": np.asarray(EXIT_REASONS, dtype=object)[reasons[valid]],
+                    **excursion,
+                    "_entry_order": entry_order,
+                    "_rank": window_rank * len(policies) + policy_rank,
                 }
             )
+            if with_policy:
+                piece["exit_policy"] = policy.name
+            pieces.append(piece)
 
-    return pd.DataFrame(results)
+    if not pieces or all(piece.empty for piece in pieces):
+        return pd.DataFrame(columns=columns)
+    # Entry order first, then windows and policies, as a per-entry loop would emit them.
+    trades = pd.concat(pieces, ignore_index=True).sort_values(["_entry_order", "_rank"], kind="stable")
+    trades = trades.astype({"instrument": prices["instrument"].dtype, "exit_reason": "str"})
+    return trades[columns].reset_index(drop=True)
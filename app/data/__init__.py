@@ -0,0 +1,11 @@
+"""Data ingestion layer.
+
+The pipeline relies on pandas Copy-on-Write instead of defensive copies:
+selections and ``assign`` results never write through to their source.
+pandas 3 always behaves this way; importing this package opts pandas 2.x in.
+"""
+
+import pandas as pd
+
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
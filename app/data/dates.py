@@ -0,0 +1,43 @@
+"""Parse-once date handling shared by ingestion and downstream modules.
+
+Canonical frames come out of ingestion with ``datetime64`` date columns;
+everything downstream goes through :func:`parse_dates` / :func:`ensure_dates`,
+which return parsed columns untouched and parse raw ones one distinct value
+at a time. Whether a column is parsed is read from its dtype alone, so a
+column converted back to text is always parsed again.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+
+def parse_dates(values: pd.Series, *, errors: str = "coerce") -> pd.Series:
+    """``pd.to_datetime(values)`` that parses each distinct value only once.
+
+    Already-parsed columns are returned as-is. Otherwise the distinct values
+    are parsed together (so the format is inferred once, as for the full
+    column) and mapped back by code. ``errors`` follows ``pd.to_datetime``.
+    """
+    if is_datetime64_any_dtype(values.dtype):
+        return values
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(pd.Index(uniques, dtype=object), errors=errors)
+    mapped = parsed.take(codes, allow_fill=True, fill_value=pd.NaT)
+    return pd.Series(mapped, index=values.index, name=values.name)
+
+
+def dates_parsed(df: pd.DataFrame, column: str) -> bool:
+    """Whether ``df[column]`` needs no conversion."""
+    return column in df.columns and is_datetime64_any_dtype(df[column].dtype)
+
+
+def ensure_dates(df: pd.DataFrame, columns: Iterable[str] = ("date",), *, errors: str = "coerce") -> pd.DataFrame:
+    """``df`` with ``columns`` parsed; returns ``df`` itself when nothing needs parsing."""
+    pending = [column for column in columns if column in df.columns and not dates_parsed(df, column)]
+    if not pending:
+        return df
+    return df.assign(**{column: parse_dates(df[column], errors=errors) for column in pending})
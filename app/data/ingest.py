@@ -2,25 +2,35 @@
 
 from __future__ import annotations
 
-from typing import IO, Optional, Tuple
+from typing import IO, Iterable, Optional, Tuple
 
 import pandas as pd
 
+from .markets import filter_markets
 from .loaders import load_internal_dataset_with_source, load_upload
 from .metadata import build_metadata, generate_dataset_id
 from .normalize import normalize_data
+from .panel import cached_price_panel
+from .profile import profile_dataset
 from .validate import validate_canonical
 
 
 def ingest_dataset(
-    mode: str, uploaded_file: Optional[IO] = None
+    mode: str,
+    uploaded_file: Optional[IO] = None,
+    markets: Optional[Iterable[str] | str] = None,
 ) -> Tuple[pd.DataFrame, dict, dict]:
-    """Ingest a dataset and return canonical data, metadata, and issues."""
+    """Ingest a dataset and return canonical data, metadata, and issues.
+
+    ``markets`` restricts the dataset to those markets (``"main"``,
+    ``"junior"``, ``"usd"``, ...); the demo dataset then reads only the
+    matching partitions.
+    """
     if mode not in {"demo", "upload"}:
         raise ValueError("mode must be 'demo' or 'upload'.")
 
     if mode == "demo":
-        raw, source_label = load_internal_dataset_with_source()
+        raw, source_label = load_internal_dataset_with_source(markets)
         source = "demo"
     else:
         raw = load_upload(uploaded_file)
@@ -29,7 +39,13 @@ def ingest_dataset(
 
     dataset_id = generate_dataset_id()
     canonical, _ = normalize_data(raw, source=source, dataset_id=dataset_id)
-    issues = validate_canonical(canonical)
-    meta = build_metadata(canonical, source=source, dataset_id=dataset_id)
+    if mode == "upload":
+        canonical = filter_markets(canonical, markets).reset_index(drop=True)
+    # One profiling pass serves validation, metadata and the app shell.
+    profile = profile_dataset(canonical)
+    issues = validate_canonical(canonical, profile)
+    meta = build_metadata(canonical, source=source, dataset_id=dataset_id, profile=profile)
     meta["dataset_source_label"] = source_label
+    # Built once here; downstream stages fetch it by the dataset fingerprint.
+    cached_price_panel(canonical, meta)
     return canonical, meta, issues
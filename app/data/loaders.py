@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
+import logging
+import os
 from pathlib import Path
-from typing import IO, Optional
+from typing import IO, Iterable, Optional
 
 import pandas as pd
 
+from .markets import filter_markets
+from .partitioned_store import PARTITIONED_STORE_DIR_ENV, read_partitioned, store_is_current, write_partitioned
 from .processor import normalize_jse_dataset
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 INTERNAL_DATASET_PATH = REPO_ROOT / "data" / "internal" / "jse_dataset.csv"
 LEGACY_INTERNAL_DATASET_PATH = REPO_ROOT / "data" / "internal" / "jse_sample.csv"
 
+logger = logging.getLogger(__name__)
+
 
 def _build_legacy_fallback_dataset() -> pd.DataFrame:
     """Build a tiny emergency fallback dataset when no file-based fallback exists."""
@@ -26,8 +32,7 @@ def _build_legacy_fallback_dataset() -> pd.DataFrame:
     )
 
 
-def load_internal_dataset_with_source() -> tuple[pd.DataFrame, str]:
-    """Load and normalize the bundled internal JSE dataset from disk with source label."""
+def _load_internal_csv() -> tuple[pd.DataFrame, str]:
     if INTERNAL_DATASET_PATH.exists():
         dataset_path = INTERNAL_DATASET_PATH
         source_label = "internal_jse_dataset"
@@ -48,9 +53,50 @@ def load_internal_dataset_with_source() -> tuple[pd.DataFrame, str]:
     return normalized, source_label
 
 
-def load_internal_dataset() -> pd.DataFrame:
+def _source_stamp(path: Path) -> str:
+    stat = path.stat()
+    return f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _load_partitioned(store_dir: Path, markets: Optional[Iterable[str] | str]) -> Optional[pd.DataFrame]:
+    # The store is built from the bundled CSV on first use and whenever the CSV changes.
+    if not INTERNAL_DATASET_PATH.exists():
+        return None
+    stamp = _source_stamp(INTERNAL_DATASET_PATH)
+    if not store_is_current(store_dir, stamp):
+        try:
+            write_partitioned(_load_internal_csv()[0], store_dir, source=stamp)
+        except ValueError as exc:
+            logger.warning("Partitioned store not used: %s", exc)
+            return None
+    partitions = read_partitioned(store_dir, markets=markets)
+    if partitions.empty:
+        return partitions
+    return partitions.sort_values(["ticker", "date"], kind="stable").reset_index(drop=True)
+
+
+def load_internal_dataset_with_source(
+    markets: Optional[Iterable[str] | str] = None,
+) -> tuple[pd.DataFrame, str]:
+    """Load and normalize the bundled internal JSE dataset from disk with source label.
+
+    ``markets`` (e.g. ``["main"]``) keeps only those markets. With
+    ``JSE_PARTITIONED_STORE_DIR`` set, data is read from the market/year
+    partitioned store there and only matching partitions are opened.
+    """
+    store_dir = os.environ.get(PARTITIONED_STORE_DIR_ENV)
+    if store_dir:
+        partitioned = _load_partitioned(Path(store_dir), markets)
+        if partitioned is not None:
+            return partitioned, "internal_jse_dataset"
+
+    normalized, source_label = _load_internal_csv()
+    return filter_markets(normalized, markets).reset_index(drop=True), source_label
+
+
+def load_internal_dataset(markets: Optional[Iterable[str] | str] = None) -> pd.DataFrame:
     """Load and normalize the bundled internal JSE dataset from disk."""
-    dataset, _source_label = load_internal_dataset_with_source()
+    dataset, _source_label = load_internal_dataset_with_source(markets)
     return dataset
 
 
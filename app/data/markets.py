@@ -0,0 +1,44 @@
+"""Market labels and market filters for canonical data."""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Optional, Set
+
+import pandas as pd
+
+UNKNOWN_MARKET = "unknown"
+
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def market_token(value: object) -> Optional[str]:
+    """Canonical market label: ``"Main Market"`` and ``"main_market"`` become ``"main"``."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    token = _SEPARATORS.sub("_", str(value).strip().lower()).strip("_")
+    if token.endswith("_market"):
+        token = token[: -len("_market")]
+    return token or None
+
+
+def market_set(markets: Optional[Iterable[str] | str]) -> Optional[Set[str]]:
+    """Normalize a market filter; ``None`` (or nothing) means every market."""
+    if markets is None:
+        return None
+    if isinstance(markets, str):
+        markets = [markets]
+    tokens = {token for token in (market_token(market) for market in markets) if token}
+    return tokens or None
+
+
+def filter_markets(df: pd.DataFrame, markets: Optional[Iterable[str] | str]) -> pd.DataFrame:
+    """Rows of ``df`` whose ``market`` is in ``markets``; ``df`` itself without a filter."""
+    wanted = market_set(markets)
+    if wanted is None:
+        return df
+    if "market" not in df.columns:
+        return df.iloc[0:0]
+    codes, labels = pd.factorize(df["market"])
+    keep = [code for code, label in enumerate(labels) if market_token(label) in wanted]
+    return df[pd.Series(codes, index=df.index).isin(keep)]
@@ -2,20 +2,42 @@
 
 from __future__ import annotations
 
+import hashlib
 import uuid
-from typing import Dict
+from typing import Dict, Optional
 
 import pandas as pd
 
+from .profile import PROFILE_META_KEY, DatasetProfile, profile_dataset
+
 
 def generate_dataset_id() -> str:
     """Generate a unique dataset identifier."""
     return uuid.uuid4().hex
 
 
-def build_metadata(df: pd.DataFrame, source: str, dataset_id: str) -> Dict[str, object]:
-    """Build metadata for a canonical dataset."""
-    volume_present = df["volume"].notna().any()
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """Return a content hash of a canonical dataset, ignoring its generated id."""
+    content = df.drop(columns=["dataset_id"], errors="ignore")
+    digest = hashlib.sha1(",".join(map(str, content.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(content, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def build_metadata(
+    df: pd.DataFrame,
+    source: str,
+    dataset_id: str,
+    profile: Optional[DatasetProfile] = None,
+) -> Dict[str, object]:
+    """Build metadata for a canonical dataset.
+
+    The dataset profile (built with ``profile_dataset`` when omitted) is
+    stored as a plain dict under ``PROFILE_META_KEY``.
+    """
+    if profile is None:
+        profile = profile_dataset(df)
+    volume_present = profile.volume_observations > 0
     if volume_present:
         liquidity_ceiling = "A"
         volume_confirmation_enabled = True
@@ -31,4 +53,6 @@ def build_metadata(df: pd.DataFrame, source: str, dataset_id: str) -> Dict[str,
         "liquidity_ceiling": liquidity_ceiling,
         "volume_confirmation_enabled": volume_confirmation_enabled,
         "extended_windows_allowed": extended_windows_allowed,
+        "dataset_fingerprint": dataset_fingerprint(df),
+        PROFILE_META_KEY: profile.to_dict(),
     }
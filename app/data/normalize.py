@@ -7,7 +7,9 @@ from typing import Tuple
 import numpy as np
 import pandas as pd
 
-from .schema import CANONICAL_COLUMNS, FORMAT_LONG, FORMAT_WIDE, LONG_REQUIRED_COLUMNS
+from .dates import parse_dates
+from .markets import market_token
+from .schema import BAR_COLUMNS, CANONICAL_COLUMNS, FORMAT_LONG, FORMAT_WIDE, LONG_REQUIRED_COLUMNS
 from .processor import canonicalize_symbol_parts
 
 
@@ -45,7 +47,7 @@ def _normalize_long(df: pd.DataFrame, source: str, dataset_id: str) -> pd.DataFr
         raise ValueError("Missing close or adj_close column.")
 
     data = pd.DataFrame()
-    data["date"] = pd.to_datetime(df[cols["date"]], errors="coerce")
+    data["date"] = parse_dates(df[cols["date"]])
     instrument_col = "instrument" if "instrument" in cols else "ticker"
     if instrument_col not in cols:
         raise ValueError("Missing instrument or ticker column.")
@@ -79,12 +81,18 @@ def _normalize_long(df: pd.DataFrame, source: str, dataset_id: str) -> pd.DataFr
         data["display_symbol"] = data["raw_symbol"]
     data["close"] = pd.to_numeric(df[price_col], errors="coerce")
 
-    if "volume" in cols:
-        data["volume"] = pd.to_numeric(df[cols["volume"]], errors="coerce")
+    for col_name in ("volume", *BAR_COLUMNS):
+        if col_name in cols:
+            data[col_name] = pd.to_numeric(df[cols[col_name]], errors="coerce")
+        else:
+            data[col_name] = np.nan
+
+    if "market" in cols:
+        data["market"] = df[cols["market"]].map(market_token).astype(object)
     else:
-        data["volume"] = np.nan
+        data["market"] = None
 
-    for col_name in ("market", "currency"):
+    for col_name in ("market_code", "table_title", "currency"):
         if col_name in cols:
             data[col_name] = (
                 df[cols[col_name]].astype(str).str.strip().replace({"nan": None})
@@ -97,35 +105,76 @@ def _normalize_long(df: pd.DataFrame, source: str, dataset_id: str) -> pd.DataFr
     return data[CANONICAL_COLUMNS]
 
 
-def _normalize_wide(df: pd.DataFrame, source: str, dataset_id: str) -> pd.DataFrame:
-    """Normalize wide-format input into canonical schema."""
-    df = df.copy()
-    df.columns = [col.strip() for col in df.columns]
-    date_col = df.columns[0]
-    prices = df.melt(id_vars=[date_col], var_name="instrument", value_name="close")
-    data = pd.DataFrame()
-    data["date"] = pd.to_datetime(prices[date_col], errors="coerce")
-    raw_symbols = prices["instrument"].astype(str).str.strip().str.upper()
-    symbol_parts = raw_symbols.map(canonicalize_symbol_parts)
-    data["ticker"] = symbol_parts.map(lambda parts: parts[0])
-    data["instrument"] = data["ticker"]
-    data["raw_symbol"] = symbol_parts.map(lambda parts: parts[2])
-    data["symbol_marker"] = symbol_parts.map(lambda parts: parts[1])
-    data["display_symbol"] = data["raw_symbol"]
-    data["close"] = pd.to_numeric(prices["close"], errors="coerce")
-    data["volume"] = np.nan
-    data["market"] = None
-    data["currency"] = None
-    data["source"] = source
-    data["dataset_id"] = dataset_id
+def _normalize_wide(
+    df: pd.DataFrame, source: str, dataset_id: str, drop_missing: bool = False
+) -> pd.DataFrame:
+    """Normalize wide-format input into canonical schema.
+
+    Each symbol header is canonicalized once and the date column parsed
+    once; the long frame is built column-major (all dates of the first
+    symbol, then the next) by repeating headers, tiling dates and raveling
+    the price block. ``drop_missing`` skips cells that are empty in the
+    upload; unparseable values stay as missing closes for validation.
+    """
+    n_dates, n_symbols = len(df), len(df.columns) - 1
+
+    dates = parse_dates(df.iloc[:, 0]).to_numpy()
+    header_parts = [canonicalize_symbol_parts(str(col).strip().upper()) for col in df.columns[1:]]
+    tickers = np.array([parts[0] for parts in header_parts], dtype=object)
+    markers = np.array([parts[1] for parts in header_parts], dtype=object)
+    raw_symbols = np.array([parts[2] for parts in header_parts], dtype=object)
+
+    # One (symbols x dates) block, so ravel() walks each symbol's dates in turn.
+    closes = np.empty((n_symbols, n_dates), dtype=np.float64)
+    present = np.empty((n_symbols, n_dates), dtype=bool) if drop_missing else None
+    for position in range(n_symbols):
+        values = df.iloc[:, position + 1]
+        closes[position] = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        if present is not None:
+            present[position] = values.notna().to_numpy()
+
+    symbol_index = np.repeat(np.arange(n_symbols), n_dates)
+    date_values = np.tile(dates, n_symbols)
+    close_values = closes.ravel()
+    if present is not None:
+        keep = present.ravel()
+        symbol_index, date_values, close_values = symbol_index[keep], date_values[keep], close_values[keep]
+
+    ticker_values = pd.Series(tickers[symbol_index], dtype="str")
+    raw_symbol_values = pd.Series(raw_symbols[symbol_index], dtype="str")
+    data = pd.DataFrame(
+        {
+            "date": date_values,
+            "ticker": ticker_values,
+            "instrument": ticker_values,
+            "raw_symbol": raw_symbol_values,
+            "symbol_marker": pd.Series(markers[symbol_index], dtype="str"),
+            "display_symbol": raw_symbol_values,
+            "close": close_values,
+            "volume": np.nan,
+            **{column: np.nan for column in BAR_COLUMNS},
+            "market": None,
+            "market_code": None,
+            "table_title": None,
+            "currency": None,
+            "source": source,
+            "dataset_id": dataset_id,
+        }
+    )
     return data[CANONICAL_COLUMNS]
 
 
 def normalize_data(
-    df: pd.DataFrame, source: str, dataset_id: str
+    df: pd.DataFrame, source: str, dataset_id: str, *, drop_missing: bool = False
 ) -> Tuple[pd.DataFrame, str]:
-    """Normalize data and return canonical dataframe with detected format."""
+    """Normalize data and return canonical dataframe with detected format.
+
+    ``drop_missing`` skips empty cells of wide uploads instead of keeping
+    them as rows without a close.
+    """
     fmt = detect_format(df)
     if fmt == FORMAT_LONG:
-        return _normalize_long(df, source, dataset_id), fmt
-    return _normalize_wide(df, source, dataset_id), fmt
+        normalized = _normalize_long(df, source, dataset_id)
+    else:
+        normalized = _normalize_wide(df, source, dataset_id, drop_missing=drop_missing)
+    return normalized, fmt
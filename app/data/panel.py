@@ -0,0 +1,227 @@
+"""Dense dates-by-tickers price panel shared by the analytics modules."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Hashable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.cache import ResultCache
+
+from .dates import parse_dates
+from .shared_store import save_array
+
+PRICE_PANEL_DIR_ENV = "JSE_PRICE_PANEL_DIR"
+
+_PANEL_FILES = ("dates", "tickers", "close", "volume", "valid")
+
+_PANEL_CACHE = ResultCache(max_bytes=128 * 1024 * 1024)
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    # Panels are shared through the cache; nobody may write into them.
+    values.flags.writeable = False
+    return values
+
+
+@dataclass(frozen=True)
+class PricePanel:
+    """Closes and volumes as ``(dates, tickers)`` matrices on one trading calendar.
+
+    ``dates`` is the union of every ticker's trading days, sorted; ``valid``
+    marks the cells where the ticker has a bar (its close may still be
+    missing). A ticker's own calendar is its valid rows, so "``w`` bars
+    ahead" means ``w`` valid rows ahead in its column. Tickers are sorted,
+    which makes the column-major walk over valid cells the same
+    instrument-then-date order the long frame is sorted in.
+    """
+
+    dates: np.ndarray
+    tickers: pd.Index
+    close: np.ndarray
+    volume: np.ndarray
+    valid: np.ndarray
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        *,
+        inst_col: str = "instrument",
+        dtype: np.dtype | type = np.float64,
+    ) -> "PricePanel":
+        """Build a panel from a long price frame; the last row wins on duplicate bars.
+
+        ``dtype=np.float32`` halves the matrices, at the cost of closes (and
+        so returns) no longer matching the frame to the last digit.
+        """
+        dates = np.asarray(parse_dates(df["date"]).to_numpy(), dtype="datetime64")
+        instruments = df[inst_col]
+        keep = ~np.isnat(dates) & instruments.notna().to_numpy()
+        date_codes, calendar = pd.factorize(dates[keep], sort=True)
+        ticker_codes, tickers = pd.factorize(instruments.to_numpy()[keep], sort=True)
+        shape = (len(calendar), len(tickers))
+
+        def _matrix(column: str) -> np.ndarray:
+            matrix = np.full(shape, np.nan, dtype=dtype)
+            if column in df.columns:
+                values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)[keep]
+                # Fancy assignment applies in order, so later duplicates overwrite.
+                matrix[date_codes, ticker_codes] = values
+            return _read_only(matrix)
+
+        valid = np.zeros(shape, dtype=bool)
+        valid[date_codes, ticker_codes] = True
+        return cls(
+            dates=np.asarray(calendar),
+            tickers=pd.Index(tickers, name="instrument"),
+            close=_matrix("close"),
+            volume=_matrix("volume"),
+            valid=_read_only(valid),
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.valid.shape
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.dates.nbytes + self.close.nbytes + self.volume.nbytes + self.valid.nbytes)
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + self.nbytes
+
+    def __contains__(self, ticker: Hashable) -> bool:
+        return ticker in self.tickers
+
+    def bar_counts(self) -> np.ndarray:
+        """Number of bars per ticker, in ``tickers`` order."""
+        return self.valid.sum(axis=0)
+
+    def column(self, ticker: Hashable) -> int:
+        try:
+            return int(self.tickers.get_loc(ticker))
+        except KeyError:
+            raise KeyError(f"No ticker {ticker!r} in the price panel.") from None
+
+    def ticker_dates(self, ticker: Hashable) -> np.ndarray:
+        """The ticker's own trading calendar, sorted."""
+        return self.dates[self.valid[:, self.column(ticker)]]
+
+    def ticker_frame(self, ticker: Hashable) -> pd.DataFrame:
+        """``date``/``close``/``volume`` rows for the ticker's bars, oldest first."""
+        column = self.column(ticker)
+        rows = self.valid[:, column]
+        return pd.DataFrame(
+            {
+                "date": self.dates[rows],
+                "close": self.close[rows, column],
+                "volume": self.volume[rows, column],
+            }
+        )
+
+    def stacked(self, values: np.ndarray) -> np.ndarray:
+        """Valid cells of a ``shape`` matrix, ticker by ticker and oldest first."""
+        return values.T[self.valid.T]
+
+    def unstacked(self, values: np.ndarray, fill_value: float = np.nan) -> np.ndarray:
+        """Inverse of :meth:`stacked`: scatter per-bar values back onto the panel."""
+        matrix = np.full(self.shape, fill_value, dtype=np.result_type(values.dtype, np.float32))
+        matrix.T[self.valid.T] = values
+        return matrix
+
+    def shift(self, periods: int = 1, field: str = "close") -> np.ndarray:
+        """``field`` shifted along each ticker's own bars, as ``groupby.shift``.
+
+        ``shift(1)`` holds the previous bar's value and ``shift(-w)`` the value
+        ``w`` bars ahead; cells without a bar, or without one ``periods`` bars
+        away, are NaN.
+        """
+        values = self.stacked(getattr(self, field))
+        codes = np.repeat(np.arange(len(self.tickers)), self.bar_counts())
+        source = np.arange(values.size) - periods
+        inside = (source >= 0) & (source < values.size)
+        inside[inside] = codes[source[inside]] == codes[inside]
+        shifted = np.full(values.size, np.nan, dtype=values.dtype)
+        shifted[inside] = values[source[inside]]
+        return self.unstacked(shifted)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long ``instrument``/``date``/``close``/``volume`` frame sorted by instrument and date."""
+        codes = np.repeat(np.arange(len(self.tickers)), self.bar_counts())
+        return pd.DataFrame(
+            {
+                "instrument": self.tickers.take(codes),
+                "date": self.stacked(np.broadcast_to(self.dates[:, None], self.shape)),
+                "close": self.stacked(self.close),
+                "volume": self.stacked(self.volume),
+            }
+        )
+
+    def save(self, directory: str | Path) -> Path:
+        """Write the panel as ``.npy`` files under ``directory``.
+
+        Each file is moved into place once complete, so a process loading
+        the same directory never maps a half-written matrix.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "dates": self.dates,
+            "tickers": np.asarray(self.tickers.astype(str), dtype=str),
+            "close": self.close,
+            "volume": self.volume,
+            "valid": self.valid,
+        }
+        for name in _PANEL_FILES:
+            save_array(directory / f"{name}.npy", arrays[name])
+        return directory
+
+    @classmethod
+    def load(cls, directory: str | Path, *, mmap: bool = True) -> "PricePanel":
+        """Read a saved panel; with ``mmap`` the matrices stay memory-mapped and read-only."""
+        directory = Path(directory)
+        mode = "r" if mmap else None
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in _PANEL_FILES}
+        return cls(
+            dates=np.asarray(arrays["dates"]),
+            tickers=pd.Index(np.asarray(arrays["tickers"]).tolist(), name="instrument"),
+            close=arrays["close"],
+            volume=arrays["volume"],
+            valid=arrays["valid"],
+        )
+
+    @staticmethod
+    def saved(directory: str | Path) -> bool:
+        return all((Path(directory) / f"{name}.npy").exists() for name in _PANEL_FILES)
+
+
+def _build_panel(df: pd.DataFrame, fingerprint: Optional[str]) -> PricePanel:
+    store_dir = os.environ.get(PRICE_PANEL_DIR_ENV)
+    if not store_dir or not fingerprint:
+        return PricePanel.from_frame(df)
+    directory = Path(store_dir) / fingerprint
+    if not PricePanel.saved(directory):
+        PricePanel.from_frame(df).save(directory)
+    return PricePanel.load(directory, mmap=True)
+
+
+def cached_price_panel(df: pd.DataFrame, meta: Optional[Mapping[str, object]] = None) -> PricePanel:
+    """The panel for ``df``, built once per dataset fingerprint.
+
+    With ``JSE_PRICE_PANEL_DIR`` set, panels are saved under
+    ``<dir>/<fingerprint>/`` and memory-mapped from there, so processes
+    sharing the directory share the pages.
+    """
+    fingerprint = (meta or {}).get("dataset_fingerprint")
+    if not fingerprint:
+        return PricePanel.from_frame(df)
+    return _PANEL_CACHE.get_or_compute(
+        ("price_panel",),
+        lambda: _build_panel(df, str(fingerprint)),
+        fingerprint=str(fingerprint),
+    )
@@ -0,0 +1,162 @@
+"""On-disk store of the internal dataset partitioned by market and year."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .dates import parse_dates
+from .markets import UNKNOWN_MARKET, market_set
+
+PARTITIONED_STORE_DIR_ENV = "JSE_PARTITIONED_STORE_DIR"
+
+PARTITION_FILE = "part.csv"
+
+# Marks a directory as a store this module built, and records its source.
+MANIFEST_FILE = "_manifest.json"
+
+# Text columns read back as text, whatever their values look like.
+_TEXT_COLUMNS = ("raw_symbol", "ticker", "instrument", "symbol_marker", "display_symbol", "market_code", "table_title")
+
+
+def _partition_path(root: Path, market: str, year: int) -> Path:
+    return root / f"market={market}" / f"year={year}" / PARTITION_FILE
+
+
+def read_manifest(root: str | Path) -> Optional[Dict[str, object]]:
+    """The store's manifest, or ``None`` when ``root`` holds no store."""
+    try:
+        return json.loads((Path(root) / MANIFEST_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def store_is_current(root: str | Path, source: Optional[str]) -> bool:
+    """Whether ``root`` holds a store built from ``source``."""
+    manifest = read_manifest(root)
+    return manifest is not None and manifest.get("source") == source
+
+
+def write_partitioned(df: pd.DataFrame, root: str | Path, source: Optional[str] = None) -> List[Path]:
+    """Write ``df`` under ``root`` as ``market=<m>/year=<y>/part.csv``, replacing the store.
+
+    Rows without a market go to ``market=unknown``; rows without a date are
+    dropped. Each partition keeps the input's row order. ``source`` (for
+    example the source file's size and mtime) is kept in the manifest so
+    callers can tell when the store is stale.
+
+    The store is built in a sibling directory and swapped in, so readers
+    never see a half-written store. Only an empty ``root`` or a previous
+    store is replaced; any other existing directory raises ``ValueError``.
+    """
+    root = Path(root)
+    if root.exists() and read_manifest(root) is None and any(root.iterdir()):
+        raise ValueError(f"{root} is not empty and holds no partitioned store; refusing to replace it.")
+    root.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(dir=root.parent, prefix=f".{root.name}-build-"))
+    try:
+        relative = _write_partitions(df, staging)
+        manifest = {
+            "source": source,
+            "columns": [str(column) for column in df.columns],
+            "partitions": [path.as_posix() for path in relative],
+        }
+        (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+        _swap_in(staging, root)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return [root / path for path in relative]
+
+
+def _write_partitions(df: pd.DataFrame, root: Path) -> List[Path]:
+    dates = parse_dates(df["date"])
+    dated = df.assign(date=dates)[dates.notna()]
+    markets = dated["market"].fillna(UNKNOWN_MARKET) if "market" in dated.columns else UNKNOWN_MARKET
+    keys = pd.DataFrame({"market": markets, "year": dated["date"].dt.year}, index=dated.index)
+
+    written: List[Path] = []
+    for (market, year), rows in dated.groupby([keys["market"], keys["year"]], sort=True):
+        path = _partition_path(root, str(market), int(year))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rows.to_csv(path, index=False)
+        written.append(path.relative_to(root))
+    return written
+
+
+def _swap_in(staging: Path, root: Path) -> None:
+    if not root.exists():
+        os.replace(staging, root)
+        return
+    if read_manifest(root) is None:
+        # Checked empty above; rmdir refuses if anything appeared since.
+        root.rmdir()
+        os.replace(staging, root)
+        return
+    retired = Path(tempfile.mkdtemp(dir=root.parent, prefix=f".{root.name}-old-"))
+    os.replace(root, retired / root.name)
+    os.replace(staging, root)
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+def list_partitions(
+    root: str | Path,
+    markets: Optional[Iterable[str] | str] = None,
+    years: Optional[Iterable[int]] = None,
+) -> List[Path]:
+    """Partition files matching the filters, found from directory names alone."""
+    root = Path(root)
+    wanted_markets = market_set(markets)
+    wanted_years = {int(year) for year in years} if years is not None else None
+    paths: List[Path] = []
+    for market_dir in sorted(root.glob("market=*")):
+        market = market_dir.name.split("=", 1)[1]
+        if wanted_markets is not None and market not in wanted_markets:
+            continue
+        for year_dir in sorted(market_dir.glob("year=*")):
+            year = int(year_dir.name.split("=", 1)[1])
+            if wanted_years is not None and year not in wanted_years:
+                continue
+            path = year_dir / PARTITION_FILE
+            if path.exists():
+                paths.append(path)
+    return paths
+
+
+def read_partitioned(
+    root: str | Path,
+    markets: Optional[Iterable[str] | str] = None,
+    years: Optional[Iterable[int]] = None,
+) -> pd.DataFrame:
+    """Read only the partitions matching ``markets`` and ``years``.
+
+    When nothing matches the result is empty but keeps the store's columns.
+    """
+    paths = list_partitions(root, markets=markets, years=years)
+    if not paths:
+        return _empty_store_frame(Path(root))
+    combined = pd.concat([_read_partition(path) for path in paths], ignore_index=True)
+    return combined.assign(date=parse_dates(combined["date"]))
+
+
+def _read_partition(path: Path) -> pd.DataFrame:
+    return pd.read_csv(path, dtype={column: "str" for column in _TEXT_COLUMNS})
+
+
+def _empty_store_frame(root: Path) -> pd.DataFrame:
+    # Any partition gives the column layout and dtypes a match would have had.
+    for path in list_partitions(root)[:1]:
+        partition = _read_partition(path)
+        return partition.assign(date=parse_dates(partition["date"])).iloc[0:0]
+    manifest = read_manifest(root) or {}
+    return pd.DataFrame(columns=manifest.get("columns", []))
+
+
+def has_partitions(root: str | Path) -> bool:
+    return read_manifest(root) is not None
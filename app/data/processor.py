@@ -6,6 +6,10 @@ import re
 
 import pandas as pd
 
+from .dates import parse_dates
+from .markets import market_token
+from .schema import BAR_COLUMNS, MARKET_COLUMNS
+
 _TEMPORARY_MARKERS = ("XD",)
 _MARKER_PATTERN = re.compile(
     r"^(?P<ticker>[A-Z0-9]+?)(?:(?:[.\-_ ]?(?P<marker>XD))|(?:\s*\((?P<paren_marker>XD)\)))?$"
@@ -48,15 +52,21 @@ def normalize_jse_dataset(df: pd.DataFrame) -> pd.DataFrame:
         columns={
             "symbol": "raw_symbol",
             "close_price": "close",
+            "market_name": "market",
         }
     )
 
-    normalized = normalized[["date", "raw_symbol", "close", "volume"]].copy()
+    extra_columns = [
+        column for column in (*BAR_COLUMNS, *MARKET_COLUMNS) if column in normalized.columns
+    ]
+    normalized = normalized[["date", "raw_symbol", "close", "volume", *extra_columns]]
     symbol_parts = normalized["raw_symbol"].map(canonicalize_symbol_parts)
     normalized["ticker"] = symbol_parts.map(lambda parts: parts[0])
     normalized["symbol_marker"] = symbol_parts.map(lambda parts: parts[1])
     normalized["display_symbol"] = normalized["raw_symbol"].astype(str).str.strip().str.upper()
     normalized["instrument"] = normalized["ticker"]
-    normalized["date"] = pd.to_datetime(normalized["date"], errors="coerce")
+    normalized["date"] = parse_dates(normalized["date"])
+    if "market" in normalized.columns:
+        normalized["market"] = normalized["market"].map(market_token).astype(object)
     normalized = normalized.sort_values(["ticker", "date"]).reset_index(drop=True)
     return normalized
@@ -0,0 +1,143 @@
+"""Single-pass profile of a canonical dataset."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from .dates import parse_dates
+
+PROFILE_META_KEY = "profile"
+
+PROFILED_COLUMNS = ("date", "instrument", "close", "volume")
+
+
+@dataclass(frozen=True)
+class TickerProfile:
+    """Coverage of one instrument; dates are ISO strings."""
+
+    first_date: Optional[str]
+    last_date: Optional[str]
+    observations: int
+    volume_observations: int
+    duplicate_rows: int
+    market: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DatasetProfile:
+    """What validation, metadata and the app shell need to know about a dataset.
+
+    Plain values only, so the profile round-trips through ``meta`` and JSON.
+    ``tickers`` is keyed by instrument in first-appearance order;
+    ``observations`` counts unique dated bars.
+    """
+
+    rows: int
+    start_date: Optional[str]
+    end_date: Optional[str]
+    trading_days: int
+    duplicate_rows: int
+    null_counts: Dict[str, int] = field(default_factory=dict)
+    tickers: Dict[str, TickerProfile] = field(default_factory=dict)
+
+    @property
+    def volume_observations(self) -> int:
+        return sum(ticker.volume_observations for ticker in self.tickers.values())
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, object]) -> "DatasetProfile":
+        values = dict(payload)
+        values["tickers"] = {
+            str(name): TickerProfile(**ticker) for name, ticker in dict(values.get("tickers") or {}).items()
+        }
+        values["null_counts"] = dict(values.get("null_counts") or {})
+        return cls(**values)
+
+
+def _iso(day: np.datetime64) -> str:
+    return str(day.astype("datetime64[D]"))
+
+
+def profile_dataset(df: pd.DataFrame) -> DatasetProfile:
+    """Profile ``df`` with one factorize and one sort of (instrument, date).
+
+    Missing columns count as entirely null. Rows without an instrument
+    still count toward ``duplicate_rows`` and the global date range.
+    """
+    rows = len(df)
+    null_counts: Dict[str, int] = {}
+    for column in PROFILED_COLUMNS:
+        null_counts[column] = int(df[column].isna().sum()) if column in df.columns else rows
+
+    if "date" in df.columns:
+        dates = parse_dates(df["date"]).to_numpy(dtype="datetime64[ns]")
+    else:
+        dates = np.full(rows, np.datetime64("NaT"), dtype="datetime64[ns]")
+    if "instrument" in df.columns:
+        codes, uniques = pd.factorize(df["instrument"], use_na_sentinel=False)
+    else:
+        codes, uniques = np.zeros(rows, dtype=np.int64), pd.Index([np.nan])
+    # First listed market per instrument; groupby.first skips missing values.
+    markets = df["market"].groupby(codes).first() if "market" in df.columns else pd.Series(dtype=object)
+    has_volume = df["volume"].notna().to_numpy() if "volume" in df.columns else np.zeros(rows, dtype=bool)
+
+    dated = ~np.isnat(dates)
+    date_keys = dates.view(np.int64)
+    order = np.lexsort((date_keys, codes))
+    sorted_codes, sorted_dates = codes[order], date_keys[order]
+    # A row repeating the previous (instrument, date) is a duplicate; NaT repeats too.
+    repeat = np.zeros(rows, dtype=bool)
+    repeat[1:] = (sorted_codes[1:] == sorted_codes[:-1]) & (sorted_dates[1:] == sorted_dates[:-1])
+    sorted_dated = dated[order]
+
+    groups = len(uniques)
+    duplicates = np.bincount(sorted_codes, weights=repeat, minlength=groups).astype(np.int64)
+    observations = np.bincount(sorted_codes, weights=sorted_dated & ~repeat, minlength=groups).astype(np.int64)
+    volume_rows = np.bincount(codes, weights=has_volume, minlength=groups).astype(np.int64)
+    # NaT sorts first, so each instrument's dated rows close its sorted block.
+    dated_codes, dated_keys = sorted_codes[sorted_dated], sorted_dates[sorted_dated]
+    starts = np.searchsorted(dated_codes, np.arange(groups), side="left")
+    ends = np.searchsorted(dated_codes, np.arange(groups), side="right")
+    has_dates = ends > starts
+
+    tickers: Dict[str, TickerProfile] = {}
+    for code, instrument in enumerate(uniques):
+        if pd.isna(instrument):
+            continue
+        dated_span = has_dates[code]
+        tickers[str(instrument)] = TickerProfile(
+            first_date=_iso(dated_keys[starts[code]].view("datetime64[ns]")) if dated_span else None,
+            last_date=_iso(dated_keys[ends[code] - 1].view("datetime64[ns]")) if dated_span else None,
+            observations=int(observations[code]),
+            volume_observations=int(volume_rows[code]),
+            duplicate_rows=int(duplicates[code]),
+            market=str(markets[code]) if code in markets.index and pd.notna(markets[code]) else None,
+        )
+
+    days = np.unique(dates[dated].astype("datetime64[D]"))
+    return DatasetProfile(
+        rows=rows,
+        start_date=_iso(days[0]) if days.size else None,
+        end_date=_iso(days[-1]) if days.size else None,
+        trading_days=int(days.size),
+        duplicate_rows=int(repeat.sum()),
+        null_counts=null_counts,
+        tickers=tickers,
+    )
+
+
+def profile_from_meta(meta: Optional[Mapping[str, object]]) -> Optional[DatasetProfile]:
+    """The profile stored in ``meta`` by ingestion, if any."""
+    payload = (meta or {}).get(PROFILE_META_KEY)
+    if isinstance(payload, DatasetProfile):
+        return payload
+    if isinstance(payload, Mapping):
+        return DatasetProfile.from_dict(payload)
+    return None
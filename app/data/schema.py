@@ -9,7 +9,14 @@ CANONICAL_COLUMNS = [
     "display_symbol",
     "close",
     "volume",
+    "open",
+    "high",
+    "low",
+    "value_traded",
+    "trades_count",
     "market",
+    "market_code",
+    "table_title",
     "currency",
     "source",
     "dataset_id",
@@ -17,7 +24,11 @@ CANONICAL_COLUMNS = [
 
 LONG_REQUIRED_COLUMNS = {"date", "instrument"}
 LONG_PRICE_COLUMNS = {"close", "adj_close"}
-LONG_OPTIONAL_COLUMNS = {"volume", "market", "currency"}
+# Bar fields beyond close/volume; missing from close-only sources.
+BAR_COLUMNS = ["open", "high", "low", "value_traded", "trades_count"]
+# Listing context kept from sources that provide it (``market`` holds a market_token).
+MARKET_COLUMNS = ["market", "market_code", "table_title"]
+LONG_OPTIONAL_COLUMNS = {"volume", *BAR_COLUMNS, "market", "market_code", "table_title", "currency"}
 
 FORMAT_LONG = "long"
 FORMAT_WIDE = "wide"
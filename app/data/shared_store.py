@@ -0,0 +1,144 @@
+"""Process-wide read-only frame store shared across app sessions."""
+
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .metadata import dataset_fingerprint
+
+SHARED_STORE_DIR_ENV = "JSE_SHARED_STORE_DIR"
+
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _is_numpy_backed(series: pd.Series) -> bool:
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufcmM"
+
+
+def save_array(path: Path, values: np.ndarray) -> None:
+    """``np.save`` to ``path`` under a temporary name, then move it into place.
+
+    Readers, including other processes memory-mapping ``path``, see either
+    no file, the previous file or the finished one, never a partial write.
+    """
+    handle, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}-", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as stream:
+            np.save(stream, values)
+        os.replace(temporary, path)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+
+
+def _save_once(path: Path, values: np.ndarray) -> None:
+    # Other processes may have a finished file memory-mapped; it is never rewritten.
+    if not path.exists():
+        save_array(path, values)
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    frozen = np.array(values, copy=True)
+    frozen.flags.writeable = False
+    return frozen
+
+
+class SharedFrameStore:
+    """Hold DataFrames once per process and hand out zero-copy views.
+
+    Numeric and datetime columns are kept as read-only NumPy buffers; string
+    columns keep their immutable Arrow buffers. With ``directory`` set,
+    buffers are written to ``.npy`` files and memory-mapped instead, so
+    several server processes pointed at the same (for example ``/dev/shm``)
+    directory share pages through the OS; text columns are then
+    dictionary-encoded as categoricals. Files live under
+    ``<name>-<fingerprint>/``, keyed by the dataset fingerprint, and files
+    that already exist are mapped as they are, never rewritten.
+
+    ``get`` returns a shallow copy of the stored frame. Under pandas
+    copy-on-write a session that modifies its view copies only the columns
+    it touches, leaving the shared buffers intact.
+    """
+
+    def __init__(self, directory: Optional[str | Path] = None) -> None:
+        self._directory = Path(directory) if directory else None
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        if self._directory is not None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._frames
+
+    def names(self) -> List[str]:
+        return sorted(self._frames)
+
+    def put(self, name: str, df: pd.DataFrame, fingerprint: Optional[str] = None) -> None:
+        """Freeze ``df`` into shared buffers under ``name``, replacing any previous frame.
+
+        ``fingerprint`` (``meta["dataset_fingerprint"]``) saves hashing ``df``
+        again when buffers are memory-mapped.
+        """
+        frozen = self._freeze(name, df, fingerprint)
+        with self._lock:
+            self._frames[name] = frozen
+
+    def get(self, name: str) -> pd.DataFrame:
+        """Return a zero-copy view of the frame stored under ``name``."""
+        try:
+            frame = self._frames[name]
+        except KeyError:
+            raise KeyError(f"No shared frame named {name!r}.") from None
+        return frame.copy(deep=False)
+
+    def get_or_put(self, name: str, build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Return a view of ``name``, building and storing it on first use."""
+        if name not in self._frames:
+            with self._lock:
+                if name not in self._frames:
+                    self._frames[name] = self._freeze(name, build())
+        return self.get(name)
+
+    def nbytes(self) -> int:
+        """Bytes held by stored buffers (memory-mapped pages count at file size)."""
+        return int(sum(frame.memory_usage(index=False, deep=True).sum() for frame in self._frames.values()))
+
+    def _freeze(self, name: str, df: pd.DataFrame, fingerprint: Optional[str] = None) -> pd.DataFrame:
+        columns = {}
+        folder = None
+        if self._directory is not None:
+            folder = self._directory / _UNSAFE_NAME.sub("_", f"{name}-{fingerprint or dataset_fingerprint(df)}")
+            folder.mkdir(parents=True, exist_ok=True)
+        for position, column in enumerate(df.columns):
+            series = df[column]
+            if folder is not None:
+                columns[column] = self._mapped_column(folder / f"{position}.npy", series)
+            elif _is_numpy_backed(series):
+                columns[column] = _read_only(series.to_numpy())
+            else:
+                columns[column] = series.array
+        frozen = pd.DataFrame(columns, index=df.index, copy=False)
+        frozen.attrs = dict(df.attrs)
+        return frozen
+
+    def _mapped_column(self, path: Path, series: pd.Series) -> np.ndarray | pd.Categorical:
+        if _is_numpy_backed(series):
+            _save_once(path, series.to_numpy())
+            return np.load(path, mmap_mode="r")
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, categories = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, categories = pd.factorize(series, use_na_sentinel=True)
+            categories = pd.Index(categories)
+        # Same content gives the same codes, so an existing file matches these categories.
+        _save_once(path, codes.astype(np.int32, copy=False))
+        return pd.Categorical.from_codes(np.load(path, mmap_mode="r"), categories=categories)
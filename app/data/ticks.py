@@ -0,0 +1,213 @@
+"""Stream raw trade prints into daily OHLCV bars."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import IO, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .dates import parse_dates
+from .metadata import build_metadata, generate_dataset_id
+from .normalize import normalize_data
+from .profile import profile_dataset
+from .validate import validate_canonical
+
+DEFAULT_CHUNK_ROWS = 500_000
+
+TIMESTAMP_COLUMNS = ("timestamp", "datetime", "time", "date")
+SYMBOL_COLUMNS = ("symbol", "instrument", "ticker")
+PRICE_COLUMNS = ("price", "trade_price", "close")
+SIZE_COLUMNS = ("size", "quantity", "volume", "shares")
+
+BAR_OUTPUT_COLUMNS = [
+    "date",
+    "instrument",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "value_traded",
+    "trades_count",
+]
+
+# Partial bars also carry the first/last print time so chunks can be combined.
+_PARTIAL_COLUMNS = [*BAR_OUTPUT_COLUMNS, "first_ts", "last_ts"]
+
+TickSource = Union[str, Path, IO]
+
+
+def _resolve(columns: Iterable[str], candidates: Sequence[str], label: str) -> str:
+    lower = {str(column).lower(): column for column in columns}
+    for candidate in candidates:
+        if candidate in lower:
+            return lower[candidate]
+    raise ValueError(f"Trade prints need a {label} column (one of {', '.join(candidates)}).")
+
+
+def _combine(partials: pd.DataFrame) -> pd.DataFrame:
+    """Merge partial bars sharing (instrument, date) into one bar each."""
+    partials = partials.reset_index(drop=True)
+    keys = [partials["instrument"], partials["date"]]
+    grouped = partials.groupby(keys, sort=False)
+    first = grouped["first_ts"].idxmin().to_numpy()
+    last = grouped["last_ts"].idxmax().to_numpy()
+    totals = grouped[["volume", "value_traded", "trades_count"]].sum(min_count=1)
+    return pd.DataFrame(
+        {
+            "date": partials["date"].to_numpy()[first],
+            "instrument": partials["instrument"].to_numpy()[first],
+            "open": partials["open"].to_numpy()[first],
+            "high": grouped["high"].max().to_numpy(),
+            "low": grouped["low"].min().to_numpy(),
+            "close": partials["close"].to_numpy()[last],
+            "volume": totals["volume"].to_numpy(),
+            "value_traded": totals["value_traded"].to_numpy(),
+            "trades_count": totals["trades_count"].to_numpy(),
+            "first_ts": partials["first_ts"].to_numpy()[first],
+            "last_ts": partials["last_ts"].to_numpy()[last],
+        }
+    )
+
+
+class DailyBarAggregator:
+    """Fold chunks of trade prints into per-symbol daily bars.
+
+    Only partial bars are kept between chunks, so memory grows with the
+    number of (symbol, day) bars rather than with the number of prints.
+    Buffered partials are merged whenever they exceed ``compact_rows``.
+    Prints without a timestamp, symbol or positive price are skipped.
+    """
+
+    def __init__(
+        self,
+        *,
+        timestamp_column: Optional[str] = None,
+        symbol_column: Optional[str] = None,
+        price_column: Optional[str] = None,
+        size_column: Optional[str] = None,
+        compact_rows: int = 200_000,
+    ) -> None:
+        self.timestamp_column = timestamp_column
+        self.symbol_column = symbol_column
+        self.price_column = price_column
+        self.size_column = size_column
+        self.prints_seen = 0
+        self._compact_at = compact_rows
+        self._partials: List[pd.DataFrame] = []
+        self._buffered_rows = 0
+
+    def _columns(self, chunk: pd.DataFrame) -> Tuple[str, str, str, Optional[str]]:
+        timestamp = self.timestamp_column or _resolve(chunk.columns, TIMESTAMP_COLUMNS, "timestamp")
+        symbol = self.symbol_column or _resolve(chunk.columns, SYMBOL_COLUMNS, "symbol")
+        price = self.price_column or _resolve(chunk.columns, PRICE_COLUMNS, "price")
+        size = self.size_column
+        if size is None:
+            try:
+                size = _resolve(chunk.columns, SIZE_COLUMNS, "size")
+            except ValueError:
+                size = None
+        return timestamp, symbol, price, size
+
+    def update(self, chunk: pd.DataFrame) -> "DailyBarAggregator":
+        """Aggregate one chunk of prints; returns ``self`` for chaining."""
+        if chunk.empty:
+            return self
+        timestamp_col, symbol_col, price_col, size_col = self._columns(chunk)
+        self.prints_seen += len(chunk)
+
+        timestamps = parse_dates(chunk[timestamp_col])
+        prices = pd.to_numeric(chunk[price_col], errors="coerce")
+        sizes = pd.to_numeric(chunk[size_col], errors="coerce") if size_col else pd.Series(np.nan, index=chunk.index)
+        symbols = chunk[symbol_col]
+        valid = (timestamps.notna() & symbols.notna() & (prices > 0)).to_numpy()
+        if not valid.any():
+            return self
+
+        prints = pd.DataFrame(
+            {
+                "instrument": symbols.to_numpy()[valid],
+                "date": timestamps.dt.normalize().to_numpy()[valid],
+                "ts": timestamps.to_numpy()[valid],
+                "price": prices.to_numpy()[valid],
+                "size": sizes.to_numpy()[valid],
+            }
+        )
+        # Time order inside the chunk makes first/last the open and close.
+        prints = prints.sort_values("ts", kind="stable")
+        prints["value"] = prints["price"] * prints["size"]
+        grouped = prints.groupby(["instrument", "date"], sort=False)
+        partial = grouped.agg(
+            open=("price", "first"),
+            high=("price", "max"),
+            low=("price", "min"),
+            close=("price", "last"),
+            trades_count=("price", "size"),
+            first_ts=("ts", "min"),
+            last_ts=("ts", "max"),
+        )
+        totals = grouped[["size", "value"]].sum(min_count=1)
+        partial = partial.assign(volume=totals["size"], value_traded=totals["value"]).reset_index()
+        self._partials.append(partial[_PARTIAL_COLUMNS])
+        self._buffered_rows += len(partial)
+        if self._buffered_rows > self._compact_at and len(self._partials) > 1:
+            self._compact()
+        return self
+
+    def _compact(self) -> None:
+        merged = _combine(pd.concat(self._partials, ignore_index=True))
+        self._partials = [merged]
+        # Re-arm so a buffer of mostly distinct bars is not re-merged every chunk.
+        self._buffered_rows = len(merged)
+        self._compact_at = max(self._compact_at, 2 * len(merged))
+
+    def bars(self) -> pd.DataFrame:
+        """Daily bars sorted by instrument and date, in ``BAR_OUTPUT_COLUMNS``."""
+        if not self._partials:
+            return pd.DataFrame(columns=BAR_OUTPUT_COLUMNS)
+        self._compact()
+        return (
+            self._partials[0][BAR_OUTPUT_COLUMNS]
+            .sort_values(["instrument", "date"], kind="stable")
+            .reset_index(drop=True)
+        )
+
+
+def aggregate_trade_prints(
+    sources: Iterable[TickSource],
+    *,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    aggregator: Optional[DailyBarAggregator] = None,
+    **read_csv_kwargs,
+) -> pd.DataFrame:
+    """Stream CSV trade-print files ``chunk_rows`` at a time into daily bars."""
+    aggregator = aggregator or DailyBarAggregator()
+    for source in sources:
+        with pd.read_csv(source, chunksize=chunk_rows, **read_csv_kwargs) as reader:
+            for chunk in reader:
+                aggregator.update(chunk)
+    return aggregator.bars()
+
+
+def ingest_trade_prints(
+    sources: Iterable[TickSource],
+    *,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    **read_csv_kwargs,
+) -> Tuple[pd.DataFrame, dict, dict]:
+    """Ingest trade-print archives and return canonical data, metadata, and issues.
+
+    Bars go through the same long-format normalization, profiling and
+    validation as other sources, with open/high/low, value traded and
+    trade counts carried in the canonical columns.
+    """
+    bars = aggregate_trade_prints(sources, chunk_rows=chunk_rows, **read_csv_kwargs)
+    dataset_id = generate_dataset_id()
+    canonical, _ = normalize_data(bars, source="ticks", dataset_id=dataset_id)
+    profile = profile_dataset(canonical)
+    issues = validate_canonical(canonical, profile)
+    meta = build_metadata(canonical, source="ticks", dataset_id=dataset_id, profile=profile)
+    meta["dataset_source_label"] = "trade_prints"
+    return canonical, meta, issues
@@ -2,30 +2,39 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import pandas as pd
 
+from .profile import DatasetProfile, profile_dataset
 
-def validate_canonical(df: pd.DataFrame) -> Dict[str, List[str]]:
-    """Validate canonical dataset and return issues dict."""
+
+def validate_canonical(df: pd.DataFrame, profile: Optional[DatasetProfile] = None) -> Dict[str, List[str]]:
+    """Validate canonical dataset and return issues dict.
+
+    Checks read ``profile`` (built with ``profile_dataset`` when omitted)
+    rather than rescanning the frame.
+    """
+    if profile is None:
+        profile = profile_dataset(df)
     issues: Dict[str, List[str]] = {"errors": [], "warnings": []}
 
-    if df["date"].isna().any():
+    if profile.null_counts.get("date", 0):
         issues["errors"].append("Unparseable dates detected.")
-    if df["close"].isna().any():
+    if profile.null_counts.get("close", 0):
         issues["errors"].append("Non-numeric close values detected.")
 
-    duplicates = df.duplicated(subset=["date", "instrument"]).any()
-    if duplicates:
+    if profile.duplicate_rows:
         issues["errors"].append("Duplicate (date, instrument) rows detected.")
 
-    trading_days = df["date"].dropna().dt.normalize().nunique()
-    if trading_days < 60:
+    if profile.trading_days < 60:
         issues["errors"].append("Fewer than 60 unique trading days.")
 
-    obs_counts = df.dropna(subset=["date"]).groupby("instrument")["date"].nunique()
-    sparse = obs_counts[obs_counts < 40].index.tolist()
+    sparse = [
+        name
+        for name, ticker in profile.tickers.items()
+        if ticker.first_date is not None and ticker.observations < 40
+    ]
     if sparse:
         issues["warnings"].append(
             "Some instruments have fewer than 40 observations: "
@@ -2,23 +2,35 @@
 
 from __future__ import annotations
 
+import argparse
 import json
 import logging
 import errno
 from pathlib import Path
+from typing import Iterable
 
 import pandas as pd
 
-from app.costs.engine import run_cost_engine
 from app.data.ingest import ingest_dataset
+from app.data.markets import filter_markets
+from app.data.panel import PricePanel, cached_price_panel
 from app.demo.language import get_explanatory_copy
-from app.events.earnings import tag_earnings_phase
-from app.events.phase_metrics import compute_phase_metrics
-from app.ranking.engine import rank_instruments
+from app.lazy import LazyCallable
+from app.signals.rules import DEFAULT_ENTRY_RULE, SignalRule, build_entries
+
+# Pipeline stages load on the first run rather than when the demo is imported.
+run_cost_engine = LazyCallable("app.costs.engine", "run_cost_engine")
+run_horizon_surface = LazyCallable("app.costs.engine", "run_horizon_surface")
+cached_event_index = LazyCallable("app.events.earnings", "cached_event_index")
+tag_earnings_phase = LazyCallable("app.events.earnings", "tag_earnings_phase")
+compute_phase_metrics = LazyCallable("app.events.phase_metrics", "compute_phase_metrics")
+rank_instruments = LazyCallable("app.ranking.engine", "rank_instruments")
 
 
 logger = logging.getLogger(__name__)
 
+DEMO_EVENTS_PATH = Path(__file__).resolve().parents[2] / "data" / "demo" / "earnings_events.csv"
+
 
 def _load_demo_events(events_path: Path) -> pd.DataFrame:
     """Load optional legacy demo earnings events, returning an empty-safe frame when absent."""
@@ -27,33 +39,94 @@ def _load_demo_events(events_path: Path) -> pd.DataFrame:
     return pd.DataFrame(columns=["instrument", "earnings_date", "confidence"])
 
 
+def _events_cache_key(events_path: Path) -> tuple[str, int | None]:
+    """Key the cached event index on the events file and its modification time."""
+    try:
+        return str(events_path), events_path.stat().st_mtime_ns
+    except OSError:
+        return str(events_path), None
+
+
+def demo_event_index(meta: dict | None = None):
+    """The demo earnings-event index, cached per events file and dataset."""
+    events_path = DEMO_EVENTS_PATH
+    return cached_event_index(
+        _events_cache_key(events_path),
+        lambda: _load_demo_events(events_path),
+        fingerprint=(meta or {}).get("dataset_fingerprint"),
+    )
+
+
+def build_demo_entries(
+    canonical: pd.DataFrame,
+    entry_rule: SignalRule | None = DEFAULT_ENTRY_RULE,
+    *,
+    meta: dict | None = None,
+    events_index=None,
+    price_panel: PricePanel | None = None,
+) -> pd.DataFrame:
+    """Entries for the demo pipeline: prices tagged with earnings phases, then ``entry_rule``.
+
+    Every trade table built from the demo dataset (rankings, Analyst
+    Insights, the API) goes through this step so they see the same entries.
+    """
+    if events_index is None:
+        events_index = demo_event_index(meta)
+    signal_prices = canonical
+    if entry_rule is not None and len(events_index):
+        # Earnings offsets let post-earnings rules fire on the price bars.
+        signal_prices = tag_earnings_phase(
+            canonical, events_index, date_col="date", inst_col="instrument", price_panel=price_panel
+        )
+    return build_entries(signal_prices, entry_rule)
+
+
 def run_demo(
     language_mode: str = "plain",
     *,
     canonical_df: pd.DataFrame | None = None,
     meta: dict | None = None,
     issues: dict | None = None,
+    entry_rule: SignalRule | None = DEFAULT_ENTRY_RULE,
+    markets: Iterable[str] | str | None = None,
+    max_horizon: int | None = None,
 ) -> dict:
-    """Run ingestion, cost, ranking, and phase metrics for demo data."""
+    """Run ingestion, cost, ranking, and phase metrics for demo data.
+
+    Trades are opened only where ``entry_rule`` fires; pass ``None`` to treat
+    every bar as an entry. ``markets`` restricts the run to those markets.
+    With ``max_horizon``, rankings search every holding horizon from 1 to
+    ``max_horizon`` (see ``run_horizon_surface``) instead of the standard
+    windows; trades and phase metrics keep the standard windows.
+    """
     if canonical_df is None or meta is None or issues is None:
-        canonical, meta, issues = ingest_dataset("demo")
+        canonical, meta, issues = ingest_dataset("demo", markets=markets)
+        price_panel = cached_price_panel(canonical, meta)
     else:
-        canonical = canonical_df
+        canonical = filter_markets(canonical_df, markets)
+        # meta describes the unfiltered frame, so a filtered one gets its own panel.
+        price_panel = cached_price_panel(canonical, meta) if markets is None else PricePanel.from_frame(canonical)
 
-    entries = canonical[["instrument", "date"]].rename(columns={"date": "entry_date"})
+    # One grouped index serves both tagging passes and later runs on the same dataset.
+    events_index = demo_event_index(meta)
+    entries = build_demo_entries(canonical, entry_rule, events_index=events_index, price_panel=price_panel)
 
     trades, summary_instrument, _, _ = run_cost_engine(
-        df_prices=canonical,
+        df_prices=price_panel,
         df_entries=entries,
     )
-    ranked = rank_instruments(summary_instrument, meta, "income_stability")
-
-    events_path = Path(__file__).resolve().parents[2] / "data" / "demo" / "earnings_events.csv"
-    events_df = _load_demo_events(events_path)
+    ranking_summary = summary_instrument
+    if max_horizon is not None:
+        _, ranking_summary, _ = run_horizon_surface(
+            df_prices=price_panel,
+            df_entries=entries,
+            max_horizon=max_horizon,
+        )
+    ranked = rank_instruments(ranking_summary, meta, "income_stability", markets=markets)
 
     tagged_trades = tag_earnings_phase(
         trades,
-        events_df,
+        events_index,
         date_col="entry_date",
         inst_col="instrument",
     )
@@ -81,6 +154,7 @@ def run_demo(
 
     return {
         "ranked": ranked,
+        "trades": trades,
         "phase_metrics": phase_metrics,
         "meta": meta,
         "issues": issues,
@@ -91,7 +165,15 @@ def run_demo(
 
 def main() -> None:
     """CLI entrypoint for the demo pipeline."""
-    run_demo()
+    parser = argparse.ArgumentParser(description="Run the demo pipeline and save its outputs.")
+    parser.add_argument(
+        "--max-horizon",
+        type=int,
+        default=None,
+        help="Rank each instrument's best holding horizon from 1 to this many bars instead of the standard windows",
+    )
+    args = parser.parse_args()
+    run_demo(max_horizon=args.max_horizon)
     print("Demo pipeline complete. Outputs saved to artifacts/demo.")
 
 
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, Tuple
+from typing import Callable, Dict, Hashable, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from app.cache import ResultCache
+from app.data.dates import parse_dates
+from app.data.panel import PricePanel
+
 
 PHASE_PRE = "pre"
 PHASE_EVENT = "reaction"
@@ -17,123 +21,184 @@ PRE_WINDOW = (-30, -1)
 EVENT_WINDOW = (0, 3)
 POST_WINDOW = (4, 30)
 
+# Offset used for a missing neighbour; far outside any phase window.
+_NO_EVENT = 1 << 40
 
-def tag_earnings_phase(
-    df: pd.DataFrame,
-    events_df: pd.DataFrame,
-    date_col: str,
-    inst_col: str,
-) -> pd.DataFrame:
-    """Tag rows with earnings phases using trading-day offsets."""
-    tagged = df.copy()
-    tagged[date_col] = pd.to_datetime(tagged[date_col])
-
-    events = events_df.copy()
-    if "earnings_date" not in events.columns:
-        raise KeyError("events_df must include an earnings_date column")
-    events["earnings_date"] = pd.to_datetime(events["earnings_date"])
-    if "confidence" not in events.columns:
-        events["confidence"] = "estimated"
-
-    phase_values: Dict[Tuple[str, pd.Timestamp], str] = {}
-    offset_values: Dict[Tuple[str, pd.Timestamp], int] = {}
-
-    for instrument, group in tagged.groupby(inst_col, sort=False):
-        dates = pd.Index(group[date_col].sort_values().unique())
-        if dates.empty:
-            continue
+_EVENT_INDEX_CACHE = ResultCache(max_bytes=32 * 1024 * 1024)
 
-        event_rows = events[events[inst_col] == instrument]
-        if event_rows.empty:
-            continue
 
-        event_indices = _event_indices(
-            dates,
-            event_rows["earnings_date"],
-            event_rows["confidence"],
-        )
-        if not event_indices:
-            continue
+class EarningsEventIndex:
+    """Earnings events grouped once per instrument for repeated lookups.
 
-        offsets = _closest_offsets(len(dates), event_indices)
-        phase_map = _phase_from_offsets(offsets)
-        for idx, date in enumerate(dates):
-            offset = offsets[idx]
-            phase = phase_map[idx]
-            if np.isnan(offset):
-                phase_values[(instrument, date)] = PHASE_NON
-                continue
-            phase_values[(instrument, date)] = phase
-            offset_values[(instrument, date)] = int(offset)
-
-    tagged["earnings_phase"] = tagged.apply(
-        lambda row: phase_values.get((row[inst_col], row[date_col])), axis=1
-    ).fillna(PHASE_NON)
-    tagged["earnings_day_offset"] = tagged.apply(
-        lambda row: offset_values.get((row[inst_col], row[date_col])), axis=1
-    )
+    Each instrument maps to its event dates as sorted int64 nanoseconds and
+    matching int8 confidence codes (2 confirmed, 1 estimated, 0 other). Build
+    it once per events table and share it between ``tag_earnings_phase``,
+    ``add_planner_earnings_warnings`` and event studies instead of rescanning
+    the events frame for every instrument.
+    """
 
-    return tagged
+    def __init__(self, events: Dict[Hashable, Tuple[np.ndarray, np.ndarray]]) -> None:
+        self._events = events
 
+    @classmethod
+    def from_events(cls, events_df: pd.DataFrame, inst_col: str = "instrument") -> "EarningsEventIndex":
+        if "earnings_date" not in events_df.columns:
+            raise KeyError("events_df must include an earnings_date column")
+        if inst_col not in events_df.columns:
+            if events_df.empty:
+                return cls({})
+            raise KeyError(f"events_df must include {inst_col}")
 
-def _event_indices(
-    dates: pd.Index,
-    event_dates: Iterable[pd.Timestamp],
-    confidences: Iterable[str],
-) -> list[tuple[int, int]]:
-    indices: list[tuple[int, int]] = []
-    for event_date, confidence in zip(
-        pd.to_datetime(list(event_dates)),
-        list(confidences),
-    ):
-        position = dates.get_indexer([event_date], method="backfill")[0]
-        if position >= 0:
-            indices.append((int(position), _confidence_score(str(confidence))))
-    return indices
-
-
-def _closest_offsets(length: int, event_indices: Iterable[tuple[int, int]]) -> np.ndarray:
-    index_values = np.arange(length)
-    best_offsets = np.full(length, np.nan)
-    best_abs = np.full(length, np.inf)
-    best_confidence = np.full(length, -1)
-
-    for event_index, confidence_score in event_indices:
-        offsets = index_values - event_index
-        within = (offsets >= PRE_WINDOW[0]) & (offsets <= POST_WINDOW[1])
-        abs_offsets = np.abs(offsets)
-        update = within & (
-            (abs_offsets < best_abs)
-            | ((abs_offsets == best_abs) & (confidence_score > best_confidence))
-            | (
-                (abs_offsets == best_abs)
-                & (confidence_score == best_confidence)
-                & (offsets < best_offsets)
-            )
+        dates = pd.to_datetime(events_df["earnings_date"], errors="coerce")
+        if "confidence" in events_df.columns:
+            codes = events_df["confidence"].astype(str).map(_confidence_score).to_numpy()
+        else:
+            codes = np.full(len(events_df), _confidence_score("estimated"))
+        frame = pd.DataFrame(
+            {
+                "instrument": events_df[inst_col].to_numpy(),
+                "date": dates.to_numpy(dtype="datetime64[ns]").view(np.int64),
+                "code": np.asarray(codes, dtype=np.int8),
+            }
         )
-        best_abs[update] = abs_offsets[update]
-        best_confidence[update] = confidence_score
-        best_offsets[update] = offsets[update]
+        frame = frame[dates.notna().to_numpy() & frame["instrument"].notna().to_numpy()]
+        frame = frame.sort_values(["instrument", "date"], kind="stable")
+
+        events: Dict[Hashable, Tuple[np.ndarray, np.ndarray]] = {}
+        for instrument, positions in frame.groupby("instrument", sort=False).indices.items():
+            events[instrument] = (
+                frame["date"].to_numpy()[positions],
+                frame["code"].to_numpy()[positions],
+            )
+        return cls(events)
+
+    def __len__(self) -> int:
+        return sum(dates.size for dates, _ in self._events.values())
+
+    def __contains__(self, instrument: Hashable) -> bool:
+        return instrument in self._events
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sum(dates.nbytes + codes.nbytes for dates, codes in self._events.values())
+
+    def instruments(self) -> list:
+        return list(self._events)
+
+    def events_for(self, instrument: Hashable) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(dates_ns, confidence_codes)`` for ``instrument``, empty when it has none."""
+        return self._events.get(instrument, (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int8)))
+
+    def nearest_offsets(self, instrument: Hashable, trading_dates) -> np.ndarray:
+        """Trading-day offset of each date to its nearest event within the phase window.
+
+        ``trading_dates`` is the instrument's sorted, unique trading calendar.
+        Events are snapped forward to the next trading day; the closest event
+        within [-30, +30] trading days wins, ties go to the higher confidence
+        and then to the upcoming event. Dates without one get NaN.
+        """
+        calendar = _as_int64_dates(trading_dates)
+        offsets = np.full(calendar.size, np.nan)
+        event_dates, event_codes = self.events_for(instrument)
+        if calendar.size == 0 or event_dates.size == 0:
+            return offsets
+
+        event_positions = np.searchsorted(calendar, event_dates, side="left")
+        on_calendar = event_positions < calendar.size
+        event_positions, event_codes = event_positions[on_calendar], event_codes[on_calendar]
+        if event_positions.size == 0:
+            return offsets
+        # Several events can snap to one trading day; keep the most confident.
+        positions, starts = np.unique(event_positions, return_index=True)
+        codes = np.maximum.reduceat(event_codes, starts)
+
+        bars = np.arange(calendar.size)
+        right = np.searchsorted(positions, bars, side="left")
+        left = np.searchsorted(positions, bars, side="right") - 1
+        has_left, has_right = left >= 0, right < positions.size
+        left_offset = np.where(has_left, bars - positions[np.clip(left, 0, None)], _NO_EVENT)
+        right_offset = np.where(has_right, bars - positions[np.clip(right, None, positions.size - 1)], -_NO_EVENT)
+        left_code = np.where(has_left, codes[np.clip(left, 0, None)], -1)
+        right_code = np.where(has_right, codes[np.clip(right, None, positions.size - 1)], -1)
+
+        left_abs, right_abs = np.abs(left_offset), np.abs(right_offset)
+        take_right = (right_abs < left_abs) | ((right_abs == left_abs) & (right_code >= left_code))
+        best = np.where(take_right, right_offset, left_offset)
+        within = (best >= PRE_WINDOW[0]) & (best <= POST_WINDOW[1])
+        offsets[within] = best[within]
+        return offsets
+
+
+def cached_event_index(
+    key: Hashable,
+    load_events: Callable[[], pd.DataFrame],
+    *,
+    fingerprint: Optional[str] = None,
+    inst_col: str = "instrument",
+) -> EarningsEventIndex:
+    """Return the event index for ``key`` and dataset ``fingerprint``, building it on first use."""
+    return _EVENT_INDEX_CACHE.get_or_compute(
+        ("earnings_event_index", key, inst_col),
+        lambda: EarningsEventIndex.from_events(load_events(), inst_col),
+        fingerprint=fingerprint,
+    )
 
-    return best_offsets
 
+def _as_int64_dates(values) -> np.ndarray:
+    return np.asarray(pd.DatetimeIndex(values).as_unit("ns").asi8, dtype=np.int64)
 
-def _phase_from_offsets(offsets: np.ndarray) -> list[str]:
-    phases: list[str] = []
-    for offset in offsets:
-        if np.isnan(offset):
-            phases.append(PHASE_NON)
+
+def tag_earnings_phase(
+    df: pd.DataFrame,
+    events_df: Union[pd.DataFrame, EarningsEventIndex],
+    date_col: str,
+    inst_col: str,
+    *,
+    price_panel: Optional[PricePanel] = None,
+) -> pd.DataFrame:
+    """Tag rows with earnings phases using trading-day offsets.
+
+    ``events_df`` may be an events frame or a prebuilt :class:`EarningsEventIndex`.
+    Offsets count the distinct dates in ``df`` for each instrument; with
+    ``price_panel`` they count the instrument's bars in the panel instead,
+    and rows dated off its calendar are left untagged.
+    """
+    tagged = df.assign(**{date_col: parse_dates(df[date_col], errors="raise")})
+    if isinstance(events_df, EarningsEventIndex):
+        index = events_df
+    else:
+        index = EarningsEventIndex.from_events(events_df, inst_col)
+
+    offsets = np.full(len(tagged), np.nan)
+    row_dates = tagged[date_col].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    valid_dates = tagged[date_col].notna().to_numpy()
+    for instrument, rows in tagged.groupby(inst_col, sort=False).indices.items():
+        if instrument not in index:
             continue
-        offset_int = int(offset)
-        if PRE_WINDOW[0] <= offset_int <= PRE_WINDOW[1]:
-            phases.append(PHASE_PRE)
-        elif EVENT_WINDOW[0] <= offset_int <= EVENT_WINDOW[1]:
-            phases.append(PHASE_EVENT)
-        elif POST_WINDOW[0] <= offset_int <= POST_WINDOW[1]:
-            phases.append(PHASE_POST)
+        rows = rows[valid_dates[rows]]
+        if price_panel is None:
+            calendar = np.unique(row_dates[rows])
+        elif instrument in price_panel:
+            calendar = _as_int64_dates(price_panel.ticker_dates(instrument))
         else:
-            phases.append(PHASE_NON)
-    return phases
+            continue
+        if calendar.size == 0:
+            continue
+        calendar_offsets = index.nearest_offsets(instrument, calendar.view("datetime64[ns]"))
+        positions = np.searchsorted(calendar, row_dates[rows])
+        on_calendar = positions < calendar.size
+        on_calendar[on_calendar] = calendar[positions[on_calendar]] == row_dates[rows][on_calendar]
+        offsets[rows[on_calendar]] = calendar_offsets[positions[on_calendar]]
+
+    tagged["earnings_phase"] = _phase_from_offsets(offsets)
+    tagged["earnings_day_offset"] = offsets
+    return tagged
+
+
+def _phase_from_offsets(offsets: np.ndarray) -> np.ndarray:
+    offsets = np.asarray(offsets, dtype=float)
+    windows = (PRE_WINDOW, EVENT_WINDOW, POST_WINDOW)
+    conditions = [(offsets >= low) & (offsets <= high) for low, high in windows]
+    return np.select(conditions, [PHASE_PRE, PHASE_EVENT, PHASE_POST], default=PHASE_NON).astype(object)
 
 
 def _confidence_score(confidence: str) -> int:
@@ -7,6 +7,7 @@ from typing import Iterable
 import pandas as pd
 
 from app.events.earnings import PHASE_EVENT, PHASE_NON, PHASE_POST, PHASE_PRE
+from app.metrics.sketch import GroupedSketchSummary, validate_quantile_backend
 
 PHASE_LABELS = {PHASE_PRE, PHASE_EVENT, PHASE_POST, PHASE_NON}
 PHASE_ALIASES = {
@@ -32,13 +33,23 @@ def compute_phase_metrics(
     df: pd.DataFrame,
     group_cols: list[str],
     return_col: str,
+    *,
+    quantile_backend: str = "exact",
 ) -> pd.DataFrame:
-    """Compute grouped phase metrics and flag insufficient history."""
-    metrics_df = df.copy()
+    """Compute grouped phase metrics and flag insufficient history.
+
+    ``quantile_backend="sketch"`` estimates median, p25 and p75 from KLL
+    sketches instead of sorting each group.
+    """
+    validate_quantile_backend(quantile_backend)
+    metrics_df = df
     if "earnings_phase" in metrics_df.columns:
-        metrics_df["earnings_phase"] = metrics_df["earnings_phase"].map(
-            normalize_phase_label
-        )
+        metrics_df = df.assign(earnings_phase=df["earnings_phase"].map(normalize_phase_label))
+
+    if quantile_backend == "sketch":
+        summary = GroupedSketchSummary(group_cols, [return_col])
+        summary.update(metrics_df.dropna(subset=group_cols))
+        return phase_metrics_from_sketch(summary)
 
     grouped = metrics_df.groupby(group_cols)[return_col]
     metrics = grouped.agg(
@@ -54,6 +65,25 @@ def compute_phase_metrics(
     return metrics
 
 
+def phase_metrics_from_sketch(summary: GroupedSketchSummary) -> pd.DataFrame:
+    """Build the ``compute_phase_metrics`` table from a streaming sketch summary.
+
+    Keep the summary and ``update`` it with newly tagged trades to refresh
+    metrics without revisiting earlier trades.
+    """
+    frame = summary.frame(summary.value_columns[0], (0.25, 0.5, 0.75))
+    metrics = frame[summary.group_columns].assign(
+        n=frame["size"],
+        win_rate=frame["positive_rate"],
+        median_return=frame["q50"],
+        p25=frame["q25"],
+        p75=frame["q75"],
+        vol=frame["std"],
+    )
+    metrics["insufficient_history"] = metrics["n"] < 12
+    return metrics
+
+
 def lookup_phase_metrics(
     metrics: pd.DataFrame,
     instrument: str,
@@ -1,15 +1,9 @@
 """Analyst insight tooling."""
 
-from .analyst import (
-    build_exit_analysis,
-    build_feature_insights,
-    build_performance_matrix,
-    grouped_trade_metrics,
-    render_analyst_insights,
-    resolve_return_column,
-)
+from app.lazy import lazy_exports
 
 __all__ = [
+    "build_analyst_cube",
     "build_exit_analysis",
     "build_feature_insights",
     "build_performance_matrix",
@@ -17,3 +11,7 @@ __all__ = [
     "render_analyst_insights",
     "resolve_return_column",
 ]
+
+# Re-exports resolve on first use so importing a sibling such as
+# ``app.insights.execution`` does not also load the analyst renderer.
+__getattr__ = lazy_exports(__name__, {name: ".analyst" for name in __all__})
@@ -6,6 +6,9 @@ from typing import Any, Mapping, Sequence
 
 import pandas as pd
 
+from app.costs.excursions import EXCURSION_COLUMNS
+from app.insights.cube import MetricCube, analyst_grouping_sets, build_metric_cube
+from app.metrics.sketch import GroupedSketchSummary, validate_quantile_backend
 from app.ui.display_labels import clean_dataframe_labels, display_label
 
 FEATURE_COLUMNS = [
@@ -33,25 +36,47 @@ def _missing_columns(df: pd.DataFrame, required_columns: Sequence[str]) -> list[
     return [column for column in required_columns if column not in df.columns]
 
 
+def _excursion_columns(df: pd.DataFrame) -> list[str]:
+    return [column for column in EXCURSION_COLUMNS if column in df.columns]
+
+
+def _policy_columns(df: pd.DataFrame) -> list[str]:
+    # Each trade appears once per exit policy, so every slice is kept per policy.
+    return ["exit_policy"] if "exit_policy" in df.columns else []
+
+
 def grouped_trade_metrics(
     df: pd.DataFrame,
     group_columns: Sequence[str],
     *,
     return_column: str,
+    quantile_backend: str = "exact",
+    median_columns: Sequence[str] = (),
 ) -> pd.DataFrame:
-    """Compute grouped analyst metrics for any dimensional slice."""
-    required_columns = [*group_columns, return_column]
+    """Compute grouped analyst metrics for any dimensional slice.
+
+    ``quantile_backend="sketch"`` takes medians from KLL sketches; see
+    ``grouped_metrics_from_sketch`` for incremental refreshes. Each of
+    ``median_columns`` adds a ``median_<column>``, as in the metric cube.
+    """
+    validate_quantile_backend(quantile_backend)
+    required_columns = [*group_columns, return_column, *median_columns]
     missing = _missing_columns(df, required_columns)
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
 
+    if quantile_backend == "sketch":
+        summary = GroupedSketchSummary(group_columns, [return_column, *median_columns])
+        return grouped_metrics_from_sketch(summary.update(df))
+
     grouped = (
-        df.groupby(list(group_columns), dropna=False)
+        df.groupby(list(group_columns), dropna=False, observed=True)
         .agg(
             count=(return_column, "size"),
             win_rate=(return_column, lambda values: (values > 0).mean()),
             avg_return=(return_column, "mean"),
             median_return=(return_column, "median"),
+            **{f"median_{column}": (column, "median") for column in median_columns},
         )
         .reset_index()
         .sort_values("count", ascending=False)
@@ -60,11 +85,68 @@ def grouped_trade_metrics(
     return grouped
 
 
+def grouped_metrics_from_sketch(summary: GroupedSketchSummary) -> pd.DataFrame:
+    """Build the ``grouped_trade_metrics`` table from a streaming sketch summary.
+
+    Value columns after the first (the return) become ``median_<column>``.
+    """
+    return_column, *median_columns = summary.value_columns
+    frame = summary.frame(return_column)
+    grouped = frame[summary.group_columns].assign(
+        count=frame["size"],
+        win_rate=frame["positive_rate"],
+        avg_return=frame["mean"],
+        median_return=frame["q50"],
+        **{f"median_{column}": summary.frame(column)["q50"] for column in median_columns},
+    )
+    return grouped.sort_values("count", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def _slice_metrics(
+    df: pd.DataFrame,
+    group_columns: Sequence[str],
+    *,
+    return_column: str,
+    cube: MetricCube | None,
+) -> pd.DataFrame:
+    """Take a precomputed cube slice when available, else group ``df`` directly."""
+    if cube is not None and tuple(group_columns) in cube:
+        return cube[tuple(group_columns)]
+    return grouped_trade_metrics(
+        df,
+        group_columns,
+        return_column=return_column,
+        median_columns=_excursion_columns(df),
+    )
+
+
+
+def build_analyst_cube(
+    df: pd.DataFrame,
+    *,
+    return_column: str,
+    feature_columns: Sequence[str] | None = None,
+) -> MetricCube:
+    """Precompute every Analyst Insights slice of ``df`` in one pass.
+
+    Trade tables carrying excursion columns also get their per-slice
+    medians (``median_mae_pct`` and so on).
+    """
+    features = feature_columns if feature_columns is not None else FEATURE_COLUMNS
+    return build_metric_cube(
+        df,
+        analyst_grouping_sets(df, list(features)),
+        return_column=return_column,
+        median_columns=_excursion_columns(df),
+    )
+
+
 def build_feature_insights(
     df: pd.DataFrame,
     *,
     return_column: str,
     feature_columns: Sequence[str] | None = None,
+    cube: MetricCube | None = None,
 ) -> dict[str, pd.DataFrame]:
     """Build grouped summaries for each available feature column."""
     insights: dict[str, pd.DataFrame] = {}
@@ -72,11 +154,7 @@ def build_feature_insights(
     for feature in features_to_use:
         if feature not in df.columns:
             continue
-        insights[feature] = grouped_trade_metrics(
-            df,
-            [feature],
-            return_column=return_column,
-        )
+        insights[feature] = _slice_metrics(df, [*_policy_columns(df), feature], return_column=return_column, cube=cube)
     return insights
 
 
@@ -84,6 +162,7 @@ def build_performance_matrix(
     df: pd.DataFrame,
     *,
     return_column: str,
+    cube: MetricCube | None = None,
 ) -> Mapping[str, Any]:
     """Build tier/window summary and matrix pivots."""
     required = ["quality_tier", "holding_window", return_column]
@@ -91,19 +170,21 @@ def build_performance_matrix(
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
 
-    summary = grouped_trade_metrics(
+    rows = [*_policy_columns(df), "quality_tier"]
+    summary = _slice_metrics(
         df,
-        ["quality_tier", "holding_window"],
+        [*rows, "holding_window"],
         return_column=return_column,
+        cube=cube,
     ).rename(columns={"count": "n_trades"})
 
     win_rate_matrix = summary.pivot(
-        index="quality_tier",
+        index=rows,
         columns="holding_window",
         values="win_rate",
     )
     median_return_matrix = summary.pivot(
-        index="quality_tier",
+        index=rows,
         columns="holding_window",
         values="median_return",
     )
@@ -126,17 +207,14 @@ def build_exit_analysis(
     *,
     return_column: str,
     include_holding_window: bool = True,
+    cube: MetricCube | None = None,
 ) -> pd.DataFrame:
-    """Build grouped exit summaries for analyst review."""
-    group_columns = ["quality_tier", "exit_reason"]
+    """Build grouped exit summaries for analyst review, per exit policy when tagged."""
+    group_columns = [*_policy_columns(df), "quality_tier", "exit_reason"]
     if include_holding_window and "holding_window" in df.columns:
         group_columns.append("holding_window")
 
-    return grouped_trade_metrics(
-        df,
-        group_columns,
-        return_column=return_column,
-    )
+    return _slice_metrics(df, group_columns, return_column=return_column, cube=cube)
 
 
 def render_analyst_insights(
@@ -144,8 +222,13 @@ def render_analyst_insights(
     *,
     st_module=None,
     analyst_mode: bool = True,
+    cube: MetricCube | None = None,
 ) -> None:
-    """Render Analyst Insights tab in analyst mode, handling sparse schemas."""
+    """Render Analyst Insights tab in analyst mode, handling sparse schemas.
+
+    Pass a ``cube`` from :func:`build_analyst_cube` to render from cached
+    aggregates; otherwise one is built here before the tables render.
+    """
     if not analyst_mode:
         return
 
@@ -160,6 +243,9 @@ def render_analyst_insights(
         )
         return
 
+    if cube is None:
+        cube = build_analyst_cube(trades_df, return_column=return_column)
+
     insights_tab, matrix_tab, exit_tab = st_module.tabs(
         ["Feature Insights", "Performance Matrix", "Exit Analysis"]
     )
@@ -167,7 +253,7 @@ def render_analyst_insights(
     with insights_tab:
         st_module.subheader("Feature Insights")
         st_module.caption("Purpose: understand which setup tags are historically linked to stronger or weaker outcomes.")
-        insights = build_feature_insights(trades_df, return_column=return_column)
+        insights = build_feature_insights(trades_df, return_column=return_column, cube=cube)
         if not insights:
             st_module.info(
                 "This section becomes available when the dataset includes feature-tag columns."
@@ -184,6 +270,7 @@ def render_analyst_insights(
             matrix_payload = build_performance_matrix(
                 trades_df,
                 return_column=return_column,
+                cube=cube,
             )
         except ValueError as error:
             st_module.info(f"Performance Matrix is ready once required columns are present: {error}")
@@ -207,7 +294,7 @@ def render_analyst_insights(
             st_module.markdown("Interpretation: frequent stop exits can signal risk controls or weak setup quality.")
             st_module.dataframe(
                 clean_dataframe_labels(
-                    build_exit_analysis(trades_df, return_column=return_column),
+                    build_exit_analysis(trades_df, return_column=return_column, cube=cube),
                     value_columns=["exit_reason"],
                 )
             )
@@ -0,0 +1,126 @@
+"""One-pass grouped trade metrics over many grouping sets."""
+
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+METRIC_COLUMNS = ["count", "win_rate", "avg_return", "median_return"]
+
+GroupingSet = tuple[str, ...]
+MetricCube = dict[GroupingSet, pd.DataFrame]
+
+
+def _factorize(column: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    # Missing keys form their own group, like ``groupby(dropna=False)``.
+    try:
+        codes, uniques = pd.factorize(column, sort=True, use_na_sentinel=False)
+    except TypeError:
+        codes, uniques = pd.factorize(column, sort=False, use_na_sentinel=False)
+    return codes.astype(np.int64, copy=False), pd.Index(uniques)
+
+
+def _segment_medians(codes: np.ndarray, values: np.ndarray, total_groups: int) -> np.ndarray:
+    """Median of ``values`` per code, skipping NaN, from one sort of (code, value)."""
+    valid = ~np.isnan(values)
+    count = np.bincount(codes, minlength=total_groups)
+    n_valid = np.bincount(codes, weights=valid, minlength=total_groups).astype(np.int64)
+    if values.size == 0:
+        return np.full(total_groups, np.nan)
+    # NaN sorts last inside each group, so the first n_valid values are the ordered ones.
+    ordered = values[np.lexsort((values, codes))]
+    starts = np.cumsum(count) - count
+    has_values = n_valid > 0
+    low = np.where(has_values, starts + (n_valid - 1) // 2, 0)
+    high = np.where(has_values, starts + n_valid // 2, 0)
+    return np.where(has_values, (ordered[low] + ordered[high]) / 2.0, np.nan)
+
+
+def build_metric_cube(
+    df: pd.DataFrame,
+    grouping_sets: Iterable[Sequence[str]],
+    *,
+    return_column: str,
+    median_columns: Sequence[str] = (),
+) -> MetricCube:
+    """Compute ``grouped_trade_metrics`` tables for every grouping set at once.
+
+    Each key column is factorized once. Every set's rows are mapped to
+    compact group codes, offset into one shared code space and aggregated
+    together: counts, wins and sums with ``np.bincount`` and exact medians
+    from a single sort of (code, return). Slices use the
+    ``grouped_trade_metrics`` layout (group columns, then ``count``,
+    ``win_rate``, ``avg_return``, ``median_return``), sorted by count, plus
+    ``median_<column>`` for each of ``median_columns``.
+    """
+    sets = list(dict.fromkeys(tuple(columns) for columns in grouping_sets))
+    keys = list(dict.fromkeys(column for columns in sets for column in columns))
+    required = [*keys, return_column, *median_columns]
+    missing = [column for column in required if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+    values = pd.to_numeric(df[return_column], errors="coerce").to_numpy(dtype=np.float64)
+    factorized = {column: _factorize(df[column]) for column in keys}
+
+    group_keys: list[list[pd.Index]] = []
+    code_blocks: list[np.ndarray] = []
+    bounds = [0]
+    for columns in sets:
+        shape = tuple(max(len(factorized[column][1]), 1) for column in columns)
+        combined = np.ravel_multi_index([factorized[column][0] for column in columns], shape)
+        observed, codes = np.unique(combined, return_inverse=True)
+        key_positions = np.unravel_index(observed, shape)
+        group_keys.append([factorized[column][1][positions] for column, positions in zip(columns, key_positions)])
+        code_blocks.append(codes.ravel() + bounds[-1])
+        bounds.append(bounds[-1] + observed.size)
+
+    total_groups = bounds[-1]
+    codes = np.concatenate(code_blocks) if code_blocks else np.empty(0, dtype=np.int64)
+    tiled = np.tile(values, len(sets))
+    valid = ~np.isnan(tiled)
+    count = np.bincount(codes, minlength=total_groups)
+    wins = np.bincount(codes, weights=tiled > 0, minlength=total_groups)
+    n_valid = np.bincount(codes, weights=valid, minlength=total_groups).astype(np.int64)
+    sums = np.bincount(codes[valid], weights=tiled[valid], minlength=total_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(n_valid > 0, sums / n_valid, np.nan)
+        win_rate = wins / count
+    median = _segment_medians(codes, tiled, total_groups)
+    extra_medians = {
+        f"median_{column}": _segment_medians(
+            codes,
+            np.tile(pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64), len(sets)),
+            total_groups,
+        )
+        for column in median_columns
+    }
+
+    cube: MetricCube = {}
+    for columns, set_keys, start, stop in zip(sets, group_keys, bounds[:-1], bounds[1:]):
+        frame = pd.DataFrame({column: key for column, key in zip(columns, set_keys)})
+        frame["count"] = count[start:stop]
+        frame["win_rate"] = win_rate[start:stop]
+        frame["avg_return"] = mean[start:stop]
+        frame["median_return"] = median[start:stop]
+        for name, medians in extra_medians.items():
+            frame[name] = medians[start:stop]
+        cube[columns] = frame.sort_values("count", ascending=False, kind="stable").reset_index(drop=True)
+    return cube
+
+
+def analyst_grouping_sets(df: pd.DataFrame, feature_columns: Sequence[str]) -> list[GroupingSet]:
+    """Grouping sets behind the Analyst Insights tables that ``df`` can support.
+
+    Trade tables tagged with ``exit_policy`` get every set split by policy.
+    """
+    policy: GroupingSet = ("exit_policy",) if "exit_policy" in df.columns else ()
+    sets: list[GroupingSet] = [(*policy, feature) for feature in feature_columns if feature in df.columns]
+    if {"quality_tier", "holding_window"} <= set(df.columns):
+        sets.append((*policy, "quality_tier", "holding_window"))
+    if {"quality_tier", "exit_reason"} <= set(df.columns):
+        exit_set: GroupingSet = (*policy, "quality_tier", "exit_reason")
+        sets.append((*exit_set, "holding_window") if "holding_window" in df.columns else exit_set)
+    return sets
@@ -0,0 +1,64 @@
+"""Deferred imports for modules that are only needed once a stage runs."""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+from types import ModuleType
+from typing import Any, Callable, Iterable, Mapping
+
+
+class LazyCallable:
+    """Stand-in for ``module.attr`` that imports ``module`` on first use.
+
+    The proxy is a plain module attribute, so callers (and tests) can still
+    replace it with ``monkeypatch.setattr``. ``inspect.signature`` resolves
+    through to the real callable.
+    """
+
+    def __init__(self, module_name: str, attr: str) -> None:
+        self._module_name = module_name
+        self._attr = attr
+        self._target: Callable[..., Any] | None = None
+        self.__name__ = attr
+        self.__qualname__ = attr
+
+    def resolve(self) -> Callable[..., Any]:
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module_name), self._attr)
+        return self._target
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+
+    @property
+    def __signature__(self) -> inspect.Signature:
+        return inspect.signature(self.resolve())
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "deferred"
+        return f"<LazyCallable {self._module_name}.{self._attr} ({state})>"
+
+
+def lazy_exports(package: str, exports: Mapping[str, str], submodules: Iterable[str] = ()) -> Callable[[str], Any]:
+    """Build a module ``__getattr__`` (PEP 562) for ``package``.
+
+    ``exports`` maps public names to the relative submodule defining them;
+    ``submodules`` are returned as modules on attribute access. Either is
+    imported only when first looked up.
+    """
+    submodule_names = frozenset(submodules)
+
+    def __getattr__(name: str) -> Any:
+        if name in exports:
+            module: ModuleType = importlib.import_module(exports[name], package)
+            return getattr(module, name)
+        if name in submodule_names:
+            return importlib.import_module(f".{name}", package)
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    return __getattr__
@@ -0,0 +1,261 @@
+"""Mergeable quantile sketches and grouped streaming summaries."""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_K = 200
+QUANTILE_BACKENDS = ("exact", "sketch")
+
+_CAPACITY_DECAY = 2.0 / 3.0
+
+
+def validate_quantile_backend(backend: str) -> str:
+    if backend not in QUANTILE_BACKENDS:
+        raise ValueError(f"quantile_backend must be one of {QUANTILE_BACKENDS}, got {backend!r}")
+    return backend
+
+
+class KLLSketch:
+    """KLL quantile sketch over a stream of floats.
+
+    Values are held in compactors whose items weigh ``2**level``. When a
+    level overflows its capacity it is sorted and every other item (random
+    offset) moves up a level, so memory stays ``O(k log(n / k))`` and the
+    normalized rank error is about ``1.7 / k`` with high probability.
+    Sketches built on separate shards or processes (they pickle) can be
+    combined with :meth:`merge`. Until the first compaction the sketch holds
+    every value and quantiles are exact.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, *, seed: Optional[int] = 0) -> None:
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = int(k)
+        self.count = 0
+        self.min = math.nan
+        self.max = math.nan
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def retained(self) -> int:
+        """Number of items currently stored across all levels."""
+        return int(sum(level.size for level in self._levels))
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self._levels) == 1
+
+    @property
+    def rank_error(self) -> float:
+        """Approximate bound on the normalized rank error of :meth:`quantile`."""
+        return 0.0 if self.is_exact else 1.7 / self.k
+
+    def update(self, values: Iterable[float] | float) -> "KLLSketch":
+        """Add values, ignoring NaN, and compact as needed."""
+        array = np.asarray(values, dtype=np.float64).ravel()
+        array = array[~np.isnan(array)]
+        if array.size == 0:
+            return self
+        self.count += int(array.size)
+        self.min = float(np.fmin(self.min, array.min()))
+        self.max = float(np.fmax(self.max, array.max()))
+        self._levels[0] = np.concatenate((self._levels[0], array))
+        self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold ``other`` into this sketch in place and return it."""
+        if other.count == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            if items.size:
+                self._levels[level] = np.concatenate((self._levels[level], items))
+        self.count += other.count
+        self.min = float(np.fmin(self.min, other.min))
+        self.max = float(np.fmax(self.max, other.max))
+        self._compress()
+        return self
+
+    def quantile(self, q: float | Sequence[float]) -> float | np.ndarray:
+        """Return the estimated ``q`` quantile(s); NaN for an empty sketch."""
+        qs = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("quantiles must be between 0 and 1")
+        if self.count == 0:
+            result = np.full(qs.shape, np.nan)
+        elif self.is_exact:
+            # Same linear interpolation as pandas/numpy while nothing is compacted.
+            result = np.quantile(self._levels[0], qs)
+        else:
+            items = np.concatenate(self._levels)
+            weights = np.concatenate(
+                [np.full(level.size, 2.0**height) for height, level in enumerate(self._levels)]
+            )
+            order = np.argsort(items, kind="stable")
+            items, cumulative = items[order], np.cumsum(weights[order])
+            positions = np.searchsorted(cumulative, qs * cumulative[-1], side="left")
+            result = items[np.clip(positions, 0, items.size - 1)]
+            result = np.where(qs == 0, self.min, np.where(qs == 1, self.max, result))
+        return float(result[0]) if np.ndim(q) == 0 else result
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * _CAPACITY_DECAY**depth)))
+
+    def _compress(self) -> None:
+        while True:
+            for level, items in enumerate(self._levels):
+                if items.size > self._capacity(level):
+                    self._compact(level)
+                    break
+            else:
+                return
+
+    def _compact(self, level: int) -> None:
+        items = np.sort(self._levels[level], kind="stable")
+        keep = items[:1] if items.size % 2 else items[:0]
+        pairs = items[keep.size :]
+        promoted = pairs[int(self._rng.integers(2)) :: 2]
+        self._levels[level] = keep
+        if level + 1 == len(self._levels):
+            self._levels.append(np.empty(0))
+        self._levels[level + 1] = np.concatenate((self._levels[level + 1], promoted))
+
+
+class _ColumnStats:
+    __slots__ = ("sketch", "count", "total", "total_sq", "positives")
+
+    def __init__(self, k: int, seed: Optional[int]) -> None:
+        self.sketch = KLLSketch(k, seed=seed)
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.positives = 0
+
+    def update(self, values: np.ndarray) -> None:
+        finite = values[~np.isnan(values)]
+        self.sketch.update(finite)
+        self.count += int(finite.size)
+        self.total += float(finite.sum())
+        self.total_sq += float(np.square(finite).sum())
+        self.positives += int((finite > 0).sum())
+
+    def merge(self, other: "_ColumnStats") -> None:
+        self.sketch.merge(other.sketch)
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.positives += other.positives
+
+
+def _normalize_key(key: Hashable, width: int) -> Tuple:
+    key = key if isinstance(key, tuple) else (key,)
+    # NaN group keys never compare equal; store them as None so updates line up.
+    return tuple(None if pd.isna(part) else part for part in key[:width])
+
+
+class GroupedSketchSummary:
+    """Per-group streaming summary: counts, sums, positive rate and a KLL sketch.
+
+    Feed trades with :meth:`update` as they arrive (work is proportional to
+    the new rows) and combine summaries built elsewhere with :meth:`merge`.
+    :meth:`frame` reports one value column per row group, with quantiles
+    exact until a group outgrows the sketch and bounded-error after that.
+    """
+
+    def __init__(
+        self,
+        group_columns: Sequence[str],
+        value_columns: Sequence[str],
+        *,
+        k: int = DEFAULT_K,
+        seed: Optional[int] = 0,
+    ) -> None:
+        self.group_columns = list(group_columns)
+        self.value_columns = list(value_columns)
+        self.k = k
+        self._seed = seed
+        self._sizes: Dict[Tuple, int] = {}
+        self._stats: Dict[Tuple, Dict[str, _ColumnStats]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def _group(self, key: Tuple) -> Dict[str, _ColumnStats]:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = {column: _ColumnStats(self.k, self._seed) for column in self.value_columns}
+            self._stats[key] = stats
+            self._sizes[key] = 0
+        return stats
+
+    def update(self, df: pd.DataFrame) -> "GroupedSketchSummary":
+        if df.empty:
+            return self
+        values = {
+            column: pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+            for column in self.value_columns
+        }
+        grouped = df.groupby(self.group_columns, sort=False, dropna=False, observed=True)
+        for raw_key, positions in grouped.indices.items():
+            key = _normalize_key(raw_key, len(self.group_columns))
+            stats = self._group(key)
+            self._sizes[key] += int(positions.size)
+            for column, column_values in values.items():
+                stats[column].update(column_values[positions])
+        return self
+
+    def merge(self, other: "GroupedSketchSummary") -> "GroupedSketchSummary":
+        if other.group_columns != self.group_columns or other.value_columns != self.value_columns:
+            raise ValueError("Summaries must share group and value columns to merge")
+        for key, size in other._sizes.items():
+            stats = self._group(key)
+            self._sizes[key] += size
+            for column, column_stats in other._stats[key].items():
+                stats[column].merge(column_stats)
+        return self
+
+    def frame(self, column: str, quantiles: Sequence[float] = (0.5,)) -> pd.DataFrame:
+        """Summary of ``column`` per group, sorted by the group columns.
+
+        Columns: the group columns, ``size`` (rows), ``count`` (non-null
+        values), ``mean``, ``std`` (sample), ``positive_rate`` (share of rows
+        above zero) and ``q<percent>`` for each quantile, e.g. ``q50``.
+        """
+        quantile_names = [f"q{round(q * 100):g}" for q in quantiles]
+        rows = []
+        for key, size in self._sizes.items():
+            stats = self._stats[key][column]
+            mean = stats.total / stats.count if stats.count else np.nan
+            if stats.count > 1:
+                variance = (stats.total_sq - stats.count * mean * mean) / (stats.count - 1)
+                std = math.sqrt(max(variance, 0.0))
+            else:
+                std = np.nan
+            row = dict(zip(self.group_columns, key))
+            row.update(
+                size=size,
+                count=stats.count,
+                mean=mean,
+                std=std,
+                positive_rate=stats.positives / size if size else np.nan,
+            )
+            row.update(zip(quantile_names, np.atleast_1d(stats.sketch.quantile(list(quantiles)))))
+            rows.append(row)
+        columns = [*self.group_columns, "size", "count", "mean", "std", "positive_rate", *quantile_names]
+        frame = pd.DataFrame(rows, columns=columns)
+        return frame.sort_values(self.group_columns, kind="stable").reset_index(drop=True)
@@ -123,7 +123,7 @@ def detect_decision_mistakes(
                 }
             )
 
-    merged_df = trades_df.copy()
+    merged_df = trades_df
     if not allocation_safe.empty and "instrument" in merged_df.columns and "instrument" in allocation_safe.columns:
         if "allocation_pct" not in merged_df.columns and "allocation_pct" in allocation_safe.columns:
             merged_df = merged_df.merge(
@@ -173,9 +173,7 @@ def _normalize_allocation_pct_column(df: pd.DataFrame) -> pd.DataFrame:
     normalized = pd.to_numeric(df[candidates[0]], errors="coerce")
     for col in candidates[1:]:
         normalized = normalized.combine_first(pd.to_numeric(df[col], errors="coerce"))
-    df = df.copy()
-    df["allocation_pct"] = normalized
-    return df
+    return df.assign(allocation_pct=normalized)
 
 
 def build_behavior_summary(trades_df: pd.DataFrame, review_df: pd.DataFrame) -> list[str]:
@@ -239,7 +237,7 @@ def _build_signal_rank_lookup(signals_df: pd.DataFrame) -> dict[str, int]:
     if signals_df is None or signals_df.empty or "instrument" not in signals_df.columns:
         return {}
 
-    working = signals_df.copy()
+    working = signals_df
     if "rank" not in working.columns:
         if "score_total" in working.columns:
             working = working.sort_values("score_total", ascending=False).reset_index(drop=True)
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 
 import pandas as pd
 
-from app.events.earnings import PHASE_NON, tag_earnings_phase
+from app.data.dates import ensure_dates, parse_dates
+from app.data.panel import PricePanel
+from app.events.earnings import PHASE_NON, EarningsEventIndex, tag_earnings_phase
 
 
 PHASES = {"pre", "reaction", "post", PHASE_NON}
@@ -76,14 +78,18 @@ OBJECTIVE_COPY: Dict[str, Dict[str, Dict[str, str]]] = {
 
 def add_planner_earnings_warnings(
     planner_df: pd.DataFrame,
-    prices_df: pd.DataFrame,
-    events_df: pd.DataFrame,
+    prices_df: Union[pd.DataFrame, PricePanel],
+    events_df: Union[pd.DataFrame, EarningsEventIndex],
     objective: str,
     inst_col: str = "instrument",
     entry_col: str = "entry_date",
     window_col: str = "holding_window",
 ) -> pd.DataFrame:
-    """Attach earnings-aware warnings and phases to planner rows."""
+    """Attach earnings-aware warnings and phases to planner rows.
+
+    ``events_df`` may be a prebuilt :class:`EarningsEventIndex` shared with
+    ``tag_earnings_phase``; ``prices_df`` may be the dataset's :class:`PricePanel`.
+    """
     if planner_df.empty:
         result = planner_df.copy()
         for column in (
@@ -109,15 +115,14 @@ def add_planner_earnings_warnings(
         events_df,
         date_col="date",
         inst_col=inst_col,
+        price_panel=prices_df if isinstance(prices_df, PricePanel) else None,
     )
-    phase_map = {
-        (row[inst_col], row["date"]): row["earnings_phase"]
-        for _, row in cal_tagged.iterrows()
-    }
+    keys = list(zip(cal_tagged[inst_col], cal_tagged["date"]))
+    phase_map = dict(zip(keys, cal_tagged["earnings_phase"]))
     offset_map = {
-        (row[inst_col], row["date"]): row["earnings_day_offset"]
-        for _, row in cal_tagged.iterrows()
-        if pd.notna(row["earnings_day_offset"])
+        key: offset
+        for key, offset in zip(keys, cal_tagged["earnings_day_offset"])
+        if pd.notna(offset)
     }
 
     planned_exit = _compute_planned_exit_dates(
@@ -128,9 +133,8 @@ def add_planner_earnings_warnings(
         window_col=window_col,
     )
 
-    combined = planned_exit.copy()
-    combined[entry_col] = pd.to_datetime(combined[entry_col])
-    combined["planned_exit_date"] = planned_exit["planned_exit_date"]
+    # _compute_planned_exit_dates returns a new frame with parsed entry dates.
+    combined = planned_exit
     combined["earnings_phase"] = combined.apply(
         lambda row: phase_map.get((row[inst_col], row[entry_col]), PHASE_NON),
         axis=1,
@@ -168,21 +172,33 @@ def add_planner_earnings_warnings(
     return combined
 
 
+def _trading_days(
+    prices_df: Union[pd.DataFrame, PricePanel],
+    inst_col: str,
+    instruments: pd.Series,
+) -> Dict[str, pd.Index]:
+    if isinstance(prices_df, PricePanel):
+        return {
+            instrument: pd.Index(prices_df.ticker_dates(instrument))
+            for instrument in instruments.dropna().unique()
+            if instrument in prices_df
+        }
+    prices = ensure_dates(prices_df, errors="raise")
+    trading_days: Dict[str, pd.Index] = {}
+    for instrument, group in prices.groupby(inst_col, sort=False):
+        trading_days[instrument] = pd.Index(group["date"].sort_values().unique())
+    return trading_days
+
+
 def _compute_planned_exit_dates(
     planner_df: pd.DataFrame,
-    prices_df: pd.DataFrame,
+    prices_df: Union[pd.DataFrame, PricePanel],
     inst_col: str,
     entry_col: str,
     window_col: str,
 ) -> pd.DataFrame:
-    result = planner_df.copy()
-    result[entry_col] = pd.to_datetime(result[entry_col])
-    prices = prices_df.copy()
-    prices["date"] = pd.to_datetime(prices["date"])
-
-    trading_days: Dict[str, pd.Index] = {}
-    for instrument, group in prices.groupby(inst_col, sort=False):
-        trading_days[instrument] = pd.Index(group["date"].sort_values().unique())
+    result = planner_df.assign(**{entry_col: parse_dates(planner_df[entry_col], errors="raise")})
+    trading_days = _trading_days(prices_df, inst_col, result[inst_col])
 
     planned_dates: list[Optional[pd.Timestamp]] = []
     for _, row in result.iterrows():
@@ -214,13 +230,15 @@ def _compute_planned_exit_dates(
 
 
 def _build_calendar_df(
-    prices_df: pd.DataFrame,
+    prices_df: Union[pd.DataFrame, PricePanel],
     inst_col: str,
 ) -> pd.DataFrame:
+    if isinstance(prices_df, PricePanel):
+        return prices_df.to_frame()[["instrument", "date"]].rename(columns={"instrument": inst_col})
     if inst_col not in prices_df.columns:
         raise KeyError(f"prices_df must include {inst_col}")
-    calendar_df = prices_df[[inst_col, "date"]].drop_duplicates().copy()
-    calendar_df["date"] = pd.to_datetime(calendar_df["date"])
+    calendar_df = prices_df[[inst_col, "date"]].drop_duplicates()
+    calendar_df["date"] = parse_dates(calendar_df["date"], errors="raise")
     calendar_df = calendar_df.sort_values([inst_col, "date"], kind="stable")
     return calendar_df
 
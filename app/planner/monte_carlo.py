@@ -0,0 +1,163 @@
+"""Monte Carlo outcome ranges for an allocation plan."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PATHS = 20_000
+DEFAULT_CYCLES = 12
+# Paths simulated per draw; fixed so results do not depend on the worker count.
+CHUNK_PATHS = 5_000
+PERCENTILES = (5, 25, 50, 75, 95)
+
+ReturnPools = dict[tuple[str, int | None], np.ndarray]
+
+
+def build_return_pools(
+    trades: pd.DataFrame,
+    *,
+    return_col: str = "net_return_pct",
+    inst_col: str = "instrument",
+    window_col: str = "holding_window",
+) -> ReturnPools:
+    """Historical returns (percent) per ``(instrument, holding_window)``.
+
+    Each instrument also gets an all-window pool under ``(instrument, None)``
+    for plan rows whose holding window has no trades of its own.
+    """
+    if trades is None or trades.empty or not {inst_col, return_col} <= set(trades.columns):
+        return {}
+    values = pd.to_numeric(trades[return_col], errors="coerce").to_numpy(dtype=np.float64)
+    frame = pd.DataFrame(
+        {
+            "instrument": trades[inst_col].astype(str).to_numpy(),
+            "holding_window": (
+                pd.to_numeric(trades[window_col], errors="coerce").to_numpy()
+                if window_col in trades.columns
+                else np.nan
+            ),
+            "value": values,
+        }
+    ).dropna(subset=["value"])
+
+    pools: ReturnPools = {}
+    for instrument, positions in frame.groupby("instrument", sort=True).indices.items():
+        pools[(instrument, None)] = frame["value"].to_numpy()[positions]
+    windowed = frame.dropna(subset=["holding_window"])
+    for (instrument, window), positions in windowed.groupby(["instrument", "holding_window"], sort=True).indices.items():
+        pools[(instrument, int(window))] = windowed["value"].to_numpy()[positions]
+    return pools
+
+
+def _pool_for(pools: Mapping[tuple[str, int | None], np.ndarray], instrument: str, window: Any) -> np.ndarray | None:
+    try:
+        window_key = int(window)
+    except (TypeError, ValueError):
+        window_key = None
+    pool = pools.get((instrument, window_key)) if window_key is not None else None
+    if pool is None or pool.size == 0:
+        pool = pools.get((instrument, None))
+    return pool if pool is not None and pool.size else None
+
+
+def _simulate_chunk(
+    args: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int, int, np.random.SeedSequence],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Simulate ``paths`` plan paths in one batch.
+
+    Every (path, cycle, trade) cell draws a historical return from that
+    trade's pool through one flat index array. Returns the per-cycle plan
+    returns (paths x cycles) and each path's maximum drawdown.
+    """
+    flat_returns, offsets, sizes, weights, paths, cycles, seed = args
+    rng = np.random.default_rng(seed)
+    indices = offsets + rng.integers(0, sizes, size=(paths, cycles, weights.size))
+    cycle_returns = flat_returns[indices] @ weights
+    equity = np.cumprod(1.0 + cycle_returns, axis=1)
+    peaks = np.maximum.accumulate(np.maximum(equity, 1.0), axis=1)
+    drawdowns = (1.0 - equity / peaks).max(axis=1)
+    return cycle_returns, drawdowns
+
+
+def simulate_plan_outcomes(
+    allocations: Sequence[Mapping[str, Any]],
+    pools: Mapping[tuple[str, int | None], np.ndarray],
+    total_capital: float,
+    *,
+    n_paths: int = DEFAULT_PATHS,
+    cycles: int = DEFAULT_CYCLES,
+    seed: int = 0,
+    workers: int = 1,
+) -> dict[str, Any] | None:
+    """Simulate the range of outcomes for the funded part of a plan.
+
+    One plan cycle holds every funded trade for its window once, drawing its
+    net return from that instrument's history; unfunded cash earns nothing.
+    ``n_paths`` sequences of ``cycles`` plan cycles are drawn as
+    ``(paths, cycles, trades)`` arrays in fixed-size chunks, which
+    ``workers > 1`` spreads over a process pool with the same results.
+
+    Returns ``None`` when no funded allocation has return history. Otherwise
+    a dict with single-cycle profit/loss percentiles (``pnl_percentiles``,
+    in currency), ``probability_of_loss``, the median and worst (95th
+    percentile) drawdown over the simulated cycles, and the instruments left
+    out for lack of history under ``unmodeled``.
+    """
+    if n_paths < 1 or cycles < 1:
+        raise ValueError("n_paths and cycles must be positive")
+    capital = float(total_capital or 0.0)
+    weights: list[float] = []
+    chosen: list[np.ndarray] = []
+    unmodeled: list[str] = []
+    for allocation in allocations:
+        amount = float(allocation.get("allocation_amount", 0.0) or 0.0)
+        if amount <= 0:
+            continue
+        instrument = str(allocation.get("instrument", ""))
+        pool = _pool_for(pools, instrument, allocation.get("holding_window"))
+        if pool is None:
+            unmodeled.append(instrument)
+            continue
+        weights.append(amount / capital if capital > 0 else float(allocation.get("allocation_pct", 0.0) or 0.0))
+        chosen.append(pool)
+    if not chosen:
+        return None
+
+    sizes = np.array([pool.size for pool in chosen], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    flat_returns = np.concatenate(chosen) / 100.0
+    weight_array = np.asarray(weights, dtype=np.float64)
+
+    chunk_sizes = [min(CHUNK_PATHS, n_paths - start) for start in range(0, n_paths, CHUNK_PATHS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    payloads = [
+        (flat_returns, offsets, sizes, weight_array, paths, cycles, chunk_seed)
+        for paths, chunk_seed in zip(chunk_sizes, seeds)
+    ]
+    if workers > 1 and len(payloads) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_chunk, payloads))
+    else:
+        results = [_simulate_chunk(payload) for payload in payloads]
+    cycle_returns = np.concatenate([returns for returns, _ in results])
+    drawdowns = np.concatenate([drawdown for _, drawdown in results])
+
+    # Cycles are independent draws, so every cycle adds to the one-cycle distribution.
+    single_cycle = cycle_returns.ravel()
+    pnl = np.percentile(single_cycle, PERCENTILES) * capital
+    return {
+        "paths": int(n_paths),
+        "cycles": int(cycles),
+        "total_capital": capital,
+        "modeled_weight": float(weight_array.sum()),
+        "pnl_percentiles": {pct: float(value) for pct, value in zip(PERCENTILES, pnl)},
+        "expected_pnl": float(single_cycle.mean() * capital),
+        "probability_of_loss": float((single_cycle < 0).mean()),
+        "median_drawdown_pct": float(np.median(drawdowns) * 100),
+        "worst_drawdown_pct": float(np.percentile(drawdowns, 95) * 100),
+        "unmodeled": unmodeled,
+    }
@@ -405,6 +405,34 @@ def render_portfolio_plan(
         _render_review_section()
 
 
+def render_plan_outcomes(simulation: Mapping[str, Any] | None, st_module=None) -> None:
+    """Render the simulated outcome range for one cycle of the plan."""
+    if st_module is None:
+        import streamlit as st_module
+
+    if not simulation:
+        return
+    pnl = simulation["pnl_percentiles"]
+    st_module.markdown("#### Range of Outcomes")
+    metric_cols = st_module.columns(3)
+    metric_cols[0].metric("Typical Result", f"JMD {pnl[50]:,.0f}")
+    metric_cols[1].metric("Chance of a Loss", f"{simulation['probability_of_loss']:.0%}")
+    metric_cols[2].metric("Deep Drawdown", f"{simulation['worst_drawdown_pct']:.1f}%")
+    st_module.caption(
+        f"In 9 of 10 simulated plan cycles the result landed between JMD {pnl[5]:,.0f} and JMD {pnl[95]:,.0f}; "
+        f"half landed between JMD {pnl[25]:,.0f} and JMD {pnl[75]:,.0f}."
+    )
+    st_module.caption(
+        f"Based on {simulation['paths']:,} simulated runs of {simulation['cycles']} back-to-back plan cycles, "
+        "each drawing past net returns for the funded trades. Deep drawdown is the fall from peak "
+        "that only 1 in 20 runs exceeded. Past behavior does not guarantee future results."
+    )
+    if simulation.get("unmodeled"):
+        st_module.caption(
+            "Not enough history to simulate: " + ", ".join(str(name) for name in simulation["unmodeled"]) + "."
+        )
+
+
 def _build_review_interpretation_paragraphs(review_df: pd.DataFrame, *, mode: str = "beginner") -> list[str]:
     if review_df is None or review_df.empty:
         return ["Behavior read becomes sharper as more reviewed decisions accumulate."]
@@ -2,22 +2,41 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 
 import pandas as pd
 
+from app.data.markets import market_set
+from app.data.profile import profile_from_meta
+
 from .objectives import get_objective_weights, get_window_emphasis
 from .scoring import compute_components, score_window
 from .tiering import apply_liquidity_cap, assign_tier
 from .turnover import dataset_years
 
 
+def _market_instruments(meta: Dict[str, object], wanted: set) -> List[str]:
+    profile = profile_from_meta(meta)
+    if profile is None:
+        return []
+    return [name for name, ticker in profile.tickers.items() if ticker.market in wanted]
+
+
 def rank_instruments(
     df_summary: pd.DataFrame,
     meta: Dict[str, object],
     objective: str,
+    markets: Optional[Iterable[str] | str] = None,
 ) -> pd.DataFrame:
-    """Rank instruments based on objective and summary metrics."""
+    """Rank instruments based on objective and summary metrics.
+
+    ``markets`` keeps only instruments listed on those markets, as recorded
+    in the dataset profile in ``meta``. Summaries split by ``exit_policy``
+    pick each instrument's best window and policy, named in ``exit_policy``.
+    """
+    wanted = market_set(markets)
+    if wanted is not None:
+        df_summary = df_summary[df_summary["instrument"].isin(_market_instruments(meta, wanted))]
     start_date_raw = meta.get("start_date")
     end_date_raw = meta.get("end_date")
     if start_date_raw and end_date_raw:
@@ -34,45 +53,71 @@ def rank_instruments(
     scored["turnover_rate"] = turnover
     scored = score_window(scored, weights, emphasis)
 
+    # Pick each instrument's top-scoring window in one pass; the stable sort
+    # keeps the first listed window on score ties.
+    ordered = scored.dropna(subset=["instrument"]).sort_values(
+        ["instrument", "score_window"],
+        ascending=[True, False],
+        kind="stable",
+    )
+    top = ordered.drop_duplicates("instrument", keep="first").set_index("instrument")
+    best = top
+    shifted = pd.Series(False, index=top.index)
+
+    if objective == "income_stability":
+        ten_day = (
+            ordered[ordered["holding_window"] == 10]
+            .drop_duplicates("instrument", keep="first")
+            .set_index("instrument")
+            .reindex(top.index)
+        )
+        shifted = (
+            (top["holding_window"] == 5)
+            & (top["T"].astype(float) > 0.75)
+            & ten_day["score_window"].notna()
+            & (ten_day["score_window"] >= top["score_window"] * 0.95)
+        )
+        best = top.where(~shifted, ten_day)
+
+    if "volume_confirmation_enabled" in meta:
+        volume_available = bool(meta.get("volume_confirmation_enabled"))
+    else:
+        volume_available = bool(meta.get("volume_available", False))
+    liquidity_ceiling = str(meta.get("liquidity_ceiling", "B"))
+
     best_rows: List[dict] = []
-    for instrument, group in scored.groupby("instrument"):
-        group = group.sort_values("score_window", ascending=False)
-        best = group.iloc[0].copy()
-        reasons = [f"Top score at {int(best['holding_window'])}D window."]
-
-        if objective == "income_stability" and int(best["holding_window"]) == 5:
-            high_turnover = float(best["T"]) > 0.75
-            candidate = group[group["holding_window"] == 10]
-            if high_turnover and not candidate.empty:
-                candidate_row = candidate.iloc[0]
-                if candidate_row["score_window"] >= best["score_window"] * 0.95:
-                    best = candidate_row.copy()
-                    reasons.append("Guardrail: shifted to 10D due to high turnover.")
-
-        tier = assign_tier(float(best["score_window"]))
-        if "volume_confirmation_enabled" in meta:
-            volume_available = bool(meta.get("volume_confirmation_enabled"))
-        else:
-            volume_available = bool(meta.get("volume_available", False))
+    for instrument, top_window, best_window, score, guardrail in zip(
+        top.index,
+        top["holding_window"],
+        best["holding_window"],
+        best["score_window"],
+        shifted,
+    ):
+        reasons = [f"Top score at {int(top_window)}D window."]
+        if guardrail:
+            reasons.append("Guardrail: shifted to 10D due to high turnover.")
 
         tier, warning = apply_liquidity_cap(
-            tier,
+            assign_tier(float(score)),
             volume_available,
-            str(meta.get("liquidity_ceiling", "B")),
+            liquidity_ceiling,
         )
         warnings = [warning] if warning else []
 
         best_rows.append(
             {
                 "instrument": instrument,
-                "best_window": int(best["holding_window"]),
-                "score_total": float(best["score_window"]),
+                "best_window": int(best_window),
+                "score_total": float(score),
                 "tier": tier,
                 "reasons": reasons,
                 "warnings": warnings,
             }
         )
 
-    return pd.DataFrame(best_rows).sort_values(
-        ["score_total", "instrument"], ascending=[False, True]
-    )
+    columns = ["instrument", "best_window", "score_total", "tier", "reasons", "warnings"]
+    ranked = pd.DataFrame(best_rows, columns=columns)
+    if "exit_policy" in best.columns:
+        # A policy-tagged summary ranks window and policy pairs; keep which policy won.
+        ranked.insert(2, "exit_policy", best["exit_policy"].reindex(ranked["instrument"]).to_numpy())
+    return ranked.sort_values(["score_total", "instrument"], ascending=[False, True])
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import Dict, Tuple
 
+import numpy as np
 import pandas as pd
 
 from .normalize import percentile_normalize
@@ -15,28 +16,45 @@ def compute_components(
     years: float,
 ) -> Tuple[pd.DataFrame, pd.Series]:
     """Compute normalized components and turnover."""
-    df = df_summary.copy()
-    df["R"] = percentile_normalize(df["median_net_return"])
-    df["W"] = df["win_rate_net"]
-    df["H"] = df["hit_rate_above_cost"]
-    turnover = turnover_rate(df["n_trades"], years)
-    df["T"] = percentile_normalize(turnover)
+    turnover = turnover_rate(df_summary["n_trades"], years)
+    df = df_summary.assign(
+        R=percentile_normalize(df_summary["median_net_return"]),
+        W=df_summary["win_rate_net"],
+        H=df_summary["hit_rate_above_cost"],
+        T=percentile_normalize(turnover),
+    )
     return df, turnover
 
 
+def window_multipliers(holding_window: pd.Series, window_emphasis: Dict[int, float]) -> pd.Series:
+    """Emphasis per window, interpolated between the emphasized windows.
+
+    Horizons outside the emphasized range take the nearest end's emphasis;
+    with no emphasis (or no window) the multiplier is 1.0.
+    """
+    if not window_emphasis:
+        return pd.Series(1.0, index=holding_window.index)
+    known = sorted(window_emphasis)
+    windows = pd.to_numeric(holding_window, errors="coerce").to_numpy(dtype=float)
+    multipliers = np.interp(windows, known, [window_emphasis[window] for window in known])
+    return pd.Series(multipliers, index=holding_window.index).fillna(1.0)
+
+
 def score_window(
     df: pd.DataFrame,
     weights: Dict[str, float],
     window_emphasis: Dict[int, float],
 ) -> pd.DataFrame:
     """Compute weighted scores per instrument-window."""
-    df = df.copy()
-    df["score_base"] = (
+    score_base = (
         weights["R"] * df["R"]
         + weights["W"] * df["W"]
         + weights["H"] * df["H"]
         + weights["T"] * (1 - df["T"])
     )
-    df["window_multiplier"] = df["holding_window"].map(window_emphasis).fillna(1.0)
-    df["score_window"] = df["score_base"] * df["window_multiplier"]
-    return df
+    window_multiplier = window_multipliers(df["holding_window"], window_emphasis)
+    return df.assign(
+        score_base=score_base,
+        window_multiplier=window_multiplier,
+        score_window=score_base * window_multiplier,
+    )
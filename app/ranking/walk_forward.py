@@ -0,0 +1,244 @@
+"""Walk-forward (point-in-time) ranking backtest."""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.costs.config import resolve_cost_config
+
+from .engine import rank_instruments
+
+SUMMARY_COLUMNS = [
+    "instrument",
+    "holding_window",
+    "n_trades",
+    "win_rate_net",
+    "median_net_return",
+    "avg_net_return",
+    "hit_rate_above_cost",
+]
+
+
+class RunningMedian:
+    """Two-heap running median for an append-only stream of values."""
+
+    def __init__(self) -> None:
+        self._low: List[float] = []  # max-heap via negated values
+        self._high: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._low) + len(self._high)
+
+    def push(self, value: float) -> None:
+        if self._low and value > -self._low[0]:
+            heapq.heappush(self._high, value)
+        else:
+            heapq.heappush(self._low, -value)
+
+        if len(self._low) > len(self._high) + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+        elif len(self._high) > len(self._low):
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+
+    def median(self) -> float:
+        if not self._low:
+            return float("nan")
+        if len(self._low) > len(self._high):
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2.0
+
+
+class IncrementalSummary:
+    """Instrument/window summary kept current with cumulative counts and sums.
+
+    Trades are added as they close; snapshots match the columns produced by
+    ``run_cost_engine`` for the metrics the ranking engine reads.
+    """
+
+    def __init__(self, keys: pd.DataFrame, cost_drag_pct: float) -> None:
+        self._keys = keys.reset_index(drop=True)
+        size = len(self._keys)
+        self._cost_drag_pct = float(cost_drag_pct)
+        self._count = np.zeros(size, dtype=np.int64)
+        self._wins = np.zeros(size, dtype=np.int64)
+        self._hits = np.zeros(size, dtype=np.int64)
+        self._net_sum = np.zeros(size, dtype=np.float64)
+        self._medians = [RunningMedian() for _ in range(size)]
+
+    def add(self, codes: np.ndarray, net_returns: np.ndarray, gross_returns: np.ndarray) -> None:
+        """Fold a batch of closed trades into the running statistics."""
+        if codes.size == 0:
+            return
+        size = self._count.size
+        self._count += np.bincount(codes, minlength=size)
+        self._wins += np.bincount(codes, weights=net_returns > 0, minlength=size).astype(np.int64)
+        self._hits += np.bincount(
+            codes, weights=gross_returns > self._cost_drag_pct, minlength=size
+        ).astype(np.int64)
+        self._net_sum += np.bincount(codes, weights=net_returns, minlength=size)
+        for code, value in zip(codes.tolist(), net_returns.tolist()):
+            self._medians[code].push(value)
+
+    def snapshot(self, min_trades: int = 1) -> pd.DataFrame:
+        """Return the current summary for groups with enough closed trades."""
+        active = np.flatnonzero(self._count >= max(int(min_trades), 1))
+        counts = self._count[active]
+        summary = self._keys.iloc[active].reset_index(drop=True)
+        summary["n_trades"] = counts
+        summary["win_rate_net"] = self._wins[active] / counts
+        summary["median_net_return"] = [self._medians[code].median() for code in active.tolist()]
+        summary["avg_net_return"] = self._net_sum[active] / counts
+        summary["hit_rate_above_cost"] = self._hits[active] / counts
+        return summary[SUMMARY_COLUMNS]
+
+
+def _resolve_cost_drag_pct(trades: pd.DataFrame, cost_drag_pct: Optional[float]) -> float:
+    if cost_drag_pct is not None:
+        return float(cost_drag_pct)
+    if "cost_drag_pct" in trades.columns and not trades.empty:
+        return float(trades["cost_drag_pct"].iloc[0])
+    return resolve_cost_config("Default")["round_trip_cost_rate"] * 100
+
+
+def _price_lookup(prices: pd.DataFrame) -> Dict[str, tuple[np.ndarray, np.ndarray]]:
+    ordered = prices.dropna(subset=["date", "close"]).sort_values(["instrument", "date"], kind="stable")
+    ordered = ordered.drop_duplicates(["instrument", "date"], keep="last")
+    lookup: Dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    for instrument, group in ordered.groupby("instrument", sort=False):
+        lookup[instrument] = (
+            group["date"].to_numpy(dtype="datetime64[ns]"),
+            group["close"].to_numpy(dtype=np.float64),
+        )
+    return lookup
+
+
+def _forward_return(
+    lookup: Dict[str, tuple[np.ndarray, np.ndarray]],
+    instrument: str,
+    rebalance_date: np.datetime64,
+    window: int,
+    cost_drag_pct: float,
+) -> tuple[float, Optional[np.datetime64]]:
+    series = lookup.get(instrument)
+    if series is None:
+        return np.nan, None
+    dates, closes = series
+    entry_idx = int(np.searchsorted(dates, rebalance_date, side="left"))
+    exit_idx = entry_idx + int(window)
+    if exit_idx >= dates.size or closes[entry_idx] == 0:
+        return np.nan, None
+    gross = (closes[exit_idx] / closes[entry_idx] - 1) * 100
+    return float(gross - cost_drag_pct), dates[exit_idx]
+
+
+def run_walk_forward(
+    trades: pd.DataFrame,
+    prices: pd.DataFrame,
+    meta: Dict[str, object],
+    objective: str = "income_stability",
+    *,
+    rebalance_dates: Optional[Iterable[pd.Timestamp]] = None,
+    rebalance_every: int = 1,
+    top_tiers: Sequence[str] = ("A",),
+    min_trades: int = 1,
+    cost_drag_pct: Optional[float] = None,
+) -> pd.DataFrame:
+    """Rank at each rebalance date from closed trades only and score the picks forward.
+
+    A trade is visible at a rebalance date only when its exit date is strictly
+    earlier. Picks in ``top_tiers`` are held for their best window starting
+    at the first trading day on or after the rebalance date.
+    """
+    columns = [
+        "rebalance_date",
+        "instrument",
+        "tier",
+        "best_window",
+        "score_total",
+        "history_trades",
+        "forward_exit_date",
+        "forward_net_return_pct",
+    ]
+    drag = _resolve_cost_drag_pct(trades, cost_drag_pct)
+
+    closed = trades.dropna(subset=["exit_date", "net_return_pct"]).sort_values("exit_date", kind="stable")
+    grouper = closed.groupby(["instrument", "holding_window"], sort=False)
+    codes = grouper.ngroup().to_numpy(dtype=np.int64)
+    keys = grouper.size().reset_index()[["instrument", "holding_window"]]
+    summary = IncrementalSummary(keys, drag)
+
+    exit_dates = closed["exit_date"].to_numpy(dtype="datetime64[ns]")
+    net_returns = closed["net_return_pct"].to_numpy(dtype=np.float64)
+    gross_returns = closed["gross_return_pct"].to_numpy(dtype=np.float64)
+
+    if rebalance_dates is None:
+        calendar = np.unique(prices["date"].dropna().to_numpy(dtype="datetime64[ns]"))
+    else:
+        calendar = np.unique(pd.to_datetime(pd.Index(list(rebalance_dates))).to_numpy(dtype="datetime64[ns]"))
+    calendar = calendar[:: max(int(rebalance_every), 1)]
+
+    lookup = _price_lookup(prices)
+    tiers = set(top_tiers)
+    start_date = pd.Timestamp(calendar[0]) if calendar.size else None
+
+    rows: List[dict] = []
+    cursor = 0
+    for rebalance_date in calendar:
+        upto = int(np.searchsorted(exit_dates, rebalance_date, side="left"))
+        if upto > cursor:
+            summary.add(codes[cursor:upto], net_returns[cursor:upto], gross_returns[cursor:upto])
+            cursor = upto
+
+        snapshot = summary.snapshot(min_trades=min_trades)
+        if snapshot.empty:
+            continue
+
+        as_of_meta = {**meta, "start_date": start_date, "end_date": pd.Timestamp(rebalance_date)}
+        ranked = rank_instruments(snapshot, as_of_meta, objective)
+        picks = ranked[ranked["tier"].isin(tiers)]
+        if picks.empty:
+            continue
+
+        history = snapshot.set_index(["instrument", "holding_window"])["n_trades"]
+        for pick in picks.itertuples(index=False):
+            forward_return, forward_exit = _forward_return(
+                lookup, pick.instrument, rebalance_date, pick.best_window, drag
+            )
+            rows.append(
+                {
+                    "rebalance_date": pd.Timestamp(rebalance_date),
+                    "instrument": pick.instrument,
+                    "tier": pick.tier,
+                    "best_window": pick.best_window,
+                    "score_total": pick.score_total,
+                    "history_trades": int(history.get((pick.instrument, pick.best_window), 0)),
+                    "forward_exit_date": pd.Timestamp(forward_exit) if forward_exit is not None else pd.NaT,
+                    "forward_net_return_pct": forward_return,
+                }
+            )
+
+    return pd.DataFrame(rows, columns=columns)
+
+
+def summarize_walk_forward(results: pd.DataFrame) -> Dict[str, float]:
+    """Summarize realized forward outcomes of walk-forward picks."""
+    realized = results["forward_net_return_pct"].dropna() if not results.empty else pd.Series(dtype=float)
+    if realized.empty:
+        return {
+            "rebalances": float(results["rebalance_date"].nunique()) if not results.empty else 0.0,
+            "picks": 0.0,
+            "win_rate_net": np.nan,
+            "median_net_return": np.nan,
+            "avg_net_return": np.nan,
+        }
+    return {
+        "rebalances": float(results["rebalance_date"].nunique()),
+        "picks": float(realized.size),
+        "win_rate_net": float((realized > 0).mean()),
+        "median_net_return": float(realized.median()),
+        "avg_net_return": float(realized.mean()),
+    }
@@ -3,14 +3,56 @@
 from __future__ import annotations
 
 import re
+from typing import Any, Callable, Sequence
 
 import pandas as pd
 
-from app.costs.engine import run_cost_engine
+from app.costs.compact import compact_trade_table
+from app.costs.exits import DEFAULT_EXIT_POLICIES, ExitPolicy
+from app.lazy import LazyCallable
+from app.signals.rules import DEFAULT_ENTRY_RULE, SignalRule
+
+run_cost_engine = LazyCallable("app.costs.engine", "run_cost_engine")
+build_demo_entries = LazyCallable("app.demo.run_demo", "build_demo_entries")
 
 _HOLDING_WINDOW_PATTERN = re.compile(r"([+-]?\d+)")
 
 
+class LazyArtifacts:
+    """Named pipeline artifacts built on first access and memoized for the run.
+
+    Builders may read other artifacts, so a tab that needs only ingestion
+    never triggers rankings or the analyst-dataset build.
+    """
+
+    def __init__(self) -> None:
+        self._builders: dict[str, Callable[[], Any]] = {}
+        self._values: dict[str, Any] = {}
+        self.computed: list[str] = []
+
+    def register(self, name: str, builder: Callable[[], Any]) -> None:
+        self._builders[name] = builder
+        self._values.pop(name, None)
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._values:
+            try:
+                builder = self._builders[name]
+            except KeyError:
+                raise KeyError(f"No artifact registered as {name!r}.") from None
+            self._values[name] = builder()
+            self.computed.append(name)
+        return self._values[name]
+
+    def require(self, *names: str) -> None:
+        """Build every named artifact now, e.g. the declared needs of a tab."""
+        for name in names:
+            self[name]
+
+    def is_computed(self, name: str) -> bool:
+        return name in self._values
+
+
 def coerce_trade_rows_from_ranked(ranked_df: pd.DataFrame) -> list[dict]:
     """Build minimal planner trade rows from ranked outputs for UI wiring."""
     trade_rows: list[dict] = []
@@ -64,17 +106,31 @@ def _coerce_holding_window(*values: object) -> int | None:
     return None
 
 
-def build_analyst_dataset(canonical_df: pd.DataFrame, ranked_df: pd.DataFrame) -> pd.DataFrame:
-    """Build a return-bearing dataset for Analyst Insights from existing demo outputs."""
-    entries = canonical_df[["instrument", "date"]].rename(columns={"date": "entry_date"})
+def build_analyst_dataset(
+    canonical_df: pd.DataFrame,
+    ranked_df: pd.DataFrame,
+    entry_rule: SignalRule | None = DEFAULT_ENTRY_RULE,
+    exit_policies: Sequence[ExitPolicy] | None = DEFAULT_EXIT_POLICIES,
+) -> pd.DataFrame:
+    """Build a return-bearing dataset for Analyst Insights from existing demo outputs.
+
+    The result uses the compact trade layout; call ``materialize_trade_dates``
+    before reading ``entry_date``/``exit_date``. Entries come from the same
+    earnings-tagged signal step as ``run_demo``, so the trades match the
+    rankings. Each trade appears once per exit policy, tagged in
+    ``exit_policy``; ``select_exit_policy`` keeps the time exits.
+    """
+    entries = build_demo_entries(canonical_df, entry_rule)
     trades_df, _, _, _ = run_cost_engine(
         df_prices=canonical_df,
         df_entries=entries,
+        exit_policies=exit_policies,
     )
+    compact = compact_trade_table(trades_df)
 
     if ranked_df.empty:
-        return trades_df
+        return compact
 
-    tier_lookup = ranked_df[["instrument", "tier"]].rename(columns={"tier": "quality_tier"})
-    enriched = trades_df.merge(tier_lookup, on="instrument", how="left")
-    return enriched
+    tier_lookup = ranked_df.drop_duplicates("instrument").set_index("instrument")["tier"]
+    compact["quality_tier"] = compact["instrument"].map(tier_lookup).astype("category")
+    return compact
@@ -0,0 +1 @@
+"""Entry-signal rules that turn price history into sparse trade entries."""
@@ -0,0 +1,191 @@
+"""Composable, vectorized entry-signal rules."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.data.dates import ensure_dates
+
+
+@dataclass(frozen=True)
+class PriceArrays:
+    """Price history sorted by instrument then date, exposed as flat arrays.
+
+    ``position`` is the bar index within each instrument, so rule primitives
+    can work on the whole panel at once and mask lookbacks that would cross
+    into the previous instrument.
+    """
+
+    instrument: np.ndarray
+    date: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    earnings_day_offset: np.ndarray
+    position: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.close.size)
+
+    @classmethod
+    def from_frame(cls, prices: pd.DataFrame) -> "PriceArrays":
+        ordered = prices.dropna(subset=["instrument", "date"])
+        ordered = ensure_dates(ordered)
+        ordered = ordered.dropna(subset=["date"]).sort_values(["instrument", "date"], kind="stable")
+        size = len(ordered)
+
+        def _float_column(name: str) -> np.ndarray:
+            if name not in ordered.columns:
+                return np.full(size, np.nan)
+            return pd.to_numeric(ordered[name], errors="coerce").to_numpy(dtype=np.float64)
+
+        instrument = ordered["instrument"].to_numpy(dtype=object)
+        return cls(
+            instrument=instrument,
+            date=ordered["date"].to_numpy(dtype="datetime64[ns]"),
+            close=_float_column("close"),
+            volume=_float_column("volume"),
+            earnings_day_offset=_float_column("earnings_day_offset"),
+            position=ordered.groupby("instrument", sort=False).cumcount().to_numpy(dtype=np.int64),
+        )
+
+
+def _lagged(values: np.ndarray, position: np.ndarray, lag: int) -> np.ndarray:
+    """Return ``values`` shifted back ``lag`` bars within each instrument."""
+    out = np.full(values.size, np.nan)
+    if lag < values.size:
+        out[lag:] = values[:-lag] if lag else values
+    out[position < lag] = np.nan
+    return out
+
+
+def _trailing_mean(values: np.ndarray, position: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the ``window`` bars ending at each row, NaN until history is long enough."""
+    out = np.full(values.size, np.nan)
+    if window <= 0 or values.size < window:
+        return out
+    valid = ~np.isnan(values)
+    cumulative = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    complete = (counts[window:] - counts[:-window]) == window
+    sums = cumulative[window:] - cumulative[:-window]
+    out[window - 1 :] = np.where(complete, sums / window, np.nan)
+    out[position < window - 1] = np.nan
+    return out
+
+
+def _prior_max(values: np.ndarray, position: np.ndarray, lookback: int) -> np.ndarray:
+    """Max of the ``lookback`` bars strictly before each row."""
+    out = np.full(values.size, np.nan)
+    if lookback <= 0 or values.size <= lookback:
+        return out
+    out[lookback:] = sliding_window_view(values, lookback)[:-1].max(axis=1)
+    out[position < lookback] = np.nan
+    return out
+
+
+class SignalRule:
+    """A named boolean rule over :class:`PriceArrays`, composable with ``&``, ``|`` and ``~``."""
+
+    def __init__(self, name: str, evaluate: Callable[[PriceArrays], np.ndarray]) -> None:
+        self.name = name
+        self._evaluate = evaluate
+
+    def __call__(self, arrays: PriceArrays) -> np.ndarray:
+        mask = np.asarray(self._evaluate(arrays), dtype=bool)
+        if mask.shape != (len(arrays),):
+            raise ValueError(f"Rule {self.name!r} returned a mask of shape {mask.shape}.")
+        return mask
+
+    def __and__(self, other: "SignalRule") -> "SignalRule":
+        return SignalRule(f"({self.name} & {other.name})", lambda arrays: self(arrays) & other(arrays))
+
+    def __or__(self, other: "SignalRule") -> "SignalRule":
+        return SignalRule(f"({self.name} | {other.name})", lambda arrays: self(arrays) | other(arrays))
+
+    def __invert__(self) -> "SignalRule":
+        return SignalRule(f"~{self.name}", lambda arrays: ~self(arrays))
+
+    def __repr__(self) -> str:
+        return f"SignalRule({self.name})"
+
+
+def breakout(lookback: int = 20) -> SignalRule:
+    """Close above the highest close of the previous ``lookback`` bars."""
+
+    def evaluate(arrays: PriceArrays) -> np.ndarray:
+        prior_high = _prior_max(arrays.close, arrays.position, lookback)
+        with np.errstate(invalid="ignore"):
+            return arrays.close > prior_high
+
+    return SignalRule(f"breakout({lookback})", evaluate)
+
+
+def ma_cross(fast: int = 10, slow: int = 50) -> SignalRule:
+    """Fast moving average crosses above the slow moving average on this bar."""
+    if fast >= slow:
+        raise ValueError("fast window must be shorter than slow window")
+
+    def evaluate(arrays: PriceArrays) -> np.ndarray:
+        spread = _trailing_mean(arrays.close, arrays.position, fast) - _trailing_mean(
+            arrays.close, arrays.position, slow
+        )
+        previous = _lagged(spread, arrays.position, 1)
+        with np.errstate(invalid="ignore"):
+            return (spread > 0) & (previous <= 0)
+
+    return SignalRule(f"ma_cross({fast},{slow})", evaluate)
+
+
+def volume_surge(lookback: int = 20, multiple: float = 2.0) -> SignalRule:
+    """Volume at least ``multiple`` times its average over the previous ``lookback`` bars."""
+
+    def evaluate(arrays: PriceArrays) -> np.ndarray:
+        prior_average = _lagged(_trailing_mean(arrays.volume, arrays.position, lookback), arrays.position, 1)
+        with np.errstate(invalid="ignore"):
+            return (prior_average > 0) & (arrays.volume >= multiple * prior_average)
+
+    return SignalRule(f"volume_surge({lookback},{multiple:g})", evaluate)
+
+
+def post_earnings_drift(entry_offset: int = 4, min_reaction_pct: float = 0.0) -> SignalRule:
+    """Enter ``entry_offset`` trading days after earnings when the reaction was positive.
+
+    The reaction is measured from the close before the event day to the
+    entry bar. Requires an ``earnings_day_offset`` column (see
+    ``tag_earnings_phase``); rows without one never fire.
+    """
+    if entry_offset < 0:
+        raise ValueError("entry_offset must be zero or positive")
+
+    def evaluate(arrays: PriceArrays) -> np.ndarray:
+        base = _lagged(arrays.close, arrays.position, entry_offset + 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            reaction_pct = (arrays.close / base - 1) * 100
+            return (arrays.earnings_day_offset == entry_offset) & (reaction_pct > min_reaction_pct)
+
+    return SignalRule(f"post_earnings_drift({entry_offset})", evaluate)
+
+
+DEFAULT_ENTRY_RULE = (breakout(20) & volume_surge(20, 1.5)) | ma_cross(10, 50) | post_earnings_drift(4)
+
+
+def build_entries(prices: pd.DataFrame, rule: Optional[SignalRule] = DEFAULT_ENTRY_RULE) -> pd.DataFrame:
+    """Return the sparse ``instrument``/``entry_date`` frame for ``run_cost_engine``.
+
+    ``rule=None`` keeps the legacy behaviour of treating every bar as an entry.
+    """
+    if rule is None:
+        return prices[["instrument", "date"]].rename(columns={"date": "entry_date"})
+    arrays = PriceArrays.from_frame(prices)
+    mask = rule(arrays)
+    return pd.DataFrame(
+        {
+            "instrument": arrays.instrument[mask],
+            "entry_date": pd.to_datetime(arrays.date[mask]),
+        }
+    )
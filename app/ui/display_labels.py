@@ -19,6 +19,14 @@ _LABEL_OVERRIDES = {
     "exit_reason": "Exit Reason",
     "vol_bucket": "Volatility Bucket",
     "stale_5d": "Stale 5D",
+    "mae_pct": "Max Adverse Excursion",
+    "mfe_pct": "Max Favorable Excursion",
+    "bars_to_peak": "Days to Peak",
+    "median_mae_pct": "Median Adverse Excursion",
+    "worst_mae_pct": "Worst 10% Adverse Excursion",
+    "median_mfe_pct": "Median Favorable Excursion",
+    "best_mfe_pct": "Best 10% Favorable Excursion",
+    "median_bars_to_peak": "Median Days to Peak",
 }
 
 
@@ -61,7 +69,7 @@ def clean_dataframe_labels(
     if not value_columns:
         return renamed
 
-    output = renamed.copy()
+    output = renamed
     for column in value_columns:
         cleaned_column = display_label(column)
         if cleaned_column in output.columns:
@@ -7,19 +7,47 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
-from app.analysis.readiness_gates import compute_readiness_metrics, evaluate_models, write_research_artifacts
+from app.analysis.readiness_gates import (
+    compute_readiness_metrics,
+    compute_readiness_timeseries,
+    evaluate_models,
+    write_research_artifacts,
+)
 from app.data.loaders import load_internal_dataset
+from app.data.ticks import ingest_trade_prints
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Analyze readiness-gate research models.")
     parser.add_argument("--output-dir", default="artifacts/research", help="Output directory for research artifacts")
+    parser.add_argument(
+        "--timeseries",
+        action="store_true",
+        help="Also write readiness as of every ticker and date (readiness_timeseries.csv)",
+    )
+    parser.add_argument(
+        "--trade-prints",
+        nargs="+",
+        metavar="CSV",
+        help="Build daily bars from these trade-print files instead of the bundled dataset",
+    )
+    parser.add_argument(
+        "--market",
+        nargs="+",
+        metavar="MARKET",
+        help="Only analyze these markets of the bundled dataset (e.g. main junior usd)",
+    )
     args = parser.parse_args()
 
-    data = load_internal_dataset()
+    if args.trade_prints:
+        data, _, _ = ingest_trade_prints(args.trade_prints)
+    else:
+        data = load_internal_dataset(args.market)
     metrics = compute_readiness_metrics(data)
     model_summary, model_ticker = evaluate_models(metrics)
     write_research_artifacts(metrics, model_summary, model_ticker, Path(args.output_dir))
+    if args.timeseries:
+        compute_readiness_timeseries(data).to_csv(Path(args.output_dir) / "readiness_timeseries.csv", index=False)
 
     print(f"Wrote readiness research artifacts to {args.output_dir}")
 
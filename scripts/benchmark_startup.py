@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+APP_SCRIPT = ROOT / "app.py"
+
+_IMPORT_PACKAGE = "import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)"
+_IMPORT_APP_SCRIPT = f"""
+import importlib.util, time
+t = time.perf_counter()
+spec = importlib.util.spec_from_file_location("app_main", {str(APP_SCRIPT)!r})
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+print(time.perf_counter() - t)
+"""
+_FIRST_PAINT = f"""
+import json, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({str(APP_SCRIPT)!r}, default_timeout=300)
+t = time.perf_counter()
+at.run()
+print(json.dumps({{"seconds": time.perf_counter() - t, "exceptions": [str(e.value) for e in at.exception]}}))
+"""
+
+
+def _run_child(code: str, *, importtime: bool = False) -> tuple[str, str]:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    result = subprocess.run(command + ["-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1], result.stderr
+
+
+def _parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """Return ``(self_us, cumulative_us, module)`` rows from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def _print_slowest(title: str, rows: list[tuple[int, int, str]], *, top: int, key: int) -> None:
+    print(title)
+    for self_us, cumulative_us, name in sorted(rows, key=lambda row: row[key], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms cumulative  {self_us / 1000:7.1f} ms self  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time and first paint of the dashboard.")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to report")
+    parser.add_argument("--import-budget-ms", type=float, default=600.0, help="Budget for a cold import of app.py")
+    parser.add_argument("--first-paint-budget-ms", type=float, default=4000.0, help="Budget for the first script run")
+    parser.add_argument("--skip-first-paint", action="store_true", help="Only measure imports")
+    args = parser.parse_args()
+
+    package_seconds = float(_run_child(_IMPORT_PACKAGE)[0])
+    _, script_stderr = _run_child(_IMPORT_APP_SCRIPT, importtime=True)
+    # Time the script import again without -X importtime, which adds overhead of its own.
+    script_seconds = float(_run_child(_IMPORT_APP_SCRIPT)[0])
+    rows = _parse_importtime(script_stderr)
+    app_rows = [row for row in rows if row[2] == "app" or row[2].startswith("app.")]
+
+    print(f"cold import app: {package_seconds * 1000:.1f} ms")
+    print(f"cold import app.py: {script_seconds * 1000:.1f} ms")
+    print(f"app modules loaded at import: {len(app_rows)} ({sum(row[0] for row in app_rows) / 1000:.1f} ms self)")
+    _print_slowest("slowest imports (cumulative):", rows, top=args.top, key=1)
+    _print_slowest("slowest app modules (self):", app_rows, top=args.top, key=0)
+
+    failures = []
+    if script_seconds * 1000 > args.import_budget_ms:
+        failures.append(f"import {script_seconds * 1000:.1f} ms > {args.import_budget_ms:.0f} ms")
+
+    if not args.skip_first_paint:
+        paint = json.loads(_run_child(_FIRST_PAINT)[0])
+        print(f"first paint: {paint['seconds'] * 1000:.1f} ms")
+        if paint["exceptions"]:
+            failures.append(f"first paint raised: {paint['exceptions']}")
+        if paint["seconds"] * 1000 > args.first_paint_budget_ms:
+            failures.append(f"first paint {paint['seconds'] * 1000:.1f} ms > {args.first_paint_budget_ms:.0f} ms")
+
+    if failures:
+        print("budget exceeded: " + "; ".join(failures))
+        sys.exit(1)
+    print("within budget")
+
+
+if __name__ == "__main__":
+    main()
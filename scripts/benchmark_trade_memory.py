@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.costs.compact import compact_trade_table, trade_table_nbytes
+from app.costs.engine import run_cost_engine
+from app.data.ingest import ingest_dataset
+from app.demo.run_demo import run_demo
+from app.signals.rules import DEFAULT_ENTRY_RULE, build_entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare trade-table memory in the wide and compact layouts.")
+    parser.add_argument(
+        "--every-bar",
+        action="store_true",
+        help="Treat every bar as an entry (the largest table) instead of using the default signal rule",
+    )
+    args = parser.parse_args()
+
+    canonical_df, meta, issues = ingest_dataset("demo")
+    ranked_df = run_demo(canonical_df=canonical_df, meta=meta, issues=issues)["ranked"]
+    entries = build_entries(canonical_df, None if args.every_bar else DEFAULT_ENTRY_RULE)
+    trades_df, _, _, _ = run_cost_engine(df_prices=canonical_df, df_entries=entries)
+
+    tier_lookup = ranked_df[["instrument", "tier"]].rename(columns={"tier": "quality_tier"})
+    wide = trades_df.merge(tier_lookup, on="instrument", how="left")
+    compact = compact_trade_table(wide)
+
+    wide_bytes = trade_table_nbytes(wide)
+    compact_bytes = trade_table_nbytes(compact)
+    print(f"rows: {len(wide):,}")
+    print(f"wide_bytes: {wide_bytes:,}")
+    print(f"compact_bytes: {compact_bytes:,}")
+    print(f"reduction: {wide_bytes / compact_bytes:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
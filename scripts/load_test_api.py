@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+DEFAULT_PATHS = [
+    "/rankings",
+    "/tickers",
+    "/allocation?capital=100000",
+    "/allocation?capital=250000&mode=analyst",
+]
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    rank = min(len(sorted_values) - 1, max(0, round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[rank]
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, str | None]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    status = int(status_line.split()[1])
+    content_length = 0
+    etag = None
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            content_length = int(value.strip())
+        elif name == "etag":
+            etag = value.strip()
+    if content_length:
+        await reader.readexactly(content_length)
+    return status, etag
+
+
+async def _worker(
+    host: str,
+    port: int,
+    queue: asyncio.Queue,
+    latencies: list[float],
+    statuses: dict[int, int],
+    etags: dict[str, str],
+    conditional: bool,
+) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            scheduled_at, path = item
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+            if conditional and path in etags:
+                request += f"If-None-Match: {etags[path]}\r\n"
+            writer.write((request + "\r\n").encode("latin-1"))
+            await writer.drain()
+            status, etag = await _read_response(reader)
+            # Latency is measured from the scheduled send time so queueing
+            # behind a slow response counts against the server.
+            latencies.append(time.perf_counter() - scheduled_at)
+            statuses[status] = statuses.get(status, 0) + 1
+            if etag is not None:
+                etags[path] = etag
+    finally:
+        writer.close()
+
+
+async def run_load_test(
+    host: str,
+    port: int,
+    *,
+    paths: list[str],
+    rate: float,
+    duration: float,
+    connections: int,
+    conditional: bool,
+) -> dict[str, float]:
+    queue: asyncio.Queue = asyncio.Queue()
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    etags: dict[str, str] = {}
+
+    total_requests = max(1, int(rate * duration))
+    start = time.perf_counter() + 0.2
+    for idx in range(total_requests):
+        queue.put_nowait((start + idx / rate, paths[idx % len(paths)]))
+    for _ in range(connections):
+        queue.put_nowait(None)
+
+    workers = [
+        asyncio.create_task(_worker(host, port, queue, latencies, statuses, etags, conditional))
+        for _ in range(connections)
+    ]
+    await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    return {
+        "requests": float(len(ordered)),
+        "achieved_rps": len(ordered) / elapsed if elapsed > 0 else float("nan"),
+        "p50_ms": _percentile(ordered, 50) * 1000,
+        "p90_ms": _percentile(ordered, 90) * 1000,
+        "p99_ms": _percentile(ordered, 99) * 1000,
+        "max_ms": (ordered[-1] if ordered else float("nan")) * 1000,
+        **{f"status_{code}": float(count) for code, count in sorted(statuses.items())},
+    }
+
+
+async def _wait_for_health(host: str, port: int, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            await asyncio.sleep(0.5)
+            continue
+        writer.write(f"GET /health HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        status, _ = await _read_response(reader)
+        writer.close()
+        if status == 200:
+            return
+    raise TimeoutError(f"API did not become healthy within {timeout:.0f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the local JSE Market Lab API and report latency percentiles.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=300.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of scheduled load")
+    parser.add_argument("--connections", type=int, default=32, help="Concurrent keep-alive connections")
+    parser.add_argument("--ticker", action="append", default=[], help="Add drilldown and metrics routes for a ticker")
+    parser.add_argument("--conditional", action="store_true", help="Revalidate with If-None-Match after the first response")
+    parser.add_argument("--spawn", action="store_true", help="Start the API server in a subprocess for the run")
+    args = parser.parse_args()
+
+    paths = list(DEFAULT_PATHS)
+    for ticker in args.ticker:
+        paths.append(f"/tickers/{quote(ticker)}/drilldown")
+        paths.append(f"/tickers/{quote(ticker)}/metrics")
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.api.server", "--host", args.host, "--port", str(args.port)],
+            cwd=ROOT,
+        )
+    try:
+        asyncio.run(_wait_for_health(args.host, args.port, timeout=120.0))
+        results = asyncio.run(
+            run_load_test(
+                args.host,
+                args.port,
+                paths=paths,
+                rate=args.rate,
+                duration=args.duration,
+                connections=args.connections,
+                conditional=args.conditional,
+            )
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    for name, value in results.items():
+        print(f"{name}: {value:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
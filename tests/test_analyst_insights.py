@@ -1,6 +1,7 @@
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -8,12 +9,14 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
 from app.insights.analyst import (
+    FEATURE_COLUMNS,
     build_exit_analysis,
     build_feature_insights,
     build_performance_matrix,
     grouped_trade_metrics,
     resolve_return_column,
 )
+from app.insights.cube import analyst_grouping_sets, build_metric_cube
 
 
 def _sample_trades() -> pd.DataFrame:
@@ -219,3 +222,95 @@ def test_render_analyst_insights_cleans_snake_case_labels_for_display_tables():
     assert "exit_reason" not in flattened_columns
     assert "Quality Tier" in flattened_columns
     assert "Exit Reason" in flattened_columns
+
+
+def test_metric_cube_matches_grouped_trade_metrics_for_every_grouping_set():
+    rng = np.random.default_rng(5)
+    size = 400
+    trades = pd.DataFrame(
+        {
+            "quality_tier": rng.choice(["A", "B", "C", None], size),
+            "holding_window": rng.choice([5, 10, 20], size),
+            "exit_reason": rng.choice(["Time Exit", "stop_hit"], size),
+            "fast_slope_up": rng.choice([True, False], size),
+            "vol_bucket": rng.choice(["low", "high"], size),
+            "net_return_pct": np.where(rng.random(size) < 0.05, np.nan, rng.normal(0.5, 3.0, size)),
+        }
+    )
+    grouping_sets = analyst_grouping_sets(trades, FEATURE_COLUMNS)
+    assert ("quality_tier", "exit_reason", "holding_window") in grouping_sets
+
+    cube = build_metric_cube(trades, grouping_sets, return_column="net_return_pct")
+
+    assert set(cube) == set(grouping_sets)
+    for columns in grouping_sets:
+        expected = grouped_trade_metrics(trades, list(columns), return_column="net_return_pct")
+        actual = cube[columns]
+        assert list(actual.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(
+            actual.sort_values(list(columns)).reset_index(drop=True),
+            expected.sort_values(list(columns)).reset_index(drop=True),
+            check_dtype=False,
+        )
+
+
+def test_render_analyst_insights_reads_tables_from_a_supplied_cube(monkeypatch):
+    from app.insights import analyst as analyst_module
+
+    trades = _sample_trades()
+    cube = analyst_module.build_analyst_cube(trades, return_column="net_return_pct")
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("tables should come from the cube")
+
+    monkeypatch.setattr(analyst_module, "grouped_trade_metrics", fail)
+    monkeypatch.setattr(analyst_module, "build_metric_cube", fail)
+    st = DummyStreamlitInsights()
+
+    analyst_module.render_analyst_insights(trades, st_module=st, analyst_mode=True, cube=cube)
+
+    assert sum(1 for call in st.calls if call[0] == "dataframe") == 7
+
+
+def test_analyst_cube_adds_excursion_medians_when_trades_carry_them():
+    from app.insights.analyst import build_analyst_cube
+
+    trades = _sample_trades().assign(
+        mae_pct=[-1.0, -3.0, -2.0, -0.5],
+        mfe_pct=[2.0, 0.5, 4.0, 1.0],
+        bars_to_peak=[1, 2, 3, 4],
+    )
+
+    cube = build_analyst_cube(trades, return_column="net_return_pct")
+    matrix = cube[("quality_tier", "holding_window")]
+
+    assert {"median_mae_pct", "median_mfe_pct", "median_bars_to_peak"} <= set(matrix.columns)
+    tier_a = matrix[matrix["quality_tier"] == "A"].set_index("holding_window")
+    assert tier_a.loc[10, "median_mae_pct"] == -3.0
+
+
+def test_slices_have_the_same_columns_with_and_without_a_cube():
+    from app.insights.analyst import build_analyst_cube
+
+    trades = _sample_trades().assign(
+        mae_pct=[-1.0, -3.0, -2.0, -0.5],
+        mfe_pct=[2.0, 0.5, 4.0, 1.0],
+        bars_to_peak=[1, 2, 3, 4],
+    )
+    cube = build_analyst_cube(trades, return_column="net_return_pct")
+
+    direct = build_exit_analysis(trades, return_column="net_return_pct")
+    sliced = build_exit_analysis(trades, return_column="net_return_pct", cube=cube)
+    assert list(direct.columns) == list(sliced.columns)
+    assert "median_mae_pct" in direct.columns
+    for feature, summary in build_feature_insights(trades, return_column="net_return_pct").items():
+        assert list(summary.columns) == list(cube[(feature,)].columns)
+
+    sketched = grouped_trade_metrics(
+        trades,
+        ["quality_tier"],
+        return_column="net_return_pct",
+        quantile_backend="sketch",
+        median_columns=["mae_pct"],
+    ).set_index("quality_tier")
+    assert sketched.loc["A", "median_mae_pct"] == pytest.approx(-2.0)
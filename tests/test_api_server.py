@@ -0,0 +1,146 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.api.server import handle_request, start_server
+from app.api.state import ApiState, encode_payload
+
+
+def _state() -> ApiState:
+    dates = pd.bdate_range("2024-01-02", periods=4)
+    canonical_df = pd.DataFrame(
+        {
+            "date": list(dates) * 2,
+            "instrument": ["AAA"] * 4 + ["BBB"] * 4,
+            "close": [10.0, 10.5, 10.2, 10.8, 20.0, 19.5, 19.8, 20.4],
+        }
+    )
+    ranked_df = pd.DataFrame(
+        {
+            "instrument": ["AAA", "BBB"],
+            "best_window": [5, 10],
+            "score_total": [0.8, 0.6],
+            "tier": ["A", "B"],
+            "reasons": [["Top score at 5D window."], ["Top score at 10D window."]],
+            "warnings": [[], []],
+        }
+    )
+    analyst_df = pd.DataFrame(
+        {
+            "instrument": ["AAA", "AAA", "BBB"],
+            "entry_date": dates[:3],
+            "holding_window": [5, 10, 5],
+            "net_return_pct": [1.5, -0.4, 0.7],
+            "quality_tier": ["A", "A", "B"],
+        }
+    )
+    return ApiState(
+        canonical_df=canonical_df,
+        meta={"dataset_id": "test-dataset"},
+        ranked_df=ranked_df,
+        analyst_df=analyst_df,
+    )
+
+
+def test_rankings_route_returns_json_with_etag():
+    state = _state()
+
+    response = asyncio.run(handle_request(state, "GET", "/rankings"))
+
+    assert response.status == 200
+    assert response.etag is not None
+    payload = json.loads(response.body)
+    assert payload["dataset_id"] == "test-dataset"
+    assert [row["instrument"] for row in payload["rankings"]] == ["AAA", "BBB"]
+
+
+def test_conditional_request_with_matching_etag_returns_not_modified():
+    state = _state()
+    first = asyncio.run(handle_request(state, "GET", "/tickers"))
+
+    second = asyncio.run(handle_request(state, "GET", "/tickers", {"If-None-Match": first.etag}))
+
+    assert second.status == 304
+    assert second.body == b""
+    assert second.etag == first.etag
+
+
+def test_ticker_routes_scope_payloads_and_reject_unknown_tickers():
+    state = _state()
+
+    drilldown = asyncio.run(handle_request(state, "GET", "/tickers/aaa/drilldown"))
+    metrics = asyncio.run(handle_request(state, "GET", "/tickers/AAA/metrics?mode=analyst"))
+    missing = asyncio.run(handle_request(state, "GET", "/tickers/ZZZ/metrics"))
+    bad_mode = asyncio.run(handle_request(state, "GET", "/tickers/AAA/metrics?mode=expert"))
+
+    assert drilldown.status == 200
+    assert json.loads(drilldown.body)["holding_window_stats"].keys() == {"5D", "10D"}
+    assert json.loads(metrics.body)["stats"]["signal_count"] == 2
+    assert missing.status == 404
+    assert bad_mode.status == 400
+
+
+def test_allocation_route_validates_capital_and_rebuilds_plan():
+    state = _state()
+
+    response = asyncio.run(handle_request(state, "GET", "/allocation?capital=50000"))
+    invalid = asyncio.run(handle_request(state, "GET", "/allocation?capital=lots"))
+    post = asyncio.run(handle_request(state, "POST", "/allocation"))
+
+    payload = json.loads(response.body)
+    assert response.status == 200
+    assert payload["capital"] == 50000.0
+    assert len(payload["allocations"]) == 2
+    assert invalid.status == 400
+    assert post.status == 405
+
+
+def test_allocation_route_rejects_non_finite_capital():
+    state = _state()
+
+    for capital in ("nan", "inf", "-inf", "Infinity"):
+        response = asyncio.run(handle_request(state, "GET", f"/allocation?capital={capital}"))
+        assert response.status == 400
+        assert "finite" in json.loads(response.body)["error"]
+
+
+def test_encode_payload_replaces_non_finite_numbers_and_timestamps():
+    payload = encode_payload({"value": float("nan"), "when": pd.Timestamp("2024-01-02"), "missing": pd.NaT})
+
+    assert json.loads(payload.body) == {"value": None, "when": "2024-01-02T00:00:00", "missing": None}
+
+
+def test_server_answers_keep_alive_requests_over_tcp():
+    state = _state()
+
+    async def exercise() -> list[bytes]:
+        server = await start_server(state, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        status_lines = []
+        for _ in range(2):
+            writer.write(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            await writer.drain()
+            status_lines.append(await reader.readline())
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line == b"\r\n":
+                    break
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            await reader.readexactly(int(headers["content-length"]))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return status_lines
+
+    status_lines = asyncio.run(exercise())
+
+    assert status_lines == [b"HTTP/1.1 200 OK\r\n", b"HTTP/1.1 200 OK\r\n"]
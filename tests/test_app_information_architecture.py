@@ -42,9 +42,10 @@ class DummyExpander:
 
 
 class DummyTab:
-    def __init__(self, st_module, name):
+    def __init__(self, st_module, name, open=None):
         self._st = st_module
         self._name = name
+        self.open = open
 
     def __enter__(self):
         self._st.current_tab = self._name
@@ -86,6 +87,8 @@ class DummyStreamlit:
         self.expanders = []
         self.rerun_called = False
         self.selectbox_choice = None
+        self.open_tab = None
+        self.fragments = {}
 
     def set_page_config(self, **_kwargs):
         return None
@@ -104,6 +107,16 @@ class DummyStreamlit:
 
         return decorator
 
+    def cache_resource(self, **_kwargs):
+        def decorator(func):
+            return func
+
+        return decorator
+
+    def fragment(self, func):
+        self.fragments[func.__name__] = func
+        return func
+
     def markdown(self, text, **_kwargs):
         self.markdowns.append((self.current_tab, text))
 
@@ -130,7 +143,9 @@ class DummyStreamlit:
 
     def tabs(self, names, **_kwargs):
         self.tabs_requested.append(list(names))
-        return [DummyTab(self, name) for name in names]
+        if self.open_tab is None:
+            return [DummyTab(self, name) for name in names]
+        return [DummyTab(self, name, open=name == self.open_tab) for name in names]
 
     def dataframe(self, df, **_kwargs):
         self.dataframes.append((self.current_tab, df.copy()))
@@ -258,6 +273,125 @@ def test_guided_view_hides_analyst_insights_tab(monkeypatch):
     assert not any(tab == "Analyst Insights" for tab, _ in dummy_st.info_messages)
 
 
+def test_data_tab_first_paint_skips_pipeline_artifacts(monkeypatch):
+    app_main = _load_app_module()
+    dummy_st = DummyStreamlit(mode_choice="Guided View")
+    dummy_st.open_tab = "Data"
+    canonical_df = pd.DataFrame({"instrument": ["AAA"], "date": pd.to_datetime(["2024-01-01"]), "close": [10.0]})
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("Data tab should not build pipeline artifacts")
+
+    monkeypatch.setitem(sys.modules, "streamlit", dummy_st)
+    monkeypatch.setattr(
+        app_main,
+        "ingest_dataset",
+        lambda _dataset: (canonical_df, {"source": "demo", "dataset_id": "demo-v1"}, {"errors": [], "warnings": []}),
+    )
+    monkeypatch.setattr(app_main, "run_demo", fail)
+    monkeypatch.setattr(app_main, "build_analyst_dataset", fail)
+
+    app_main.main()
+
+    assert ("Data", "### Data") in dummy_st.markdowns
+    assert not any(tab == "Portfolio" for tab, _ in dummy_st.markdowns)
+
+
+def test_analyst_data_tab_first_paint_skips_ranked_diagnostics(monkeypatch):
+    app_main = _load_app_module()
+    dummy_st = DummyStreamlit(mode_choice="Advanced View")
+    dummy_st.open_tab = "Data"
+    canonical_df = pd.DataFrame({"instrument": ["AAA"], "date": pd.to_datetime(["2024-01-01"]), "close": [10.0]})
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("Data tab should not build pipeline artifacts")
+
+    monkeypatch.setitem(sys.modules, "streamlit", dummy_st)
+    monkeypatch.setattr(
+        app_main,
+        "ingest_dataset",
+        lambda _dataset: (canonical_df, {"source": "demo", "dataset_id": "demo-v1"}, {"errors": [], "warnings": []}),
+    )
+    monkeypatch.setattr(app_main, "run_demo", fail)
+    monkeypatch.setattr(app_main, "build_analyst_dataset", fail)
+
+    app_main.main()
+
+    diagnostics = [df for tab, df in dummy_st.dataframes if tab == "Data" and "Stage" in df.columns]
+    assert [df["Stage"].tolist() for df in diagnostics] == [["canonical"]]
+    assert any(tab == "Data" and "Ranked diagnostics appear here" in text for tab, text in dummy_st.captions)
+
+
+def test_portfolio_tab_first_paint_skips_analyst_dataset(monkeypatch):
+    app_main = _load_app_module()
+    dummy_st = DummyStreamlit(mode_choice="Advanced View")
+    dummy_st.open_tab = "Portfolio"
+    canonical_df = pd.DataFrame({"instrument": ["AAA"], "date": pd.to_datetime(["2024-01-01"]), "close": [10.0]})
+    ranked_df = pd.DataFrame({"instrument": ["AAA"], "selection_rank": [1], "tier": ["A"]})
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("Portfolio tab should not build the analyst dataset")
+
+    monkeypatch.setitem(sys.modules, "streamlit", dummy_st)
+    monkeypatch.setattr(
+        app_main,
+        "ingest_dataset",
+        lambda _dataset: (canonical_df, {"source": "demo", "dataset_id": "demo-v1"}, {"errors": [], "warnings": []}),
+    )
+    monkeypatch.setattr(app_main, "run_demo", lambda: {"ranked": ranked_df})
+    monkeypatch.setattr(app_main, "build_analyst_dataset", fail)
+    monkeypatch.setattr(app_main, "coerce_trade_rows_from_ranked", lambda _ranked: [{"instrument": "AAA"}])
+    monkeypatch.setattr(app_main, "generate_portfolio_allocation", lambda _rows, _capital: {"allocations": [{"allocation_amount": 5000, "allocation_pct": 0.05}]})
+    monkeypatch.setattr(app_main, "render_portfolio_plan", lambda *_args, **_kwargs: None)
+
+    app_main.main()
+
+    assert ("Portfolio", "### Portfolio") in dummy_st.markdowns
+    assert not any(tab == "Ticker Analysis" for tab, _ in dummy_st.markdowns)
+
+
+def test_capital_change_reruns_only_the_portfolio_fragment(monkeypatch):
+    app_main = _load_app_module()
+    dummy_st = DummyStreamlit(mode_choice="Advanced View")
+    dummy_st.open_tab = "Portfolio"
+    canonical_df = pd.DataFrame({"instrument": ["AAA"], "date": pd.to_datetime(["2024-01-01"]), "close": [10.0]})
+    ranked_df = pd.DataFrame({"instrument": ["AAA"], "selection_rank": [1], "tier": ["A"]})
+    calls = {"run_demo": 0, "trade_rows": 0}
+    planned_capital = []
+
+    def counting_run_demo():
+        calls["run_demo"] += 1
+        return {"ranked": ranked_df}
+
+    def counting_trade_rows(_ranked):
+        calls["trade_rows"] += 1
+        return [{"instrument": "AAA"}]
+
+    def fake_allocation(_rows, capital):
+        planned_capital.append(capital)
+        return {"allocations": [{"allocation_amount": capital * 0.05, "allocation_pct": 0.05}]}
+
+    monkeypatch.setitem(sys.modules, "streamlit", dummy_st)
+    monkeypatch.setattr(
+        app_main,
+        "ingest_dataset",
+        lambda _dataset: (canonical_df, {"source": "demo", "dataset_id": "demo-v1"}, {"errors": [], "warnings": []}),
+    )
+    monkeypatch.setattr(app_main, "run_demo", counting_run_demo)
+    monkeypatch.setattr(app_main, "coerce_trade_rows_from_ranked", counting_trade_rows)
+    monkeypatch.setattr(app_main, "generate_portfolio_allocation", fake_allocation)
+    monkeypatch.setattr(app_main, "render_portfolio_plan", lambda *_args, **_kwargs: None)
+
+    app_main.main()
+    assert {"_render_portfolio_tab", "_render_ticker_analysis_tab"} <= set(dummy_st.fragments)
+
+    dummy_st.session_state["total_capital"] = 250_000.0
+    dummy_st.fragments["_render_portfolio_tab"]()
+
+    assert calls == {"run_demo": 1, "trade_rows": 1}
+    assert planned_capital == [100_000.0, 250_000.0]
+
+
 def test_analyst_mode_keeps_all_tabs_visible(monkeypatch):
     app_main = _load_app_module()
     dummy_st = DummyStreamlit(mode_choice="Advanced View")
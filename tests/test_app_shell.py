@@ -7,7 +7,9 @@ import pandas as pd
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
-from app.shell import build_analyst_dataset, coerce_trade_rows_from_ranked
+from app.costs.exits import DEFAULT_EXIT_POLICIES, select_exit_policy
+from app.data.profile import profile_dataset
+from app.shell import LazyArtifacts, build_analyst_dataset, coerce_trade_rows_from_ranked
 
 
 def test_build_analyst_dataset_returns_return_bearing_trades_with_quality_tier(monkeypatch):
@@ -29,14 +31,15 @@ def test_build_analyst_dataset_returns_return_bearing_trades_with_quality_tier(m
         }
     )
 
-    def fake_run_cost_engine(df_prices, df_entries):
+    def fake_run_cost_engine(df_prices, df_entries, exit_policies):
         assert not df_prices.empty
         assert not df_entries.empty
+        assert exit_policies == DEFAULT_EXIT_POLICIES
         return trades_stub, pd.DataFrame(), None, None
 
     monkeypatch.setattr("app.shell.run_cost_engine", fake_run_cost_engine)
 
-    analyst_df = build_analyst_dataset(canonical_df, ranked_df)
+    analyst_df = build_analyst_dataset(canonical_df, ranked_df, entry_rule=None)
 
     assert "net_return_pct" in analyst_df.columns
     assert "quality_tier" in analyst_df.columns
@@ -63,7 +66,7 @@ def test_build_analyst_dataset_handles_empty_ranked_df(monkeypatch):
 
     monkeypatch.setattr(
         "app.shell.run_cost_engine",
-        lambda df_prices, df_entries: (trades_stub, pd.DataFrame(), None, None),
+        lambda df_prices, df_entries, exit_policies: (trades_stub, pd.DataFrame(), None, None),
     )
 
     analyst_df = build_analyst_dataset(canonical_df, pd.DataFrame())
@@ -92,7 +95,7 @@ def test_build_analyst_dataset_does_not_filter_to_ranked_subset(monkeypatch):
 
     monkeypatch.setattr(
         "app.shell.run_cost_engine",
-        lambda df_prices, df_entries: (trades_stub, pd.DataFrame(), None, None),
+        lambda df_prices, df_entries, exit_policies: (trades_stub, pd.DataFrame(), None, None),
     )
 
     analyst_df = build_analyst_dataset(canonical_df, ranked_df)
@@ -209,6 +212,32 @@ def test_dataset_period_description_uses_date_range_when_available():
     )
 
 
+def test_app_shell_helpers_read_the_dataset_profile():
+    spec = importlib.util.spec_from_file_location("app_main", ROOT / "app.py")
+    app_main = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(app_main)
+
+    df = pd.DataFrame(
+        {
+            "instrument": ["CCC", "AAA", " BBB ", "AAA", "CARXD"],
+            "date": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-03", "2024-02-01"]),
+            "close": [1.0, 2.0, 3.0, 4.0, 5.0],
+        }
+    )
+    profile = profile_dataset(df)
+    # An empty frame proves the helpers answer from the profile alone.
+    empty = df.iloc[0:0]
+
+    assert app_main._extract_ticker_options(empty, profile) == app_main._extract_ticker_options(df)
+    assert app_main._extract_unique_ticker_count(empty, profile) == app_main._extract_unique_ticker_count(df) == 4
+    assert app_main._extract_ticker_preview(empty, profile=profile) == ["CCC", "AAA", "BBB", "CARXD"]
+    assert app_main._resolve_dataset_period_description(empty, profile) == (
+        "Using historical JSE data from 2024-01-01 to 2024-02-01 in the current dataset."
+    )
+    assert app_main._resolve_latest_market_data_label(empty, profile) == "2024-02-01"
+
+
 def test_app_no_long_hard_coded_data_period_copy():
     source = (ROOT / "app.py").read_text()
     assert "since 2018 where available" not in source
@@ -274,3 +303,85 @@ def test_trade_readiness_signal_timing_unavailable_when_no_parseable_dates():
     )
 
     assert "Signal timing: Signal date unavailable" in lines
+
+
+def test_lazy_artifacts_build_dependencies_once_on_first_access():
+    artifacts = LazyArtifacts()
+    calls = []
+    artifacts.register("ranked", lambda: calls.append("ranked") or ["AAA"])
+    artifacts.register("analyst", lambda: calls.append("analyst") or artifacts["ranked"] + ["trades"])
+
+    assert calls == []
+    assert artifacts["analyst"] == ["AAA", "trades"]
+    assert artifacts["analyst"] == ["AAA", "trades"]
+    assert calls == ["analyst", "ranked"]
+    assert artifacts.computed == ["ranked", "analyst"]
+    assert not artifacts.is_computed("missing")
+
+
+def test_build_analyst_dataset_uses_run_demo_earnings_tagged_entries(monkeypatch, tmp_path):
+    from app.costs.compact import materialize_trade_dates
+    from app.costs.engine import run_cost_engine
+    from app.data.panel import cached_price_panel
+    from app.data.ingest import ingest_dataset
+    from app.demo import run_demo as run_demo_module
+    from app.signals.rules import build_entries
+
+    canonical, meta, _ = ingest_dataset("demo")
+    instruments = canonical["instrument"].drop_duplicates().head(30)
+    events = pd.DataFrame(
+        {
+            "instrument": instruments.repeat(2).to_numpy(),
+            "earnings_date": ["2024-03-15", "2024-09-16"] * len(instruments),
+            "confidence": "confirmed",
+        }
+    )
+    events_path = tmp_path / "earnings_events.csv"
+    events.to_csv(events_path, index=False)
+    monkeypatch.setattr(run_demo_module, "DEMO_EVENTS_PATH", events_path)
+
+    tagged_entries = run_demo_module.build_demo_entries(canonical, meta=meta)
+    # post_earnings_drift only fires on tagged prices.
+    assert len(tagged_entries) > len(build_entries(canonical))
+
+    # The trade set run_demo ranks: the same entries on the dataset's price panel.
+    demo_trades, _, _, _ = run_cost_engine(cached_price_panel(canonical, meta), tagged_entries)
+    analyst = select_exit_policy(materialize_trade_dates(build_analyst_dataset(canonical, pd.DataFrame())))
+    trade_keys = ["instrument", "entry_date", "holding_window"]
+    expected = demo_trades[trade_keys].astype({"instrument": "str"}).reset_index(drop=True)
+    actual = analyst[trade_keys].astype({"instrument": "str"}).reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_build_analyst_dataset_simulates_the_default_exit_policies():
+    from app.data.ingest import ingest_dataset
+    from app.insights.analyst import build_analyst_cube, build_exit_analysis, build_performance_matrix
+
+    canonical, _, _ = ingest_dataset("demo")
+    canonical = canonical[canonical["instrument"].isin(canonical["instrument"].drop_duplicates().head(10))]
+    ranked = pd.DataFrame({"instrument": canonical["instrument"].unique(), "tier": "B"})
+
+    analyst = build_analyst_dataset(canonical, ranked)
+    policy_names = [policy.name for policy in DEFAULT_EXIT_POLICIES]
+    assert sorted(analyst["exit_policy"].unique()) == sorted(policy_names)
+    counts = analyst["exit_policy"].value_counts()
+    assert counts.nunique() == 1
+    assert len(select_exit_policy(analyst)) == counts["time"]
+
+    # Exit analysis now sees stop, target and trailing exits, one summary per policy.
+    exits = build_exit_analysis(analyst, return_column="net_return_pct")
+    assert set(exits["exit_policy"]) == set(policy_names)
+    assert set(exits.loc[exits["exit_policy"] == "time", "exit_reason"]) == {"Time Exit"}
+    assert {"Stop Loss", "Take Profit", "Trailing Stop"} <= set(exits["exit_reason"])
+
+    cube = build_analyst_cube(analyst, return_column="net_return_pct")
+    keys = ["exit_policy", "quality_tier", "exit_reason", "holding_window"]
+    from_cube = build_exit_analysis(analyst, return_column="net_return_pct", cube=cube)
+    pd.testing.assert_frame_equal(
+        from_cube.sort_values(keys, ignore_index=True),
+        exits.sort_values(keys, ignore_index=True),
+        check_dtype=False,
+        check_categorical=False,
+    )
+    matrix = build_performance_matrix(analyst, return_column="net_return_pct", cube=cube)
+    assert matrix["win_rate_matrix"].index.names == ["exit_policy", "quality_tier"]
@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.analysis.bootstrap import (
+    INTERVAL_COLUMNS,
+    bootstrap_intervals,
+    format_interval_lines,
+    interval_table,
+    intervals_by_ticker,
+)
+
+
+def _trades() -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    frames = []
+    for instrument, drift, count in (("AAA", 1.0, 24), ("BBB", -0.5, 24), ("CCC", 0.2, 9)):
+        frames.append(
+            pd.DataFrame(
+                {
+                    "instrument": instrument,
+                    "holding_window": np.tile([5, 20], count // 2 + 1)[:count],
+                    "net_return_pct": rng.normal(drift, 2.0, size=count),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_bootstrap_intervals_cover_point_estimates_per_ticker_and_window():
+    trades = _trades()
+
+    intervals = bootstrap_intervals(trades, n_resamples=400)
+
+    assert list(intervals.columns) == INTERVAL_COLUMNS
+    overall = intervals[intervals["holding_window"].isna()].set_index("instrument")
+    assert overall.loc["AAA", "n"] == 24
+    assert np.isclose(overall.loc["AAA", "median_return"], trades.loc[trades["instrument"] == "AAA", "net_return_pct"].median())
+    for stat in ("win_rate", "median_return", "avg_return"):
+        assert (intervals[f"{stat}_low"] <= intervals[stat] + 1e-12).all()
+        assert (intervals[f"{stat}_high"] >= intervals[stat] - 1e-12).all()
+    windowed = intervals.dropna(subset=["holding_window"])
+    assert set(zip(windowed["instrument"], windowed["holding_window"])) == {
+        (name, window) for name in ("AAA", "BBB", "CCC") for window in (5, 20)
+    }
+
+
+def test_bootstrap_intervals_are_deterministic_across_worker_counts():
+    trades = _trades()
+
+    serial = bootstrap_intervals(trades, n_resamples=200, seed=3)
+    pooled = bootstrap_intervals(trades, n_resamples=200, seed=3, workers=2)
+
+    pd.testing.assert_frame_equal(serial, pooled)
+
+
+def test_interval_lookup_formats_lines_and_window_table():
+    lookup = intervals_by_ticker(bootstrap_intervals(_trades(), n_resamples=200))
+
+    lines = format_interval_lines(lookup["AAA"])
+    table = interval_table(lookup["AAA"])
+
+    assert lines[0].startswith("Win rate likely between") and "24 signals" in lines[0]
+    assert table["holding_window"].tolist() == ["5D", "20D"]
+    assert format_interval_lines(lookup.get("ZZZ")) == []
+    assert bootstrap_intervals(pd.DataFrame({"instrument": []})).empty
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.costs.compact import compact_trade_table, materialize_trade_dates, trade_table_nbytes
+from app.costs.engine import run_cost_engine
+
+
+def _wide_trades() -> pd.DataFrame:
+    dates = pd.bdate_range("2024-01-02", periods=120)
+    rng = np.random.default_rng(11)
+    frames = []
+    for idx in range(12):
+        closes = 50 * np.cumprod(1 + rng.normal(0, 0.01, size=len(dates)))
+        frames.append(pd.DataFrame({"date": dates, "instrument": f"TICK{idx:02d}", "close": closes}))
+    prices = pd.concat(frames, ignore_index=True)
+    entries = prices[["instrument", "date"]].rename(columns={"date": "entry_date"})
+    trades, _, _, _ = run_cost_engine(prices, entries)
+    trades["quality_tier"] = np.where(trades["instrument"] < "TICK06", "A", "B")
+    return trades
+
+
+def test_compact_layout_uses_narrow_dtypes_and_scalar_cost_drag():
+    wide = _wide_trades()
+
+    compact = compact_trade_table(wide)
+
+    assert isinstance(compact["instrument"].dtype, pd.CategoricalDtype)
+    assert isinstance(compact["exit_reason"].dtype, pd.CategoricalDtype)
+    assert isinstance(compact["quality_tier"].dtype, pd.CategoricalDtype)
+    assert compact["holding_window"].dtype == np.int8
+    assert compact["net_return_pct"].dtype == np.float32
+    assert compact["entry_pos"].dtype == np.int32
+    assert {"entry_date", "exit_date", "cost_drag_pct"}.isdisjoint(compact.columns)
+    assert compact.attrs["cost_drag_pct"] == wide["cost_drag_pct"].iat[0]
+
+
+def test_compact_layout_is_at_least_three_times_smaller():
+    wide = _wide_trades()
+
+    compact = compact_trade_table(wide)
+
+    assert trade_table_nbytes(wide) >= 3 * trade_table_nbytes(compact)
+
+
+def test_materialize_restores_dates_and_cost_drag():
+    wide = _wide_trades()
+
+    restored = materialize_trade_dates(compact_trade_table(wide))
+
+    pd.testing.assert_series_equal(restored["entry_date"], wide["entry_date"], check_dtype=False)
+    pd.testing.assert_series_equal(restored["exit_date"], wide["exit_date"], check_dtype=False)
+    np.testing.assert_allclose(restored["net_return_pct"], wide["net_return_pct"], rtol=1e-6)
+    assert (restored["cost_drag_pct"] == wide["cost_drag_pct"].iat[0]).all()
+    assert restored.attrs == {}
+
+
+def test_materialize_widens_floats_without_float32_noise():
+    partial = pd.DataFrame({"instrument": ["AAA", "BBB"], "net_return_pct": [1.23, np.nan], "entry_price": [10.07, 2.5]})
+
+    restored = materialize_trade_dates(compact_trade_table(partial))
+
+    assert restored["net_return_pct"].dtype == np.float64
+    assert restored["net_return_pct"].iat[0] == 1.23
+    assert np.isnan(restored["net_return_pct"].iat[1])
+    assert restored["entry_price"].tolist() == [10.07, 2.5]
+
+
+def test_compact_layout_passes_partial_tables_through():
+    partial = pd.DataFrame({"instrument": ["AAA"], "holding_window": [10], "net_return_pct": [0.5]})
+
+    compact = compact_trade_table(partial)
+
+    assert materialize_trade_dates(compact).equals(compact.astype({"net_return_pct": np.float64}))
+    assert list(compact["instrument"]) == ["AAA"]
@@ -1,13 +1,15 @@
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
 from app.costs.config import resolve_cost_config
-from app.costs.engine import run_cost_engine
+from app.costs.engine import run_cost_engine, run_horizon_surface
+from app.costs.exits import ExitPolicy
 
 
 def test_default_profile_round_trip_cost_rate():
@@ -120,3 +122,127 @@ def test_zero_entry_price_is_skipped_to_avoid_invalid_returns():
     assert trades.empty
     assert summary_instrument.empty
     assert summary_overall.empty
+
+
+def _policy_trades(closes, policies, holding_windows=(5,)):
+    dates = pd.date_range("2024-01-01", periods=len(closes), freq="D")
+    df_prices = pd.DataFrame({"date": dates, "instrument": ["AAA"] * len(closes), "close": closes})
+    df_entries = pd.DataFrame({"instrument": ["AAA"], "entry_date": [dates[0]]})
+    trades, summary_instrument, _, _ = run_cost_engine(
+        df_prices,
+        df_entries,
+        holding_windows=list(holding_windows),
+        override_enabled=True,
+        broker_fee=0.0,
+        cess=0.0,
+        exit_policies=policies,
+    )
+    return dates, trades.set_index("exit_policy"), summary_instrument
+
+
+def test_exit_policies_exit_on_first_breaching_bar():
+    policies = [
+        ExitPolicy(),
+        ExitPolicy("stop", stop_loss=0.05),
+        ExitPolicy("target", take_profit=0.08),
+        ExitPolicy("trail", trailing_stop=0.06),
+    ]
+    dates, trades, summary = _policy_trades([100, 104, 110, 103, 94, 120], policies)
+
+    assert trades.loc["time", "exit_reason"] == "Time Exit"
+    assert trades.loc["time", "exit_date"] == dates[5]
+    assert trades.loc["stop", "exit_reason"] == "Stop Loss"
+    assert trades.loc["stop", "exit_date"] == dates[4]
+    assert trades.loc["target", "exit_reason"] == "Take Profit"
+    assert round(trades.loc["target", "gross_return_pct"], 6) == 10.0
+    # 103 is more than 6% below the 110 peak.
+    assert trades.loc["trail", "exit_reason"] == "Trailing Stop"
+    assert trades.loc["trail", "exit_date"] == dates[3]
+    assert sorted(summary["exit_policy"]) == ["stop", "target", "time", "trail"]
+
+
+def test_stop_wins_when_stop_and_trailing_trip_on_the_same_bar():
+    _, trades, _ = _policy_trades([100, 101, 90, 95, 96, 97], [ExitPolicy("both", stop_loss=0.05, trailing_stop=0.05)])
+
+    assert trades.loc["both", "exit_reason"] == "Stop Loss"
+
+
+def test_exit_paths_never_cross_into_the_next_instrument():
+    dates = pd.date_range("2024-01-01", periods=4, freq="D")
+    df_prices = pd.DataFrame(
+        {
+            "date": list(dates) * 2,
+            "instrument": ["AAA"] * 4 + ["BBB"] * 4,
+            "close": [100, 101, 102, 103, 1, 1, 1, 1],
+        }
+    )
+    df_entries = pd.DataFrame({"instrument": ["AAA", "AAA"], "entry_date": [dates[0], dates[1]]})
+
+    trades, _, _, _ = run_cost_engine(
+        df_prices,
+        df_entries,
+        holding_windows=[3],
+        override_enabled=True,
+        broker_fee=0.0,
+        cess=0.0,
+        exit_policies=[ExitPolicy("stop", stop_loss=0.5)],
+    )
+
+    assert len(trades) == 1
+    assert trades.iloc[0]["exit_reason"] == "Time Exit"
+    assert trades.iloc[0]["exit_price"] == 103
+
+
+def test_trades_record_excursions_over_the_held_path():
+    policies = [ExitPolicy(), ExitPolicy("stop", stop_loss=0.05)]
+    _, trades, _ = _policy_trades([100, 104, 110, 103, 94, 120], policies)
+
+    time_exit = trades.loc["time"]
+    assert round(time_exit["mae_pct"], 6) == -6.0
+    assert round(time_exit["mfe_pct"], 6) == 20.0
+    assert time_exit["bars_to_peak"] == 5
+    # The stop exits on bar 4, so the later 120 close is never seen.
+    stopped = trades.loc["stop"]
+    assert round(stopped["mfe_pct"], 6) == 10.0
+    assert stopped["bars_to_peak"] == 2
+
+
+def test_excursions_are_zero_floored_when_price_never_moves_against_entry():
+    _, trades, _ = _policy_trades([100, 101, 102, 103, 104, 105], [ExitPolicy()])
+
+    assert trades.loc["time", "mae_pct"] == 0.0
+    assert trades.loc["time", "bars_to_peak"] == 5
+
+
+def test_horizon_surface_matches_fixed_window_trades():
+    dates = pd.date_range("2024-01-01", periods=12, freq="D")
+    df_prices = pd.DataFrame(
+        {
+            "date": list(dates) * 2,
+            "instrument": ["AAA"] * 12 + ["BBB"] * 12,
+            "close": [100, 102, 99, 104, 107, 103, 110, 108, 111, 115, 112, 118]
+            + [50, 49, 48, 51, 52, 50, 47, 49, 53, 55, 54, 56],
+        }
+    )
+    df_entries = pd.DataFrame(
+        {"instrument": ["AAA", "AAA", "BBB", "BBB"], "entry_date": [dates[0], dates[4], dates[1], dates[9]]}
+    )
+    costs = {"override_enabled": True, "broker_fee": 0.001, "cess": 0.0}
+
+    trades, summary, _, _ = run_cost_engine(df_prices, df_entries, holding_windows=[2, 5], **costs)
+    surface, surface_summary, _ = run_horizon_surface(df_prices, df_entries, max_horizon=8, **costs)
+
+    assert surface.net_returns.shape == (4, 8)
+    assert surface.net_returns.dtype == np.float32
+    for window in (2, 5):
+        expected = trades[trades["holding_window"] == window]["net_return_pct"].to_numpy()
+        column = surface.net_returns[:, window - 1]
+        np.testing.assert_allclose(column[~np.isnan(column)], expected, rtol=1e-5)
+    # BBB entered on the tenth bar has two bars left.
+    assert np.isnan(surface.net_returns[3, 2:]).all()
+
+    merged = summary.merge(surface_summary, on=["instrument", "holding_window"], suffixes=("", "_surface"))
+    assert len(merged) == len(summary)
+    for column in ("n_trades", "win_rate_net", "median_net_return", "hit_rate_above_cost"):
+        np.testing.assert_allclose(merged[column], merged[f"{column}_surface"], rtol=1e-5)
+    assert surface_summary.groupby("instrument")["holding_window"].max().to_dict() == {"AAA": 8, "BBB": 8}
@@ -1,7 +1,10 @@
 import errno
+import functools
 import sys
+import tracemalloc
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -9,6 +12,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
 from app.costs.engine import run_cost_engine
+from app.data.ingest import ingest_dataset
 from app.data.metadata import build_metadata
 from app.data.normalize import normalize_data
 from app.data.validate import validate_canonical
@@ -16,6 +20,7 @@ from app.demo.generate_prices import generate_demo_prices
 from app.events.earnings import tag_earnings_phase
 from app.events.phase_metrics import compute_phase_metrics
 from app.ranking.engine import rank_instruments
+from app.ranking.scoring import compute_components
 from app.demo import run_demo as run_demo_module
 
 
@@ -114,3 +119,141 @@ def test_run_demo_works_when_legacy_events_file_is_missing(monkeypatch):
     assert not result["ranked"].empty
     assert not result["phase_metrics"].empty
     assert set(result["phase_metrics"]["earnings_phase"].unique()) == {"non"}
+
+
+def test_run_demo_ranks_from_the_horizon_surface_when_asked(monkeypatch):
+    canonical, meta, issues = ingest_dataset("demo")
+    ranked_windows = []
+    rank = run_demo_module.rank_instruments
+
+    def recording_rank(summary, *args, **kwargs):
+        ranked_windows.append(set(summary["holding_window"]))
+        return rank(summary, *args, **kwargs)
+
+    monkeypatch.setattr(run_demo_module, "rank_instruments", recording_rank)
+    standard = run_demo_module.run_demo(canonical_df=canonical, meta=meta, issues=issues)
+    surface = run_demo_module.run_demo(canonical_df=canonical, meta=meta, issues=issues, max_horizon=12)
+
+    assert ranked_windows == [{5, 10, 20, 30}, set(range(1, 13))]
+    assert set(surface["ranked"]["best_window"]) <= set(range(1, 13))
+    # Short horizons fit histories too short for the standard windows.
+    assert set(surface["ranked"]["instrument"]) >= set(standard["ranked"]["instrument"])
+    pd.testing.assert_frame_equal(surface["trades"], standard["trades"])
+
+
+def test_pipeline_stages_share_input_columns_instead_of_copying():
+    trades = pd.DataFrame(
+        {
+            "instrument": ["AAA", "AAA", "BBB"],
+            "entry_date": pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-02"]),
+            "net_return_pct": [1.0, -0.5, 2.0],
+            "earnings_phase": ["pre", "non", "post"],
+        }
+    )
+    events = pd.DataFrame(columns=["instrument", "earnings_date", "confidence"])
+
+    tagged = tag_earnings_phase(trades, events, date_col="entry_date", inst_col="instrument")
+    assert np.shares_memory(tagged["net_return_pct"].to_numpy(), trades["net_return_pct"].to_numpy())
+    assert "earnings_day_offset" not in trades.columns
+
+    summary = pd.DataFrame(
+        {
+            "instrument": ["AAA", "BBB"],
+            "holding_window": [5, 10],
+            "n_trades": [10, 20],
+            "win_rate_net": [0.5, 0.6],
+            "median_net_return": [0.1, 0.2],
+            "hit_rate_above_cost": [0.4, 0.5],
+        }
+    )
+    scored, _ = compute_components(summary, 1.0)
+    assert np.shares_memory(scored["median_net_return"].to_numpy(), summary["median_net_return"].to_numpy())
+    assert "R" not in summary.columns
+
+
+def _traced_peak(run) -> int:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+
+# Peak allocation of each run_demo stage on the demo dataset, in copies of
+# the canonical frame: the measured copy-on-write peak plus a margin well
+# under the stage's own input, so a defensive copy of it breaks the budget.
+_STAGE_BUDGETS = {
+    "build_entries": 0.72,
+    "run_cost_engine": 0.90,
+    "tag_earnings_phase": 0.09,
+    "rank_instruments": 0.04,
+    "compute_phase_metrics": 0.09,
+}
+
+
+def _stage_peaks(monkeypatch, run, copy_bytes: int, copy_into: str | None = None) -> dict[str, float]:
+    peaks: dict[str, float] = {}
+
+    def probe(name, stage):
+        @functools.wraps(stage)
+        def probed(*args, **kwargs):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            if name == copy_into:
+                # As if the stage deep-copied its input frames on entry.
+                args = [value.copy() if isinstance(value, pd.DataFrame) else value for value in args]
+                kwargs = {key: value.copy() if isinstance(value, pd.DataFrame) else value for key, value in kwargs.items()}
+            try:
+                return stage(*args, **kwargs)
+            finally:
+                _, peak = tracemalloc.get_traced_memory()
+                peaks[name] = max(peaks.get(name, 0.0), (peak - current) / copy_bytes)
+
+        return probed
+
+    with monkeypatch.context() as patch:
+        for name in _STAGE_BUDGETS:
+            patch.setattr(run_demo_module, name, probe(name, getattr(run_demo_module, name)))
+        tracemalloc.start()
+        try:
+            run()
+        finally:
+            tracemalloc.stop()
+    return peaks
+
+
+def _over_budget(peaks: dict[str, float]) -> dict[str, float]:
+    return {name: peak for name, peak in peaks.items() if peak > _STAGE_BUDGETS[name]}
+
+
+@pytest.fixture(scope="module")
+def demo_run():
+    canonical, meta, issues = ingest_dataset("demo")
+
+    def run() -> None:
+        run_demo_module.run_demo(canonical_df=canonical, meta=meta, issues=issues)
+
+    # Warm imports and per-dataset caches so only the pipeline itself is measured.
+    run()
+    return run, _traced_peak(canonical.copy)
+
+
+def test_run_demo_stages_stay_within_their_peak_memory_budgets(monkeypatch, demo_run):
+    run, copy_bytes = demo_run
+
+    peaks = _stage_peaks(monkeypatch, run, copy_bytes)
+    assert set(peaks) == set(_STAGE_BUDGETS)
+    assert _over_budget(peaks) == {}
+    # The whole run peaks at about 0.88 copies of the canonical frame.
+    assert _traced_peak(run) < 0.95 * copy_bytes
+
+
+@pytest.mark.parametrize("stage", ["build_entries", "tag_earnings_phase", "compute_phase_metrics"])
+def test_peak_memory_audit_catches_a_defensive_copy(monkeypatch, demo_run, stage):
+    run, copy_bytes = demo_run
+
+    assert stage in _over_budget(_stage_peaks(monkeypatch, run, copy_bytes, copy_into=stage))
@@ -1,6 +1,7 @@
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -11,6 +12,8 @@ from app.events.earnings import (
     PHASE_NON,
     PHASE_POST,
     PHASE_PRE,
+    EarningsEventIndex,
+    cached_event_index,
     tag_earnings_phase,
 )
 
@@ -106,3 +109,61 @@ def test_earnings_phase_tie_breaks_on_confidence():
     tagged = tag_earnings_phase(df, events_df, "date", "instrument")
     anchor_row = tagged[tagged["date"] == anchor_date].iloc[0]
     assert anchor_row["earnings_day_offset"] == -2
+
+
+def test_event_index_groups_sorted_events_per_instrument():
+    events_df = pd.DataFrame(
+        {
+            "instrument": ["BBB", "AAA", "AAA", "BBB"],
+            "earnings_date": pd.to_datetime(["2024-05-01", "2024-03-01", "2024-01-15", None]),
+            "confidence": ["confirmed", "estimated", "confirmed", "confirmed"],
+        }
+    )
+
+    index = EarningsEventIndex.from_events(events_df)
+
+    dates, codes = index.events_for("AAA")
+    assert dates.dtype == np.int64 and codes.dtype == np.int8
+    assert list(pd.to_datetime(dates)) == [pd.Timestamp("2024-01-15"), pd.Timestamp("2024-03-01")]
+    assert list(codes) == [2, 1]
+    assert len(index) == 3
+    assert index.events_for("ZZZ")[0].size == 0
+
+
+def test_prebuilt_index_matches_frame_tagging_across_instruments():
+    dates = pd.bdate_range("2024-01-02", periods=90)
+    rng = np.random.default_rng(11)
+    df = pd.concat(
+        [pd.DataFrame({"instrument": name, "date": dates, "return": 0.0}) for name in ("AAA", "BBB", "CCC")],
+        ignore_index=True,
+    )
+    events_df = pd.DataFrame(
+        {
+            "instrument": rng.choice(["AAA", "BBB"], 8),
+            "earnings_date": rng.choice(dates, 8),
+            "confidence": rng.choice(["confirmed", "estimated"], 8),
+        }
+    )
+
+    from_frame = tag_earnings_phase(df, events_df, "date", "instrument")
+    from_index = tag_earnings_phase(df, EarningsEventIndex.from_events(events_df), "date", "instrument")
+
+    assert from_frame["earnings_phase"].tolist() == from_index["earnings_phase"].tolist()
+    np.testing.assert_array_equal(from_frame["earnings_day_offset"], from_index["earnings_day_offset"])
+    assert (from_index.loc[from_index["instrument"] == "CCC", "earnings_phase"] == PHASE_NON).all()
+
+
+def test_cached_event_index_builds_once_per_fingerprint():
+    loads = []
+    events_df = pd.DataFrame({"instrument": ["AAA"], "earnings_date": ["2024-01-10"], "confidence": ["confirmed"]})
+
+    def load():
+        loads.append(1)
+        return events_df
+
+    first = cached_event_index("events-test", load, fingerprint="fp-1")
+    second = cached_event_index("events-test", load, fingerprint="fp-1")
+    cached_event_index("events-test", load, fingerprint="fp-2")
+
+    assert first is second
+    assert len(loads) == 2
@@ -1,8 +1,11 @@
+import json
+import os
 import sys
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
+import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
@@ -17,7 +20,20 @@ from app.data.loaders import (
 from app.data.normalize import detect_format, normalize_data
 from app.data.ingest import ingest_dataset
 from app.data.validate import validate_canonical
+from app.data.dates import ensure_dates, parse_dates
+from app.data.profile import DatasetProfile, profile_dataset, profile_from_meta
 from app.data.processor import normalize_jse_dataset
+from app.data.markets import filter_markets, market_token
+from app.data.partitioned_store import (
+    PARTITIONED_STORE_DIR_ENV,
+    list_partitions,
+    read_manifest,
+    read_partitioned,
+    write_partitioned,
+)
+from app.analysis.readiness_gates import compute_readiness_metrics
+from app.costs.engine import run_cost_engine
+from app.ranking.engine import rank_instruments
 
 
 def test_detect_format_long_vs_wide():
@@ -363,3 +379,212 @@ def test_normalize_data_keeps_canonical_universe_collapsed_when_raw_metadata_var
     assert set(canonical["instrument"]) == {"CAR"}
     assert canonical["raw_symbol"].nunique() == 4
     assert canonical["display_symbol"].tolist() == ["CAR", "CARXD", "CAR (XD)", "CAR XD"]
+
+
+def test_dataset_profile_matches_frame_scans_and_round_trips_through_meta():
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(
+                ["2024-01-03", "2024-01-01", "2024-01-01", "2024-01-02", None, "2024-01-05"]
+            ),
+            "instrument": ["BBB", "AAA", "AAA", "AAA", "BBB", "CCC"],
+            "close": [1.0, 2.0, 2.0, np.nan, 4.0, 5.0],
+            "volume": [10.0, np.nan, 5.0, 6.0, np.nan, np.nan],
+        }
+    )
+
+    profile = profile_dataset(df)
+
+    assert (profile.start_date, profile.end_date, profile.trading_days) == ("2024-01-01", "2024-01-05", 4)
+    assert profile.duplicate_rows == int(df.duplicated(subset=["date", "instrument"]).sum())
+    assert profile.null_counts == {"date": 1, "instrument": 0, "close": 1, "volume": 3}
+    assert list(profile.tickers) == ["BBB", "AAA", "CCC"]
+    aaa = profile.tickers["AAA"]
+    assert (aaa.first_date, aaa.last_date, aaa.observations, aaa.duplicate_rows) == ("2024-01-01", "2024-01-02", 2, 1)
+    assert profile.tickers["BBB"].observations == 1
+    assert profile.tickers["CCC"].volume_observations == 0
+
+    meta = build_metadata(df.assign(market=None, currency=None), source="demo", dataset_id="test", profile=profile)
+    restored = profile_from_meta(json.loads(json.dumps(meta)))
+    assert restored == profile
+    assert validate_canonical(df, profile) == validate_canonical(df)
+    assert profile_from_meta({}) is None
+    assert DatasetProfile.from_dict(profile.to_dict()) == profile
+
+
+def test_wide_format_repeats_headers_and_optionally_drops_empty_cells():
+    df = pd.DataFrame(
+        {
+            "Date": ["2024-01-01", "2024-01-02", "2024-01-03"],
+            " car xd ": [1.0, None, "n/a"],
+            "GK": [2.0, 3.0, 4.0],
+        }
+    )
+
+    normalized, fmt = normalize_data(df, source="upload", dataset_id="test")
+    assert fmt == "wide"
+    assert normalized["ticker"].tolist() == ["CAR"] * 3 + ["GK"] * 3
+    assert normalized["raw_symbol"].iat[0] == "CAR XD"
+    assert normalized["symbol_marker"].iat[0] == "XD"
+    assert normalized["date"].tolist() == list(pd.to_datetime(df["Date"])) * 2
+    assert normalized["close"].isna().sum() == 2
+
+    dropped, _ = normalize_data(df, source="upload", dataset_id="test", drop_missing=True)
+    # The empty cell is skipped; the unparseable one stays for validation to flag.
+    assert len(dropped) == 5
+    assert dropped["close"].isna().sum() == 1
+
+
+def test_parse_dates_matches_to_datetime_and_skips_parsed_columns():
+    raw = pd.Series(["2024-01-02", "2024-01-03", None, "bad", "2024-01-02"] * 3, name="date")
+
+    parsed = parse_dates(raw)
+    pd.testing.assert_series_equal(parsed, pd.to_datetime(raw, errors="coerce"))
+    assert parse_dates(parsed) is parsed
+
+    frame = pd.DataFrame({"date": parsed, "entry_date": raw})
+    assert ensure_dates(frame) is frame
+    converted = ensure_dates(frame, ["date", "entry_date"])
+    assert converted["entry_date"].dtype == parsed.dtype
+    assert frame["entry_date"].dtype != parsed.dtype
+
+
+def test_parsed_dates_are_judged_by_dtype():
+    df = pd.DataFrame({"date": ["2024-01-01", "2024-01-02"], "instrument": ["AAA", "AAA"], "close": [1.0, 2.0]})
+
+    normalized, _ = normalize_data(df, source="demo", dataset_id="test")
+    assert ensure_dates(normalized) is normalized
+
+    # Dates turned back into text are parsed again, whatever the frame went through.
+    as_text = normalized.assign(date=normalized["date"].dt.strftime("%Y-%m-%d"))
+    reparsed = ensure_dates(as_text)
+    assert reparsed is not as_text
+    pd.testing.assert_series_equal(reparsed["date"], normalized["date"], check_dtype=False)
+    entries = as_text[["instrument", "date"]].rename(columns={"date": "entry_date"})
+    trades, _, _, _ = run_cost_engine(df_prices=as_text, df_entries=entries, holding_windows=[1])
+    assert len(trades) == 1
+
+
+def _multi_market_raw() -> pd.DataFrame:
+    dates = pd.bdate_range("2023-12-01", periods=40)
+    listings = [("31", "main_market", "ORDINARY SHARES", "AAA"), ("22", "junior_market", "ORDINARY SHARES", "BBB"), ("49", "usd_market", "USD EQUITIES", "CCC")]
+    rows = [
+        {"date": day.strftime("%Y-%m-%d"), "market_code": code, "market_name": name, "table_title": title, "symbol": symbol, "close_price": 10.0 + i, "volume": 1000}
+        for code, name, title, symbol in listings
+        for i, day in enumerate(dates)
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_market_columns_survive_normalization_and_filters():
+    assert market_token("Main Market") == "main"
+    assert market_token("usd_market") == "usd"
+
+    canonical, _ = normalize_data(normalize_jse_dataset(_multi_market_raw()), source="demo", dataset_id="test")
+    assert {"market", "market_code", "table_title"} <= set(canonical.columns)
+    assert set(canonical["market"]) == {"main", "junior", "usd"}
+    assert canonical.loc[canonical["ticker"] == "BBB", "market_code"].iloc[0] == "22"
+
+    junior = filter_markets(canonical, ["Junior Market"])
+    assert set(junior["ticker"]) == {"BBB"}
+    assert filter_markets(canonical, None) is canonical
+
+    readiness = compute_readiness_metrics(canonical, markets=["main", "usd"])
+    assert set(readiness["ticker"]) == {"AAA", "CCC"}
+
+    profile = profile_dataset(canonical)
+    assert profile.tickers["CCC"].market == "usd"
+    summary = pd.DataFrame(
+        {
+            "instrument": ["AAA", "BBB", "CCC"],
+            "holding_window": 5,
+            "n_trades": 100,
+            "win_rate_net": 0.55,
+            "median_net_return": 0.02,
+            "hit_rate_above_cost": 0.5,
+        }
+    )
+    meta = build_metadata(canonical, source="demo", dataset_id="test", profile=profile)
+    ranked = rank_instruments(summary, meta, "income_stability", markets="junior")
+    assert ranked["instrument"].tolist() == ["BBB"]
+
+
+def test_partitioned_store_reads_only_matching_partitions(monkeypatch, tmp_path):
+    canonical, _ = normalize_data(normalize_jse_dataset(_multi_market_raw()), source="demo", dataset_id="test")
+    store = tmp_path / "store"
+    written = write_partitioned(canonical, store)
+    # Dates span 2023 and 2024 for each of the three markets.
+    assert len(written) == 6
+    assert [path.relative_to(store).as_posix() for path in list_partitions(store, markets="usd", years=[2024])] == [
+        "market=usd/year=2024/part.csv"
+    ]
+
+    main_2024 = read_partitioned(store, markets=["main"], years=[2024])
+    assert set(main_2024["ticker"]) == {"AAA"}
+    assert (main_2024["date"].dt.year == 2024).all()
+    assert main_2024["market_code"].iloc[0] == "31"
+    assert read_partitioned(store, markets=["otc"]).empty
+
+    raw_path = tmp_path / "jse_dataset.csv"
+    _multi_market_raw().to_csv(raw_path, index=False)
+    monkeypatch.setattr("app.data.loaders.INTERNAL_DATASET_PATH", raw_path)
+    monkeypatch.setenv(PARTITIONED_STORE_DIR_ENV, str(tmp_path / "lazy_store"))
+
+    junior, source_label = load_internal_dataset_with_source(["junior"])
+    assert source_label == "internal_jse_dataset"
+    assert (tmp_path / "lazy_store" / "market=usd").exists()
+    assert set(junior["ticker"]) == {"BBB"}
+    assert len(junior) == 40
+
+    monkeypatch.delenv(PARTITIONED_STORE_DIR_ENV)
+    from_csv = load_internal_dataset(["junior"])
+    pd.testing.assert_series_equal(junior["close"], from_csv["close"])
+    assert len(ingest_dataset("demo", markets="junior")[0]) == 40
+
+
+def test_partitioned_store_returns_the_csv_layout_when_no_market_matches(monkeypatch, tmp_path):
+    raw_path = tmp_path / "jse_dataset.csv"
+    _multi_market_raw().to_csv(raw_path, index=False)
+    monkeypatch.setattr("app.data.loaders.INTERNAL_DATASET_PATH", raw_path)
+    from_csv, _, csv_issues = ingest_dataset("demo", markets="nosuch")
+
+    monkeypatch.setenv(PARTITIONED_STORE_DIR_ENV, str(tmp_path / "store"))
+    canonical, _, issues = ingest_dataset("demo", markets="nosuch")
+    assert canonical.empty
+    assert list(canonical.columns) == list(from_csv.columns)
+    assert canonical["date"].dtype == from_csv["date"].dtype
+    assert issues["errors"] == csv_issues["errors"]
+
+    # A store without partitions still knows its columns from the manifest.
+    empty_store = tmp_path / "empty_store"
+    write_partitioned(from_csv, empty_store)
+    assert list(read_partitioned(empty_store, markets="main").columns) == list(from_csv.columns)
+
+
+def test_partitioned_store_leaves_foreign_directories_alone_and_rebuilds_when_stale(monkeypatch, tmp_path):
+    raw_path = tmp_path / "jse_dataset.csv"
+    _multi_market_raw().to_csv(raw_path, index=False)
+    monkeypatch.setattr("app.data.loaders.INTERNAL_DATASET_PATH", raw_path)
+
+    scratch = tmp_path / "scratch"
+    (scratch / "keepme").mkdir(parents=True)
+    (scratch / "keepme" / "notes.txt").write_text("mine")
+    monkeypatch.setenv(PARTITIONED_STORE_DIR_ENV, str(scratch))
+    with pytest.raises(ValueError):
+        write_partitioned(load_internal_dataset(), scratch)
+    # The loader falls back to the CSV instead of replacing the directory.
+    assert len(load_internal_dataset(["main"])) == 40
+    assert (scratch / "keepme" / "notes.txt").read_text() == "mine"
+    assert not list(scratch.glob("market=*"))
+
+    store = tmp_path / "store"
+    monkeypatch.setenv(PARTITIONED_STORE_DIR_ENV, str(store))
+    assert len(load_internal_dataset(["main"])) == 40
+    first_stamp = read_manifest(store)["source"]
+
+    # Editing the source CSV rebuilds the store on the next load.
+    _multi_market_raw().iloc[:60].to_csv(raw_path, index=False)
+    os.utime(raw_path, ns=(0, 10**18))
+    assert len(load_internal_dataset(["junior"])) == 20
+    assert read_manifest(store)["source"] != first_stamp
+    assert not list(tmp_path.glob(".store-*"))
@@ -0,0 +1,49 @@
+import inspect
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.lazy import LazyCallable, lazy_exports
+
+
+def _modules_after(code: str) -> set[str]:
+    script = f"import sys\n{code}\nprint(' '.join(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def test_lazy_callable_resolves_target_and_signature_on_first_use():
+    proxy = LazyCallable("app.signals.rules", "ma_cross")
+    assert not proxy.loaded
+
+    assert list(inspect.signature(proxy).parameters) == ["fast", "slow"]
+    assert proxy(5, 20).name == "ma_cross(5,20)"
+    assert proxy.loaded
+
+
+def test_lazy_exports_raises_attribute_error_for_unknown_names():
+    getter = lazy_exports("app.insights", {"resolve_return_column": ".analyst"})
+
+    assert callable(getter("resolve_return_column"))
+    try:
+        getter("missing")
+    except AttributeError as exc:
+        assert "missing" in str(exc)
+    else:
+        raise AssertionError("expected AttributeError")
+
+
+def test_importing_app_defers_pipeline_and_tab_modules():
+    loaded = _modules_after(
+        "import importlib.util\n"
+        "spec = importlib.util.spec_from_file_location('app_main', 'app.py')\n"
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+        "import app.demo.run_demo"
+    )
+
+    assert "app.demo.run_demo" in loaded
+    for deferred in ("app.ranking.engine", "app.costs.engine", "app.planner.portfolio_ui", "app.insights.analyst"):
+        assert deferred not in loaded
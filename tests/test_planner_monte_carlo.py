@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.planner.monte_carlo import build_return_pools, simulate_plan_outcomes
+
+
+def _trades() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    return pd.DataFrame(
+        {
+            "instrument": ["AAA"] * 40 + ["BBB"] * 30,
+            "holding_window": [10] * 20 + [20] * 20 + [5] * 30,
+            "net_return_pct": np.concatenate([rng.normal(1.0, 4.0, 40), rng.normal(-0.5, 2.0, 30)]),
+        }
+    )
+
+
+def test_build_return_pools_keys_by_window_with_all_window_fallback():
+    pools = build_return_pools(_trades())
+
+    assert set(pools) == {("AAA", None), ("AAA", 10), ("AAA", 20), ("BBB", None), ("BBB", 5)}
+    assert pools[("AAA", None)].size == 40
+    assert pools[("AAA", 20)].size == 20
+    assert build_return_pools(None) == {}
+    assert build_return_pools(pd.DataFrame({"instrument": ["AAA"]})) == {}
+
+
+def test_constant_returns_give_exact_outcomes():
+    pools = {("AAA", 10): np.array([10.0, 10.0]), ("BBB", None): np.array([-5.0])}
+    allocations = [
+        {"instrument": "AAA", "holding_window": 10, "allocation_amount": 40_000.0},
+        {"instrument": "BBB", "holding_window": 30, "allocation_amount": 20_000.0},
+        {"instrument": "CCC", "holding_window": 10, "allocation_amount": 0.0},
+    ]
+
+    result = simulate_plan_outcomes(allocations, pools, 100_000.0, n_paths=100, cycles=3)
+
+    # 40k at +10% and 20k at -5% make +3,000 every cycle.
+    assert result["pnl_percentiles"] == {pct: pytest.approx(3_000.0) for pct in (5, 25, 50, 75, 95)}
+    assert result["probability_of_loss"] == 0.0
+    assert result["worst_drawdown_pct"] == 0.0
+    assert result["modeled_weight"] == pytest.approx(0.6)
+    assert result["unmodeled"] == []
+
+
+def test_simulation_is_seeded_and_independent_of_worker_count():
+    pools = build_return_pools(_trades())
+    allocations = [
+        {"instrument": "AAA", "holding_window": 20, "allocation_amount": 30_000.0},
+        {"instrument": "BBB", "holding_window": 5, "allocation_amount": 30_000.0},
+    ]
+
+    serial = simulate_plan_outcomes(allocations, pools, 100_000.0, n_paths=12_000, seed=3)
+    parallel = simulate_plan_outcomes(allocations, pools, 100_000.0, n_paths=12_000, seed=3, workers=2)
+
+    assert serial == parallel
+    assert 0.0 < serial["probability_of_loss"] < 1.0
+    assert serial["pnl_percentiles"][5] < serial["pnl_percentiles"][50] < serial["pnl_percentiles"][95]
+    assert 0.0 < serial["median_drawdown_pct"] <= serial["worst_drawdown_pct"]
+
+
+def test_allocations_without_history_are_reported_as_unmodeled():
+    pools = {("AAA", None): np.array([2.0, -1.0])}
+    allocations = [
+        {"instrument": "AAA", "holding_window": None, "allocation_amount": 10_000.0},
+        {"instrument": "ZZZ", "holding_window": 10, "allocation_amount": 10_000.0},
+    ]
+
+    result = simulate_plan_outcomes(allocations, pools, 50_000.0, n_paths=50)
+
+    assert result["unmodeled"] == ["ZZZ"]
+    assert simulate_plan_outcomes(allocations[1:], pools, 50_000.0) is None
@@ -0,0 +1,128 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.analysis.readiness_gates import compute_readiness_metrics, compute_readiness_timeseries
+from app.costs.engine import run_cost_engine
+from app.costs.exits import build_trading_calendar
+from app.data.panel import PRICE_PANEL_DIR_ENV, PricePanel, cached_price_panel
+from app.events.earnings import tag_earnings_phase
+from app.planner.earnings_warnings import add_planner_earnings_warnings
+
+
+def _prices() -> pd.DataFrame:
+    # BBB skips a day AAA trades, and AAA's last bar is listed twice.
+    return pd.DataFrame(
+        {
+            "instrument": ["BBB", "AAA", "AAA", "BBB", "AAA", "AAA", "BBB"],
+            "date": pd.to_datetime(
+                ["2024-01-02", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-04", "2024-01-04", "2024-01-05"]
+            ),
+            "close": [20.0, 10.0, 11.0, 21.0, 12.0, 12.5, 22.0],
+            "volume": [5, 100, 200, 6, 300, 310, 7],
+        }
+    )
+
+
+def test_panel_aligns_tickers_on_one_calendar():
+    panel = PricePanel.from_frame(_prices())
+
+    assert list(panel.tickers) == ["AAA", "BBB"]
+    assert panel.shape == (4, 2)
+    assert panel.valid.tolist() == [[True, True], [True, False], [True, True], [False, True]]
+    assert panel.close[2, 0] == 12.5
+    assert not panel.close.flags.writeable
+
+    # Shifts walk each ticker's own bars, stepping over the days it did not trade.
+    previous = panel.shift(1)
+    assert np.isnan(previous[0]).all()
+    assert previous[2].tolist() == [11.0, 20.0]
+    assert panel.shift(-1)[0].tolist() == [11.0, 21.0]
+    assert np.isnan(panel.shift(-1)[3, 1])
+
+    bbb = panel.ticker_frame("BBB")
+    assert bbb["close"].tolist() == [20.0, 21.0, 22.0]
+    assert list(pd.DatetimeIndex(panel.ticker_dates("BBB")).day) == [2, 4, 5]
+    assert build_trading_calendar(panel) == build_trading_calendar(_prices())
+
+    frame = panel.to_frame()
+    assert frame["instrument"].tolist() == ["AAA"] * 3 + ["BBB"] * 3
+    assert frame["volume"].tolist() == [100.0, 200.0, 310.0, 5.0, 6.0, 7.0]
+
+
+def test_saved_panel_is_memory_mapped_once_per_dataset(monkeypatch, tmp_path):
+    panel = PricePanel.from_frame(_prices())
+    loaded = PricePanel.load(panel.save(tmp_path / "panel"))
+    assert isinstance(loaded.close, np.memmap)
+    assert list(loaded.tickers) == ["AAA", "BBB"]
+    np.testing.assert_array_equal(loaded.close, panel.close)
+    np.testing.assert_array_equal(loaded.dates, panel.dates)
+
+    monkeypatch.setenv(PRICE_PANEL_DIR_ENV, str(tmp_path / "store"))
+    meta = {"dataset_fingerprint": "panel-test-fingerprint"}
+    first = cached_price_panel(_prices(), meta)
+    assert isinstance(first.valid, np.memmap)
+    assert (tmp_path / "store" / "panel-test-fingerprint" / "close.npy").exists()
+    assert cached_price_panel(_prices(), meta) is first
+
+
+def test_interrupted_panel_save_never_leaves_a_partial_matrix(monkeypatch, tmp_path):
+    panel = PricePanel.from_frame(_prices())
+    real_save = np.save
+
+    def failing_save(stream, values):
+        if values.dtype == np.float64:
+            stream.write(b"\x93NUMPY partial")
+            raise OSError("disk full")
+        real_save(stream, values)
+
+    monkeypatch.setattr("app.data.shared_store.np.save", failing_save)
+    with pytest.raises(OSError):
+        panel.save(tmp_path / "panel")
+    assert not (tmp_path / "panel" / "close.npy").exists()
+    assert not list((tmp_path / "panel").glob("*.tmp"))
+    assert not PricePanel.saved(tmp_path / "panel")
+
+    monkeypatch.undo()
+    mapped = PricePanel.load(panel.save(tmp_path / "panel"))
+    # Saving again swaps in new files; a panel already mapped keeps reading the old ones.
+    PricePanel.from_frame(_prices().assign(close=0.0)).save(tmp_path / "panel")
+    np.testing.assert_array_equal(mapped.close, panel.close)
+    assert (PricePanel.load(tmp_path / "panel").close[panel.valid] == 0.0).all()
+
+
+def test_analytics_accept_the_panel_in_place_of_the_frame():
+    days = pd.bdate_range("2024-01-01", periods=45)
+    prices = pd.concat(
+        [
+            pd.DataFrame({"instrument": name, "date": days[::step], "close": base + np.arange(len(days[::step])) * 0.1, "volume": 1000.0})
+            for name, base, step in (("AAA", 10.0, 1), ("BBB", 30.0, 2))
+        ],
+        ignore_index=True,
+    )
+    panel = PricePanel.from_frame(prices)
+    entries = prices[["instrument", "date"]].rename(columns={"date": "entry_date"})
+
+    from_frame = run_cost_engine(prices, entries)
+    from_panel = run_cost_engine(panel, entries)
+    pd.testing.assert_frame_equal(from_panel[0], from_frame[0])
+    pd.testing.assert_frame_equal(from_panel[1], from_frame[1])
+
+    pd.testing.assert_frame_equal(compute_readiness_metrics(panel), compute_readiness_metrics(prices))
+    pd.testing.assert_frame_equal(compute_readiness_timeseries(panel), compute_readiness_timeseries(prices))
+
+    events = pd.DataFrame({"instrument": ["AAA", "BBB"], "earnings_date": [days[20], days[20]], "confidence": "confirmed"})
+    tagged = tag_earnings_phase(prices, events, date_col="date", inst_col="instrument", price_panel=panel)
+    pd.testing.assert_frame_equal(tagged, tag_earnings_phase(prices, events, date_col="date", inst_col="instrument"))
+
+    planner = pd.DataFrame({"instrument": ["AAA", "BBB"], "entry_date": [days[18], days[18]], "holding_window": [5, 5]})
+    warned = add_planner_earnings_warnings(planner, panel, events, objective="income_stability")
+    expected = add_planner_earnings_warnings(planner, prices, events, objective="income_stability")
+    pd.testing.assert_frame_equal(warned, expected)
+    assert warned["planned_exit_date"].tolist() == [days[23], days[28]]
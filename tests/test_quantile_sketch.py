@@ -0,0 +1,110 @@
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.costs.engine import build_summary_sketch, run_cost_engine, summarize_from_sketch
+from app.events.phase_metrics import compute_phase_metrics
+from app.insights.analyst import grouped_trade_metrics
+from app.metrics.sketch import GroupedSketchSummary, KLLSketch
+
+_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+
+def _rank_errors(values: np.ndarray, sketch: KLLSketch) -> np.ndarray:
+    estimates = sketch.quantile(_QUANTILES)
+    return np.abs(np.array([(values <= estimate).mean() for estimate in estimates]) - _QUANTILES)
+
+
+def test_kll_sketch_is_exact_until_first_compaction():
+    sketch = KLLSketch(k=64).update([3.0, 1.0, np.nan, 2.0, 5.0])
+
+    assert sketch.is_exact
+    assert len(sketch) == 4
+    assert sketch.median() == 2.5
+    np.testing.assert_allclose(sketch.quantile([0.25, 0.75]), [1.75, 3.5])
+
+
+def test_kll_sketch_rank_error_and_memory_stay_bounded():
+    values = np.random.default_rng(0).standard_t(3, size=100_000)
+    sketch = KLLSketch(k=200)
+    for chunk in np.array_split(values, 500):
+        sketch.update(chunk)
+
+    assert sketch.retained < 1_000
+    assert _rank_errors(values, sketch).max() <= sketch.rank_error
+    assert sketch.quantile(0.0) == values.min()
+    assert sketch.quantile(1.0) == values.max()
+
+
+def test_kll_sketches_merge_across_pickled_shards():
+    values = np.random.default_rng(1).normal(size=60_000)
+    shards = [pickle.dumps(KLLSketch(seed=idx).update(chunk)) for idx, chunk in enumerate(np.array_split(values, 6))]
+
+    merged = KLLSketch()
+    for payload in shards:
+        merged.merge(pickle.loads(payload))
+
+    assert len(merged) == values.size
+    assert _rank_errors(values, merged).max() <= merged.rank_error
+
+
+def test_grouped_summary_updates_incrementally_and_matches_exact_small_groups():
+    df = pd.DataFrame(
+        {
+            "instrument": ["AAA", "AAA", "BBB", "BBB", "BBB", "AAA"],
+            "phase": ["pre", "pre", "post", "post", "pre", "post"],
+            "ret": [1.0, -2.0, 3.0, 0.5, np.nan, 4.0],
+        }
+    )
+    incremental = GroupedSketchSummary(["instrument", "phase"], ["ret"])
+    incremental.update(df.iloc[:3]).update(df.iloc[3:])
+
+    expected = compute_phase_metrics(df, ["instrument", "phase"], "ret")
+    actual = compute_phase_metrics(df, ["instrument", "phase"], "ret", quantile_backend="sketch")
+    frame = incremental.frame("ret", (0.5,))
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    np.testing.assert_array_equal(frame["q50"], expected["median_return"])
+
+
+def test_sketch_backends_match_exact_summaries_on_small_groups():
+    dates = pd.bdate_range("2024-01-02", periods=30)
+    prices = pd.concat(
+        [
+            pd.DataFrame({"date": dates, "instrument": name, "close": 100 + np.cumsum(np.random.default_rng(seed).normal(size=30))})
+            for seed, name in enumerate(("AAA", "BBB"))
+        ],
+        ignore_index=True,
+    )
+    entries = prices[["instrument", "date"]].rename(columns={"date": "entry_date"})
+
+    trades, exact_instrument, exact_overall, _ = run_cost_engine(prices, entries, holding_windows=[5, 10])
+    _, sketch_instrument, sketch_overall, _ = run_cost_engine(
+        prices, entries, holding_windows=[5, 10], quantile_backend="sketch"
+    )
+
+    pd.testing.assert_frame_equal(sketch_instrument, exact_instrument, check_dtype=False)
+    pd.testing.assert_frame_equal(sketch_overall, exact_overall, check_dtype=False)
+
+    refreshed = build_summary_sketch(trades.iloc[10:], build_summary_sketch(trades.iloc[:10]))
+    pd.testing.assert_frame_equal(summarize_from_sketch(refreshed), exact_instrument, check_dtype=False)
+
+    analyst_exact = grouped_trade_metrics(trades, ["instrument"], return_column="net_return_pct")
+    analyst_sketch = grouped_trade_metrics(trades, ["instrument"], return_column="net_return_pct", quantile_backend="sketch")
+    pd.testing.assert_frame_equal(
+        analyst_sketch.sort_values("instrument").reset_index(drop=True),
+        analyst_exact.sort_values("instrument").reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_unknown_quantile_backend_is_rejected():
+    with pytest.raises(ValueError):
+        compute_phase_metrics(pd.DataFrame({"g": [1], "r": [1.0]}), ["g"], "r", quantile_backend="tdigest")
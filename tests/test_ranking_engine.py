@@ -2,13 +2,15 @@ import sys
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
 from app.data.metadata import build_metadata
 from app.ranking.engine import rank_instruments
-from app.ranking.objectives import get_objective_weights
+from app.ranking.objectives import get_objective_weights, get_window_emphasis
+from app.ranking.scoring import window_multipliers
 
 
 def _base_summary():
@@ -152,3 +154,39 @@ def test_rank_handles_missing_dates_and_volume_flag():
 
     ranked = rank_instruments(df_summary, meta, "active_growth")
     assert ranked["warnings"].apply(len).sum() == 0
+
+
+def test_ranking_searches_every_horizon_in_the_surface():
+    horizons = list(range(1, 41))
+    df_summary = pd.DataFrame(
+        {
+            "instrument": "AAA",
+            "holding_window": horizons,
+            "n_trades": 100,
+            "win_rate_net": [0.5 + (0.1 if h == 17 else 0.0) for h in horizons],
+            "median_net_return": [0.01 * h if h <= 17 else 0.01 for h in horizons],
+            "hit_rate_above_cost": 0.5,
+        }
+    )
+
+    ranked = rank_instruments(df_summary, {}, "income_stability")
+    assert ranked.iloc[0]["best_window"] == 17
+
+    emphasis = get_window_emphasis("income_stability")
+    multipliers = window_multipliers(pd.Series([1, 5, 7, 10, 60]), emphasis)
+    assert list(multipliers) == pytest.approx([0.98, 0.98, 1.0, 1.03, 1.0])
+
+
+def test_policy_tagged_summary_keeps_the_winning_exit_policy():
+    time_rows = _base_summary().assign(exit_policy="time")
+    stop_rows = _base_summary().assign(exit_policy="stop")
+    stop_rows.loc[stop_rows["instrument"] == "BBB", "median_net_return"] = 0.08
+    df_summary = pd.concat([time_rows, stop_rows], ignore_index=True)
+
+    ranked = rank_instruments(df_summary, {"volume_available": True}, "active_growth").set_index("instrument")
+    assert list(ranked.columns[:2]) == ["best_window", "exit_policy"]
+    assert ranked.loc["BBB", "exit_policy"] == "stop"
+    assert ranked.loc["AAA", "exit_policy"] == "time"
+
+    untagged = rank_instruments(_base_summary(), {"volume_available": True}, "active_growth")
+    assert "exit_policy" not in untagged.columns
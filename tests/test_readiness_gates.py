@@ -1,12 +1,20 @@
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
-from app.analysis.readiness_gates import compute_readiness_metrics, evaluate_models, write_research_artifacts
+from app.analysis.readiness_gates import (
+    TIMESERIES_COLUMNS,
+    compute_readiness_metrics,
+    compute_readiness_timeseries,
+    evaluate_models,
+    readiness_asof,
+    write_research_artifacts,
+)
 
 
 def test_basic_readiness_metric_calculation_from_close_volume_data():
@@ -228,3 +236,60 @@ def test_spread_context_uses_value_traded_when_usable():
     )
     metrics = compute_readiness_metrics(df)
     assert bool(metrics.iloc[0]["spread_context_available"])
+
+
+def test_readiness_timeseries_last_row_matches_snapshot():
+    rng = np.random.default_rng(1)
+    frames = []
+    for ticker, periods in (("AAA", 75), ("BBB", 30)):
+        frames.append(
+            pd.DataFrame(
+                {
+                    "date": pd.date_range("2025-01-01", periods=periods),
+                    "ticker": ticker,
+                    "close": 10 + rng.normal(0, 0.3, periods).cumsum(),
+                    "volume": rng.integers(0, 2_000, periods),
+                }
+            )
+        )
+    df = pd.concat(frames, ignore_index=True).sample(frac=1.0, random_state=0)
+
+    series = compute_readiness_timeseries(df)
+    snapshot = compute_readiness_metrics(df).set_index("ticker")
+    latest = series.groupby("ticker").tail(1).set_index("ticker")
+
+    assert len(series) == len(df)
+    assert series.loc[series["ticker"] == "AAA", "trading_days_count"].tolist() == list(range(1, 76))
+    for column in TIMESERIES_COLUMNS[2:]:
+        np.testing.assert_allclose(
+            latest[column].astype(float), snapshot.loc[latest.index, column].astype(float), equal_nan=True
+        )
+
+
+def test_readiness_asof_attaches_latest_prior_row_to_each_trade():
+    prices = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2025-01-02", "2025-01-03", "2025-01-06"] * 2),
+            "ticker": ["AAA"] * 3 + ["BBB"] * 3,
+            "close": [10.0, 11.0, 9.0, 5.0, 5.0, 5.0],
+            "volume": [100, 200, 300, 10, 0, 10],
+        }
+    )
+    trades = pd.DataFrame(
+        {
+            "instrument": ["BBB", "AAA", "AAA", "AAA"],
+            "entry_date": pd.to_datetime(["2025-01-05", "2025-01-03", "2025-01-01", None]),
+        },
+        index=[10, 11, 12, 13],
+    )
+
+    joined = readiness_asof(trades, compute_readiness_timeseries(prices))
+
+    assert joined.index.tolist() == [10, 11, 12, 13]
+    assert joined["readiness_date"].iloc[0] == pd.Timestamp("2025-01-03")
+    assert joined["positive_volume_ratio"].iloc[0] == 0.5
+    assert joined["avg_volume_20d"].iloc[1] == 150.0
+    assert joined["readiness_date"].iloc[2:].isna().all()
+
+    strict = readiness_asof(trades, compute_readiness_timeseries(prices), allow_exact_matches=False)
+    assert strict["readiness_date"].iloc[1] == pd.Timestamp("2025-01-02")
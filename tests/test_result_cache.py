@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.cache import ResultCache, estimate_nbytes, max_bytes_from_env
+
+
+def _block(size: int) -> np.ndarray:
+    return np.zeros(size, dtype=np.uint8)
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ResultCache(max_bytes=3_000)
+    cache.put("a", _block(1_000))
+    cache.put("b", _block(1_000))
+    cache.get("a")
+
+    cache.put("c", _block(1_500))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.current_bytes == 2_500
+    assert stats.current_bytes <= stats.max_bytes
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    cache = ResultCache(max_bytes=1_000_000)
+    calls = []
+
+    def compute() -> pd.DataFrame:
+        calls.append(1)
+        return pd.DataFrame({"value": [1.0, 2.0]})
+
+    first = cache.get_or_compute(("ranked",), compute, fingerprint="abc")
+    second = cache.get_or_compute(("ranked",), compute, fingerprint="abc")
+    cache.get_or_compute(("ranked",), compute, fingerprint="def")
+
+    assert first is second
+    assert len(calls) == 2
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+    assert stats.hit_rate == pytest.approx(1 / 3)
+
+
+def test_invalidate_drops_only_entries_for_the_fingerprint():
+    cache = ResultCache(max_bytes=1_000_000)
+    cache.put("ticker", {"rows": [1, 2, 3]}, fingerprint="old")
+    cache.put("ranked", {"rows": [4]}, fingerprint="old")
+    cache.put("ticker", {"rows": [5]}, fingerprint="new")
+
+    removed = cache.invalidate("old")
+
+    assert removed == 2
+    assert len(cache) == 1
+    assert cache.get("ticker", fingerprint="new") == {"rows": [5]}
+    assert cache.stats().current_bytes == estimate_nbytes({"rows": [5]})
+
+
+def test_values_larger_than_the_budget_are_not_stored():
+    cache = ResultCache(max_bytes=500)
+    cache.put("small", _block(100))
+
+    stored = cache.put("huge", _block(1_000))
+
+    assert stored is False
+    assert cache.get("small") is not None
+    assert cache.stats().evictions == 0
+
+
+def test_budget_can_be_configured_from_the_environment(monkeypatch):
+    monkeypatch.setenv("JSE_RESULT_CACHE_MAX_MB", "64")
+    assert max_bytes_from_env() == 64 * 1024 * 1024
+
+    monkeypatch.setenv("JSE_RESULT_CACHE_MAX_MB", "lots")
+    assert max_bytes_from_env(default=123) == 123
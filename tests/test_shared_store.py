@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.data.shared_store import SharedFrameStore
+
+
+def _frame() -> pd.DataFrame:
+    frame = pd.DataFrame(
+        {
+            "date": pd.bdate_range("2024-01-02", periods=4),
+            "instrument": ["AAA", "AAA", "BBB", None],
+            "close": [10.0, 10.5, 20.0, 21.0],
+            "volume": [100, 200, 300, 400],
+        }
+    )
+    frame.attrs["dataset_id"] = "demo-1"
+    return frame
+
+
+@pytest.mark.parametrize("use_directory", [False, True])
+def test_views_share_buffers_across_sessions(tmp_path, use_directory):
+    store = SharedFrameStore(tmp_path if use_directory else None)
+    store.put("canonical", _frame())
+
+    first = store.get("canonical")
+    second = store.get("canonical")
+
+    assert np.shares_memory(first["close"].to_numpy(), second["close"].to_numpy())
+    assert first.attrs["dataset_id"] == "demo-1"
+    assert list(first["instrument"].astype(object).where(first["instrument"].notna(), None)) == [
+        "AAA",
+        "AAA",
+        "BBB",
+        None,
+    ]
+    pd.testing.assert_series_equal(first["date"], _frame()["date"])
+
+
+@pytest.mark.parametrize("use_directory", [False, True])
+def test_mutating_a_view_does_not_leak_into_the_store(tmp_path, use_directory):
+    store = SharedFrameStore(tmp_path if use_directory else None)
+    store.put("canonical", _frame())
+
+    view = store.get("canonical")
+    view.loc[0, "close"] = -1.0
+    view["extra"] = 1
+
+    fresh = store.get("canonical")
+    assert fresh.loc[0, "close"] == 10.0
+    assert "extra" not in fresh.columns
+
+
+def test_mapped_buffers_are_keyed_by_fingerprint_and_never_rewritten(tmp_path):
+    first = SharedFrameStore(tmp_path)
+    first.put("canonical", _frame(), fingerprint="abc123")
+    view = first.get("canonical")
+    files = sorted((tmp_path / "canonical-abc123").glob("*.npy"))
+    stamps = [(path.stat().st_ino, path.stat().st_mtime_ns) for path in files]
+
+    # A second process with the same dataset maps the existing files as they are.
+    second = SharedFrameStore(tmp_path)
+    second.put("canonical", _frame(), fingerprint="abc123")
+    assert [(path.stat().st_ino, path.stat().st_mtime_ns) for path in files] == stamps
+    pd.testing.assert_frame_equal(second.get("canonical"), view)
+    assert not list(tmp_path.glob("canonical-abc123/*.tmp"))
+
+    changed = _frame().assign(close=[1.0, 2.0, 3.0, 4.0])
+    second.put("canonical", changed)
+    assert second.get("canonical")["close"].tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert view["close"].tolist() == [10.0, 10.5, 20.0, 21.0]
+    assert len(list(tmp_path.glob("canonical-*"))) == 2
+
+
+def test_get_or_put_builds_once_and_unknown_names_raise():
+    store = SharedFrameStore()
+    calls = []
+
+    def build() -> pd.DataFrame:
+        calls.append(1)
+        return _frame()
+
+    store.get_or_put("analyst", build)
+    store.get_or_put("analyst", build)
+
+    assert len(calls) == 1
+    assert store.names() == ["analyst"]
+    with pytest.raises(KeyError):
+        store.get("missing")
@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.signals.rules import (
+    PriceArrays,
+    breakout,
+    build_entries,
+    ma_cross,
+    post_earnings_drift,
+    volume_surge,
+)
+
+
+def _prices(closes_by_instrument: dict, volumes_by_instrument: dict | None = None) -> pd.DataFrame:
+    frames = []
+    for instrument, closes in closes_by_instrument.items():
+        dates = pd.bdate_range("2024-01-02", periods=len(closes))
+        frame = pd.DataFrame({"date": dates, "instrument": instrument, "close": closes})
+        if volumes_by_instrument is not None:
+            frame["volume"] = volumes_by_instrument[instrument]
+        frames.append(frame)
+    # Shuffle so rules cannot rely on input order.
+    return pd.concat(frames, ignore_index=True).sample(frac=1.0, random_state=3)
+
+
+def test_breakout_fires_only_above_prior_high_and_not_across_instruments():
+    prices = _prices({"AAA": [5, 4, 3, 6, 6, 7], "BBB": [1, 2, 1, 1, 1, 1]})
+
+    entries = build_entries(prices, breakout(2))
+
+    assert list(zip(entries["instrument"], entries["entry_date"].dt.day)) == [
+        ("AAA", 5),
+        ("AAA", 9),
+    ]
+
+
+def test_ma_cross_fires_on_the_crossing_bar_only():
+    closes = [10, 9, 8, 7, 8, 10, 12, 13]
+    prices = _prices({"AAA": closes})
+    arrays = PriceArrays.from_frame(prices)
+
+    mask = ma_cross(2, 4)(arrays)
+
+    fast = pd.Series(closes, dtype=float).rolling(2).mean()
+    slow = pd.Series(closes, dtype=float).rolling(4).mean()
+    spread = fast - slow
+    expected = ((spread > 0) & (spread.shift(1) <= 0)).to_numpy()
+    np.testing.assert_array_equal(mask, expected)
+    assert mask.sum() == 1
+
+
+def test_rules_compose_with_and_or_and_not():
+    prices = _prices(
+        {"AAA": [1, 2, 3, 4, 5, 6]},
+        {"AAA": [100, 100, 100, 400, 100, 600]},
+    )
+    arrays = PriceArrays.from_frame(prices)
+    up = breakout(1)
+    surge = volume_surge(2, 2.0)
+
+    np.testing.assert_array_equal((up & surge)(arrays), up(arrays) & surge(arrays))
+    np.testing.assert_array_equal((up | surge)(arrays), up(arrays) | surge(arrays))
+    np.testing.assert_array_equal((~surge)(arrays), ~surge(arrays))
+    assert list((up & surge)(arrays)) == [False, False, False, True, False, True]
+    assert (up & surge).name == "(breakout(1) & volume_surge(2,2))"
+
+
+def test_post_earnings_drift_requires_offsets_and_positive_reaction():
+    prices = _prices({"AAA": [10, 10, 11, 12, 12], "BBB": [10, 10, 9, 8, 8]})
+    prices["earnings_day_offset"] = prices["date"].dt.day.map({2: -1, 3: 0, 4: 1, 5: 2, 8: 3})
+
+    entries = build_entries(prices, post_earnings_drift(entry_offset=2))
+    without_offsets = build_entries(prices.drop(columns="earnings_day_offset"), post_earnings_drift(2))
+
+    assert list(entries["instrument"]) == ["AAA"]
+    assert entries["entry_date"].iat[0] == pd.Timestamp("2024-01-05")
+    assert without_offsets.empty
+
+
+def test_build_entries_without_rule_keeps_every_bar():
+    prices = _prices({"AAA": [1, 2, 3]})
+
+    entries = build_entries(prices, None)
+
+    assert len(entries) == 3
+    assert list(entries.columns) == ["instrument", "entry_date"]
+
+
+def test_ma_cross_rejects_inverted_windows():
+    with pytest.raises(ValueError):
+        ma_cross(50, 10)
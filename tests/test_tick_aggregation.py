@@ -0,0 +1,79 @@
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.analysis.readiness_gates import compute_readiness_metrics
+from app.data.schema import BAR_COLUMNS, CANONICAL_COLUMNS
+from app.data.ticks import DailyBarAggregator, aggregate_trade_prints, ingest_trade_prints
+
+
+def _prints() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Timestamp": [
+                "2024-01-02 09:30:00",
+                "2024-01-02 10:00:00",
+                "2024-01-02 15:59:00",
+                "2024-01-02 09:31:00",
+                "2024-01-03 09:30:00",
+                "2024-01-02 12:00:00",
+                "2024-01-03 11:00:00",
+                "bad",
+            ],
+            "Symbol": ["AAA", "AAA", "AAA", "BBB", "AAA", "AAA", "AAA", "AAA"],
+            "Price": [10.0, 10.5, 10.2, 50.0, 11.0, 9.8, 11.4, 99.0],
+            "Size": [100, 200, 50, 10, 300, 25, 10, 1],
+        }
+    )
+
+
+def test_chunked_prints_fold_into_daily_bars():
+    prints = _prints()
+    # Chunks split AAA's first day, and its 12:00 print arrives after the close.
+    aggregator = DailyBarAggregator(compact_rows=1)
+    for start in range(0, len(prints), 3):
+        aggregator.update(prints.iloc[start : start + 3])
+    bars = aggregator.bars().set_index(["instrument", "date"])
+
+    first_day = bars.loc[("AAA", pd.Timestamp("2024-01-02"))]
+    assert (first_day["open"], first_day["high"], first_day["low"], first_day["close"]) == (10.0, 10.5, 9.8, 10.2)
+    assert first_day["volume"] == 375
+    assert first_day["value_traded"] == 100 * 10.0 + 200 * 10.5 + 50 * 10.2 + 25 * 9.8
+    assert first_day["trades_count"] == 4
+    assert bars.loc[("AAA", pd.Timestamp("2024-01-03")), "close"] == 11.4
+    assert bars.loc[("BBB", pd.Timestamp("2024-01-02")), "trades_count"] == 1
+    assert len(bars) == 3
+    assert aggregator.prints_seen == len(prints)
+
+    one_pass = DailyBarAggregator().update(prints).bars()
+    pd.testing.assert_frame_equal(aggregator.bars(), one_pass)
+
+
+def test_trade_print_files_stream_into_canonical_bars():
+    days = pd.bdate_range("2024-01-01", periods=70)
+    rows = []
+    for day_index, day in enumerate(days):
+        for minute, price in ((0, 10.0), (30, 10.4 + day_index * 0.01), (90, 10.1)):
+            rows.append({"timestamp": day + pd.Timedelta(hours=9, minutes=minute), "symbol": "AAA", "price": price, "size": 100})
+    csv = pd.DataFrame(rows).to_csv(index=False)
+
+    streamed = aggregate_trade_prints([io.StringIO(csv)], chunk_rows=50)
+    assert len(streamed) == 70
+    assert (streamed["trades_count"] == 3).all()
+
+    canonical, meta, issues = ingest_trade_prints([io.StringIO(csv)], chunk_rows=50)
+    assert list(canonical.columns) == CANONICAL_COLUMNS
+    assert canonical[BAR_COLUMNS].notna().all().all()
+    assert issues["errors"] == []
+    assert meta["volume_confirmation_enabled"] is True
+
+    readiness = compute_readiness_metrics(canonical).iloc[0]
+    assert readiness["volatility_context_available"]
+    assert readiness["spread_context_available"]
+    assert np.isclose(readiness["avg_trades_count_20d"], 3.0)
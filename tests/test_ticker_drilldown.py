@@ -123,6 +123,7 @@ def test_build_ticker_drilldown_output_structure():
         "return_distribution",
         "tier_performance",
         "volatility_performance",
+        "excursion_stats",
         "pattern_summary",
     }
 
@@ -333,3 +334,25 @@ def test_pattern_summary_holding_window_threshold_triggers_above_point_three_pct
         )
         payload = build_ticker_drilldown(df, "NCB")
         assert "looked stronger on 5D than 20D" in payload["pattern_summary"]
+
+
+def test_excursion_stats_summarize_mae_and_mfe_per_window():
+    df = pd.DataFrame(
+        {
+            "instrument": ["NCB"] * 4 + ["JMMB"],
+            "holding_window": [5, 5, 20, 20, 5],
+            "net_return_pct": [1.0, -2.0, 3.0, 0.5, 1.0],
+            "mae_pct": [-1.0, -3.0, -2.0, -4.0, -9.0],
+            "mfe_pct": [2.0, 0.0, 5.0, 1.0, 9.0],
+            "bars_to_peak": [1, 3, 8, 2, 1],
+        }
+    )
+
+    stats = build_ticker_drilldown(df, "NCB")["excursion_stats"]
+
+    assert set(stats) == {"5D", "20D"}
+    assert stats["5D"]["count"] == 2
+    assert stats["5D"]["median_mae_pct"] == -2.0
+    assert stats["20D"]["median_mfe_pct"] == 3.0
+    assert stats["20D"]["median_bars_to_peak"] == 5.0
+    assert build_ticker_drilldown(df.drop(columns=["mae_pct"]), "NCB")["excursion_stats"] == {}
@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app.costs.engine import run_cost_engine
+from app.ranking.walk_forward import (
+    IncrementalSummary,
+    RunningMedian,
+    run_walk_forward,
+    summarize_walk_forward,
+)
+
+_META = {"volume_confirmation_enabled": True, "liquidity_ceiling": "A"}
+
+
+def _prices() -> pd.DataFrame:
+    dates = pd.bdate_range("2024-01-02", periods=40)
+    rng = np.random.default_rng(7)
+    frames = []
+    for instrument, drift in (("AAA", 0.01), ("BBB", -0.005), ("CCC", 0.002)):
+        closes = 100 * np.cumprod(1 + drift + rng.normal(0, 0.004, size=len(dates)))
+        frames.append(pd.DataFrame({"date": dates, "instrument": instrument, "close": closes}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_running_median_matches_numpy_for_streamed_values():
+    values = np.random.default_rng(3).normal(size=101)
+    running = RunningMedian()
+    for idx, value in enumerate(values, start=1):
+        running.push(float(value))
+        assert running.median() == np.median(values[:idx])
+
+
+def test_incremental_summary_matches_batch_summary():
+    prices = _prices()
+    entries = prices[["instrument", "date"]].rename(columns={"date": "entry_date"})
+    trades, summary_instrument, _, _ = run_cost_engine(prices, entries, holding_windows=[5, 10])
+
+    grouper = trades.groupby(["instrument", "holding_window"], sort=False)
+    keys = grouper.size().reset_index()[["instrument", "holding_window"]]
+    incremental = IncrementalSummary(keys, float(trades["cost_drag_pct"].iloc[0]))
+    incremental.add(
+        grouper.ngroup().to_numpy(),
+        trades["net_return_pct"].to_numpy(),
+        trades["gross_return_pct"].to_numpy(),
+    )
+
+    snapshot = incremental.snapshot().sort_values(["instrument", "holding_window"]).reset_index(drop=True)
+    expected = summary_instrument.sort_values(["instrument", "holding_window"]).reset_index(drop=True)
+    for column in ("n_trades", "win_rate_net", "median_net_return", "avg_net_return", "hit_rate_above_cost"):
+        np.testing.assert_allclose(snapshot[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float))
+
+
+def test_walk_forward_only_uses_trades_closed_before_rebalance_date():
+    prices = _prices()
+    entries = prices[["instrument", "date"]].rename(columns={"date": "entry_date"})
+    trades, _, _, _ = run_cost_engine(prices, entries, holding_windows=[5])
+    rebalance_date = prices["date"].drop_duplicates().sort_values().iloc[12]
+
+    results = run_walk_forward(
+        trades,
+        prices,
+        _META,
+        "active_growth",
+        rebalance_dates=[rebalance_date],
+        top_tiers=("A", "B", "C"),
+    )
+
+    visible = trades[trades["exit_date"] < rebalance_date].groupby("instrument").size()
+    assert not results.empty
+    for row in results.itertuples(index=False):
+        assert row.history_trades == visible[row.instrument]
+        assert row.forward_exit_date > rebalance_date
+
+
+def test_walk_forward_forward_returns_come_from_prices_after_rebalance():
+    prices = _prices()
+    entries = prices[["instrument", "date"]].rename(columns={"date": "entry_date"})
+    trades, _, _, _ = run_cost_engine(prices, entries, holding_windows=[5])
+
+    results = run_walk_forward(trades, prices, _META, "active_growth", top_tiers=("A", "B", "C"), cost_drag_pct=0.0)
+
+    row = results.iloc[0]
+    closes = prices[prices["instrument"] == row["instrument"]].set_index("date")["close"]
+    entry_pos = closes.index.get_loc(row["rebalance_date"])
+    expected = (closes.iloc[entry_pos + 5] / closes.iloc[entry_pos] - 1) * 100
+    assert np.isclose(row["forward_net_return_pct"], expected)
+    assert summarize_walk_forward(results)["picks"] == results["forward_net_return_pct"].notna().sum()